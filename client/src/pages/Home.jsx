@@ -1,12 +1,13 @@
 import { useState, useEffect, useRef } from 'react';
 import { FaSearch, FaGraduationCap, FaChartLine, FaStar, FaUsers } from 'react-icons/fa';
-import { useNavigate, useLocation } from 'react-router-dom';
+import { useNavigate, useLocation, Link } from 'react-router-dom';
 import ProfessorCard from '../components/ProfessorCard';
-import { getProfessors } from '../services/api';
+import { getProfessors, getProfessorSuggestions } from '../services/api';
 
 export default function Home() {
   const [professors, setProfessors] = useState([]);
   const [searchQuery, setSearchQuery] = useState('');
+  const [suggestions, setSuggestions] = useState([]);
   const [loading, setLoading] = useState(true);
   const navigate = useNavigate();
   const location = useLocation();
@@ -34,16 +35,14 @@ export default function Home() {
   const loadProfessors = async (search = '') => {
     try {
       setLoading(true);
-      const response = await getProfessors(search);
+      const response = await getProfessors(search, '', search ? 'similarity' : 'substring');
       
-      // Sort by rating (highest first)
-      const sorted = response.data.sort((a, b) => b.avg_rating - a.avg_rating);
-      
-      // If no search query, show only top 3 rated professors
+      // Search results come ranked by relevance; otherwise show the top 3 rated professors
       if (!search) {
+        const sorted = response.data.sort((a, b) => b.avg_rating - a.avg_rating);
         setProfessors(sorted.slice(0, 3));
       } else {
-        setProfessors(sorted);
+        setProfessors(response.data);
       }
     } catch (error) {
       console.error('Failed to load professors:', error);
@@ -52,8 +51,27 @@ export default function Home() {
     }
   };
 
+  // Suggestions as the user types (the server answers from memory)
+  useEffect(() => {
+    const query = searchQuery.trim();
+    if (!query) {
+      setSuggestions([]);
+      return;
+    }
+    let cancelled = false;
+    getProfessorSuggestions(query)
+      .then((response) => {
+        if (!cancelled) setSuggestions(response.data);
+      })
+      .catch(() => {});
+    return () => {
+      cancelled = true;
+    };
+  }, [searchQuery]);
+
   const handleSearch = (e) => {
     e.preventDefault();
+    setSuggestions([]);
     loadProfessors(searchQuery);
     // Scroll to results after search
     setTimeout(() => {
@@ -110,6 +128,21 @@ export default function Home() {
                     onChange={(e) => setSearchQuery(e.target.value)}
                     className="w-full pl-12 pr-4 py-4 bg-transparent focus:outline-none text-gray-700 placeholder-gray-400"
                   />
+                  {suggestions.length > 0 && (
+                    <ul className="absolute left-0 right-0 top-full mt-2 bg-white rounded-xl shadow-xl text-left z-20 overflow-hidden">
+                      {suggestions.map((suggestion) => (
+                        <li key={suggestion.id}>
+                          <Link
+                            to={`/professor/${suggestion.id}`}
+                            className="block px-4 py-3 hover:bg-blue-50"
+                          >
+                            <span className="font-medium text-gray-800">{suggestion.name}</span>
+                            <span className="ml-2 text-sm text-gray-500">{suggestion.department}</span>
+                          </Link>
+                        </li>
+                      ))}
+                    </ul>
+                  )}
                 </div>
                 <button
                   type="submit"
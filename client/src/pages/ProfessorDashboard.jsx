@@ -2,13 +2,14 @@ import { useState, useEffect } from 'react';
 import { Link } from 'react-router-dom';
 import { FaChartLine, FaStar, FaComments, FaThumbsUp, FaUser, FaCheckCircle, FaClock } from 'react-icons/fa';
 import { useAuth } from '../context/AuthContext';
-import { getMyClaimStatus, getMyClaimedProfile, getProfessorReviews } from '../services/api';
+import { getMyClaimStatus, getMyClaimedProfile, getProfessorReviews, getReviewSummary } from '../services/api';
 
 export default function ProfessorDashboard() {
   const { user } = useAuth();
   const [claimStatus, setClaimStatus] = useState(null);
   const [professor, setProfessor] = useState(null);
   const [reviews, setReviews] = useState([]);
+  const [reviewSummary, setReviewSummary] = useState(null);
   const [loading, setLoading] = useState(true);
 
   useEffect(() => {
@@ -23,12 +24,15 @@ export default function ProfessorDashboard() {
 
       // If approved, load professor data
       if (statusRes.data.has_approved && statusRes.data.claimed_professor_id) {
-        const [profRes, reviewsRes] = await Promise.all([
+        const professorId = statusRes.data.claimed_professor_id;
+        const [profRes, reviewsRes, summaryRes] = await Promise.all([
           getMyClaimedProfile(),
-          getProfessorReviews(statusRes.data.claimed_professor_id)
+          getProfessorReviews(professorId, { limit: 5 }),
+          getReviewSummary(professorId)
         ]);
         setProfessor(profRes.data);
-        setReviews(reviewsRes.data);
+        setReviews(reviewsRes.data.items);
+        setReviewSummary(summaryRes.data);
       }
     } catch (err) {
       console.error('Failed to load dashboard data:', err);
@@ -92,9 +96,9 @@ export default function ProfessorDashboard() {
   }
 
   // Dashboard with approved claim
-  const totalHelpfulVotes = reviews.reduce((sum, review) => sum + (review.helpful_count || 0), 0);
+  const totalHelpfulVotes = reviewSummary?.helpful_votes ?? 0;
   const averageRating = professor?.avg_rating || 0;
-  const totalReviews = reviews.length;
+  const totalReviews = professor?.total_reviews ?? reviews.length;
 
   return (
     <div className="min-h-screen bg-gray-50">
@@ -161,7 +165,7 @@ export default function ProfessorDashboard() {
                 </div>
               ) : (
                 <div className="space-y-4">
-                  {reviews.slice(0, 5).map((review) => (
+                  {reviews.map((review) => (
                     <div key={review.id} className="border border-gray-100 rounded-lg p-4">
                       <div className="flex items-start justify-between mb-2">
                         <div className="flex items-center gap-2">
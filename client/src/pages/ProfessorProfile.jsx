@@ -10,10 +10,8 @@ import ReviewModal from '../components/ReviewModal';
 import ClaimProfileButton from '../components/ClaimProfileButton';
 import { useAuth } from '../context/AuthContext';
 import { 
-  getProfessor, 
+  getProfessorPage, 
   getProfessorReviews, 
-  getGradeDistribution, 
-  getProfessors,
   followProfessor,
   unfollowProfessor,
   checkIsFollowing
@@ -24,6 +22,9 @@ export default function ProfessorProfile() {
   const { isAuthenticated, user } = useAuth();
   const [professor, setProfessor] = useState(null);
   const [reviews, setReviews] = useState([]);
+  const [nextCursor, setNextCursor] = useState(null);
+  const [loadingMore, setLoadingMore] = useState(false);
+  const [reviewSummary, setReviewSummary] = useState(null);
   const [gradeData, setGradeData] = useState([]);
   const [similarProfessors, setSimilarProfessors] = useState([]);
   const [loading, setLoading] = useState(true);
@@ -75,32 +76,15 @@ export default function ProfessorProfile() {
     try {
       setLoading(true);
       
-      // Load all data in parallel
-      const [profRes, reviewsRes, gradesRes, allProfsRes] = await Promise.all([
-        getProfessor(id),
-        getProfessorReviews(id),
-        getGradeDistribution(id),
-        getProfessors()
-      ]);
+      // Professor, first review page, grades and similar professors in one request
+      const { data } = await getProfessorPage(id);
 
-      setProfessor(profRes.data);
-      setReviews(reviewsRes.data);
-      setGradeData(gradesRes.data);
-      
-      // Filter similar professors (same department, exclude current)
-      const similar = allProfsRes.data
-        .filter(p => p.id !== parseInt(id) && p.department === profRes.data.department)
-        .slice(0, 3);
-      
-      // If not enough in same department, add others
-      if (similar.length < 3) {
-        const others = allProfsRes.data
-          .filter(p => p.id !== parseInt(id) && !similar.find(s => s.id === p.id))
-          .slice(0, 3 - similar.length);
-        similar.push(...others);
-      }
-      
-      setSimilarProfessors(similar);
+      setProfessor(data.professor);
+      setReviews(data.reviews.items);
+      setNextCursor(data.reviews.next_cursor);
+      setReviewSummary(data.review_summary);
+      setGradeData(data.grade_distribution);
+      setSimilarProfessors(data.similar_professors);
     } catch (error) {
       console.error('Failed to load professor data:', error);
     } finally {
@@ -108,10 +92,19 @@ export default function ProfessorProfile() {
     }
   };
 
-  // Calculate "would take again" percentage (mock calculation for now)
-  const wouldTakeAgain = reviews.length > 0 
-    ? Math.round((reviews.filter(r => r.rating_quality >= 4).length / reviews.length) * 100)
-    : 0;
+  const loadMoreReviews = async () => {
+    setLoadingMore(true);
+    try {
+      const response = await getProfessorReviews(id, { cursor: nextCursor });
+      setReviews((current) => [...current, ...response.data.items]);
+      setNextCursor(response.data.next_cursor);
+    } catch (error) {
+      console.error('Failed to load more reviews:', error);
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
 
   if (loading) {
     return (
@@ -200,7 +193,7 @@ export default function ProfessorProfile() {
               />
               <StatCard 
                 type="recommend" 
-                value={wouldTakeAgain} 
+                value={reviewSummary?.would_take_again ?? 0} 
                 label="Would Take Again" 
               />
             </div>
@@ -212,7 +205,7 @@ export default function ProfessorProfile() {
             <div className="bg-white rounded-xl shadow-sm border border-gray-100 p-6">
               <div className="flex items-center justify-between mb-6">
                 <h2 className="text-xl font-semibold text-gray-800">
-                  Student Reviews ({reviews.length})
+                  Student Reviews ({professor.total_reviews})
                 </h2>
                 {/* Only show Write Review button for students, not professors */}
                 {isAuthenticated && user?.role !== 'professor' && (
@@ -237,6 +230,15 @@ export default function ProfessorProfile() {
                   {reviews.map((review) => (
                     <ReviewCard key={review.id} review={review} />
                   ))}
+                  {nextCursor && (
+                    <button
+                      onClick={loadMoreReviews}
+                      disabled={loadingMore}
+                      className="w-full py-2 border border-gray-300 text-gray-700 rounded-lg hover:bg-gray-50 transition disabled:opacity-50"
+                    >
+                      {loadingMore ? 'Loading...' : 'Load more reviews'}
+                    </button>
+                  )}
                 </div>
               )}
             </div>
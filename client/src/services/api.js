@@ -4,6 +4,8 @@ const API_BASE_URL = 'http://localhost:8000';
 
 const api = axios.create({
   baseURL: API_BASE_URL,
+  // Sends the server's last_write cookie back, so reads right after a write see it
+  withCredentials: true,
 });
 
 // Add auth token to requests if available
@@ -16,17 +18,43 @@ api.interceptors.request.use((config) => {
 });
 
 // Professor API calls
-export const getProfessors = (search = '', department = '') => {
-  return api.get('/professors', { params: { search, department } });
+// mode: 'substring', or 'similarity' for typo-tolerant results ranked by relevance
+export const getProfessors = (search = '', department = '', mode = 'substring') => {
+  return api.get('/professors', { params: { search, department, mode } });
+};
+
+// Search-box suggestions: [{ id, name, department }], served from memory on the server
+export const getProfessorSuggestions = (q, limit = 8) => {
+  return api.get('/professors/autocomplete', { params: { q, limit } });
 };
 
 export const getProfessor = (id) => {
   return api.get(`/professors/${id}`);
 };
 
+// Professor profile page: { professor, reviews: { items, next_cursor }, review_summary, grade_distribution, similar_professors }
+export const getProfessorPage = (id) => {
+  return api.get(`/professors/${id}/page`);
+};
+
 // Review API calls
-export const getProfessorReviews = (professorId) => {
-  return api.get(`/reviews/professor/${professorId}`);
+// Returns one page: { items, next_cursor }. Pass next_cursor as `cursor` for the next page.
+export const getProfessorReviews = (professorId, { sort = 'newest', cursor = null, limit = 20 } = {}) => {
+  return api.get(`/reviews/professor/${professorId}`, {
+    params: { sort, limit, ...(cursor ? { cursor } : {}) }
+  });
+};
+
+// Full-text review search: { items: [review + professor_name, professor_department, rank], next_cursor }
+export const searchReviews = (q, { professorId = null, department = null, cursor = null, limit = 20 } = {}) => {
+  return api.get('/reviews/search', {
+    params: { q, professor_id: professorId, department, cursor, limit },
+  });
+};
+
+// { reviews, would_take_again (percent rating 4+), helpful_votes } over all visible reviews
+export const getReviewSummary = (professorId) => {
+  return api.get(`/reviews/professor/${professorId}/summary`);
 };
 
 export const getGradeDistribution = (professorId) => {
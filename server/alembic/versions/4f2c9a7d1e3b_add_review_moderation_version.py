@@ -0,0 +1,27 @@
+"""add review moderation version
+
+Revision ID: 4f2c9a7d1e3b
+Revises: 8dd46818f4c2
+Create Date: 2026-10-17 10:12:41.503218
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4f2c9a7d1e3b'
+down_revision: Union[str, None] = '8dd46818f4c2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Word-list version each review was last moderated against (NULL = never re-checked)
+    op.add_column('reviews', sa.Column('moderation_version', sa.String(20), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('reviews', 'moderation_version')
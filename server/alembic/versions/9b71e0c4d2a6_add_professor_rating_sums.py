@@ -0,0 +1,45 @@
+"""add professor rating sums
+
+Revision ID: 9b71e0c4d2a6
+Revises: 4f2c9a7d1e3b
+Create Date: 2026-10-17 14:03:27.118402
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9b71e0c4d2a6'
+down_revision: Union[str, None] = '4f2c9a7d1e3b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Running sums so review writes can update the averages with a delta
+    op.add_column('professors', sa.Column('rating_sum', sa.Integer(), nullable=False, server_default='0'))
+    op.add_column('professors', sa.Column('difficulty_sum', sa.Integer(), nullable=False, server_default='0'))
+
+    # Backfill from visible reviews (also repairs any drifted averages)
+    op.execute("""
+        UPDATE professors SET
+            rating_sum = COALESCE((SELECT SUM(r.rating_quality) FROM reviews r
+                                   WHERE r.professor_id = professors.id AND r.is_hidden = 0), 0),
+            difficulty_sum = COALESCE((SELECT SUM(r.rating_difficulty) FROM reviews r
+                                       WHERE r.professor_id = professors.id AND r.is_hidden = 0), 0),
+            total_reviews = (SELECT COUNT(*) FROM reviews r
+                             WHERE r.professor_id = professors.id AND r.is_hidden = 0)
+    """)
+    op.execute("""
+        UPDATE professors SET
+            avg_rating = CASE WHEN total_reviews > 0 THEN CAST(rating_sum AS FLOAT) / total_reviews ELSE 0.0 END,
+            avg_difficulty = CASE WHEN total_reviews > 0 THEN CAST(difficulty_sum AS FLOAT) / total_reviews ELSE 0.0 END
+    """)
+
+
+def downgrade() -> None:
+    op.drop_column('professors', 'difficulty_sum')
+    op.drop_column('professors', 'rating_sum')
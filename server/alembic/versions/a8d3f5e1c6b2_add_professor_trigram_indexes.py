@@ -0,0 +1,42 @@
+"""add professor trigram indexes
+
+Revision ID: a8d3f5e1c6b2
+Revises: f4b1c7d2e8a3
+Create Date: 2026-10-17 21:44:18.093571
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a8d3f5e1c6b2'
+down_revision: Union[str, None] = 'f4b1c7d2e8a3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # pg_trgm only exists on PostgreSQL; SQLite keeps scanning (see app/core/professor_search.py)
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    op.create_index(
+        'ix_professors_name_trgm', 'professors', ['name'],
+        postgresql_using='gin', postgresql_ops={'name': 'gin_trgm_ops'}
+    )
+    op.create_index(
+        'ix_professors_department_trgm', 'professors', ['department'],
+        postgresql_using='gin', postgresql_ops={'department': 'gin_trgm_ops'}
+    )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    op.drop_index('ix_professors_department_trgm', table_name='professors')
+    op.drop_index('ix_professors_name_trgm', table_name='professors')
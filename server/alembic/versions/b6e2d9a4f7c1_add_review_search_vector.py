@@ -0,0 +1,39 @@
+"""add review search vector
+
+Revision ID: b6e2d9a4f7c1
+Revises: a8d3f5e1c6b2
+Create Date: 2026-10-17 23:12:40.518237
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b6e2d9a4f7c1'
+down_revision: Union[str, None] = 'a8d3f5e1c6b2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # tsvector only exists on PostgreSQL; SQLite falls back to ILIKE (see app/core/review_search.py)
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    # Generated column: PostgreSQL recomputes it whenever a comment is written
+    op.execute(
+        "ALTER TABLE reviews ADD COLUMN search_vector tsvector "
+        "GENERATED ALWAYS AS (to_tsvector('english', coalesce(comment, ''))) STORED"
+    )
+    op.create_index('ix_reviews_search_vector', 'reviews', ['search_vector'], postgresql_using='gin')
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    op.drop_index('ix_reviews_search_vector', table_name='reviews')
+    op.drop_column('reviews', 'search_vector')
@@ -0,0 +1,64 @@
+"""create professor grade histogram
+
+Revision ID: c5d8f2a1b7e9
+Revises: 9b71e0c4d2a6
+Create Date: 2026-10-17 15:21:09.664310
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c5d8f2a1b7e9'
+down_revision: Union[str, None] = '9b71e0c4d2a6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Count column -> stored gradeenum value
+GRADE_COLUMNS = {
+    'a': 'A',
+    'a_minus': 'A_MINUS',
+    'b_plus': 'B_PLUS',
+    'b': 'B',
+    'b_minus': 'B_MINUS',
+    'c_plus': 'C_PLUS',
+    'c': 'C',
+    'c_minus': 'C_MINUS',
+    'd': 'D',
+    'f': 'F',
+    'w': 'W',
+}
+
+
+def upgrade() -> None:
+    # Materialized grade distribution: one row per professor, one column per grade
+    op.create_table(
+        'professor_grade_histogram',
+        sa.Column('professor_id', sa.Integer(), nullable=False),
+        *[sa.Column(column, sa.Integer(), nullable=False, server_default='0') for column in GRADE_COLUMNS],
+        sa.Column('version', sa.Integer(), nullable=False, server_default='0'),
+        sa.PrimaryKeyConstraint('professor_id'),
+        sa.ForeignKeyConstraint(['professor_id'], ['professors.id'], ondelete='CASCADE')
+    )
+
+    # Backfill from visible reviews
+    columns = ", ".join(GRADE_COLUMNS)
+    counts = ", ".join(
+        f"COALESCE(SUM(CASE WHEN r.grade_received = '{grade}' THEN 1 ELSE 0 END), 0)"
+        for grade in GRADE_COLUMNS.values()
+    )
+    op.execute(f"""
+        INSERT INTO professor_grade_histogram (professor_id, {columns}, version)
+        SELECT p.id, {counts}, 1
+        FROM professors p
+        LEFT JOIN reviews r ON r.professor_id = p.id AND r.is_hidden = 0
+        GROUP BY p.id
+    """)
+
+
+def downgrade() -> None:
+    op.drop_table('professor_grade_histogram')
@@ -0,0 +1,41 @@
+"""add review feed indexes
+
+Revision ID: d7a3e9b4c1f0
+Revises: c5d8f2a1b7e9
+Create Date: 2026-10-17 16:48:52.301927
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd7a3e9b4c1f0'
+down_revision: Union[str, None] = 'c5d8f2a1b7e9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # One index per sort mode of /reviews/professor/{id}, so each page is an index range scan
+    op.create_index(
+        'ix_reviews_professor_newest', 'reviews',
+        ['professor_id', 'is_hidden', sa.text('created_at DESC'), sa.text('id DESC')]
+    )
+    op.create_index(
+        'ix_reviews_professor_helpful', 'reviews',
+        ['professor_id', 'is_hidden', sa.text('helpful_count DESC'), sa.text('id DESC')]
+    )
+    # Scanned forwards for "lowest" and backwards for "highest"
+    op.create_index(
+        'ix_reviews_professor_rating', 'reviews',
+        ['professor_id', 'is_hidden', 'rating_quality', 'id']
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_reviews_professor_rating', 'reviews')
+    op.drop_index('ix_reviews_professor_helpful', 'reviews')
+    op.drop_index('ix_reviews_professor_newest', 'reviews')
@@ -0,0 +1,41 @@
+"""create professor similarities
+
+Revision ID: e2f6a8c3d915
+Revises: d7a3e9b4c1f0
+Create Date: 2026-10-17 19:12:40.518203
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2f6a8c3d915'
+down_revision: Union[str, None] = 'd7a3e9b4c1f0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Top-k neighbours per professor; fill with `python build_similarity_index.py`
+    op.create_table(
+        'professor_similarities',
+        sa.Column('professor_id', sa.Integer(), nullable=False),
+        sa.Column('rank', sa.Integer(), nullable=False),
+        sa.Column('similar_professor_id', sa.Integer(), nullable=False),
+        sa.Column('score', sa.Float(), nullable=False),
+        sa.PrimaryKeyConstraint('professor_id', 'rank'),
+        sa.ForeignKeyConstraint(['professor_id'], ['professors.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['similar_professor_id'], ['professors.id'], ondelete='CASCADE')
+    )
+    op.create_index(
+        op.f('ix_professor_similarities_similar_professor_id'), 'professor_similarities',
+        ['similar_professor_id']
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_professor_similarities_similar_professor_id'), table_name='professor_similarities')
+    op.drop_table('professor_similarities')
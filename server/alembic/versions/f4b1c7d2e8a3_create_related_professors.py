@@ -0,0 +1,46 @@
+"""create related professors
+
+Revision ID: f4b1c7d2e8a3
+Revises: e2f6a8c3d915
+Create Date: 2026-10-17 20:31:07.214856
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f4b1c7d2e8a3'
+down_revision: Union[str, None] = 'e2f6a8c3d915'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Top-N co-reviewed professors per professor; fill with `python build_related_professors.py`
+    op.create_table(
+        'related_professors',
+        sa.Column('professor_id', sa.Integer(), nullable=False),
+        sa.Column('rank', sa.Integer(), nullable=False),
+        sa.Column('related_professor_id', sa.Integer(), nullable=False),
+        sa.Column('score', sa.Float(), nullable=False),
+        sa.Column('co_reviewers', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('professor_id', 'rank'),
+        sa.ForeignKeyConstraint(['professor_id'], ['professors.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['related_professor_id'], ['professors.id'], ondelete='CASCADE')
+    )
+    op.create_index(
+        op.f('ix_related_professors_related_professor_id'), 'related_professors',
+        ['related_professor_id']
+    )
+
+    # Student -> professors lookups for the incremental co-review refresh
+    op.create_index('ix_reviews_student_professor', 'reviews', ['student_id', 'professor_id'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_reviews_student_professor', table_name='reviews')
+    op.drop_index(op.f('ix_related_professors_related_professor_id'), table_name='related_professors')
+    op.drop_table('related_professors')
@@ -0,0 +1,184 @@
+"""
+Background Work Queue
+A bounded in-process queue served by a fixed pool of worker threads.
+Used to take slow work (e.g. moderation) off the request path, and to
+coalesce repeated work (e.g. stats recomputation) into periodic batches.
+"""
+import logging
+import queue
+import threading
+from typing import Any, Callable, List, Optional
+
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+
+class WorkQueue:
+    """
+    Fixed-size worker pool fed by a bounded queue.
+
+    `submit` never blocks: it returns False when the queue is full so the
+    caller can decide how to degrade (e.g. run the work inline).
+    """
+
+    def __init__(self, name: str, handler: Callable[[Any], None], workers: int, maxsize: int):
+        self.name = name
+        self.handler = handler
+        self.workers = workers
+        self._queue = queue.Queue(maxsize=maxsize)
+        self._threads: List[threading.Thread] = []
+        self._lock = threading.Lock()
+        self.processed = 0
+        self.failed = 0
+        self.rejected = 0
+
+    @property
+    def running(self) -> bool:
+        return bool(self._threads)
+
+    def start(self):
+        """Start the worker threads (no-op if already running)"""
+        with self._lock:
+            if self._threads:
+                return
+            for i in range(self.workers):
+                thread = threading.Thread(target=self._run, name=f"{self.name}-{i}", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    def stop(self, timeout: float = 10.0):
+        """Let workers finish the queued items, then stop them"""
+        with self._lock:
+            threads, self._threads = self._threads, []
+        for _ in threads:
+            self._queue.put(_STOP)
+        for thread in threads:
+            thread.join(timeout)
+
+    def submit(self, item: Any) -> bool:
+        """Queue an item; returns False if the queue is full or not running"""
+        if not self.running:
+            return False
+        try:
+            self._queue.put_nowait(item)
+            return True
+        except queue.Full:
+            self.rejected += 1
+            return False
+
+    def stats(self) -> dict:
+        return {
+            "name": self.name,
+            "workers": len(self._threads),
+            "queued": self._queue.qsize(),
+            "processed": self.processed,
+            "failed": self.failed,
+            "rejected": self.rejected,
+        }
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            try:
+                if item is _STOP:
+                    return
+                self.handler(item)
+                self.processed += 1
+            except Exception:
+                self.failed += 1
+                logger.exception("%s worker failed on %r", self.name, item)
+            finally:
+                self._queue.task_done()
+
+
+class CoalescingQueue:
+    """
+    Debounced batch queue: items added between flushes are de-duplicated
+    and handed to `handler` together, every `interval` seconds.
+
+    Adding an item that is already pending costs nothing, so a burst of
+    writes for one key results in a single unit of work per interval.
+    Failed batches are put back and retried on the next flush.
+    """
+
+    def __init__(self, name: str, handler: Callable[[List[Any]], None], interval: float, max_batch: int):
+        self.name = name
+        self.handler = handler
+        self.interval = interval
+        self.max_batch = max_batch
+        self._pending = set()
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.added = 0
+        self.coalesced = 0
+        self.flushes = 0
+        self.flushed_items = 0
+        self.failed = 0
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None
+
+    def start(self):
+        """Start the flush thread (no-op if already running)"""
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._wake.clear()
+            self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: float = 10.0):
+        """Stop the flush thread after a final flush of the pending items"""
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            self._wake.set()
+            thread.join(timeout)
+
+    def add(self, item: Any):
+        """Mark an item for the next flush"""
+        with self._lock:
+            self.added += 1
+            if item in self._pending:
+                self.coalesced += 1
+            else:
+                self._pending.add(item)
+
+    def flush(self):
+        """Hand all pending items to the handler, in batches of max_batch"""
+        with self._lock:
+            items, self._pending = sorted(self._pending), set()
+        for start in range(0, len(items), self.max_batch):
+            batch = items[start:start + self.max_batch]
+            try:
+                self.handler(batch)
+                self.flushes += 1
+                self.flushed_items += len(batch)
+            except Exception:
+                self.failed += 1
+                logger.exception("%s flush failed for %d items", self.name, len(batch))
+                with self._lock:
+                    self._pending.update(batch)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "name": self.name,
+                "running": self.running,
+                "interval_ms": round(self.interval * 1000, 1),
+                "pending": len(self._pending),
+                "added": self.added,
+                "coalesced": self.coalesced,
+                "flushes": self.flushes,
+                "flushed_items": self.flushed_items,
+                "failed": self.failed,
+            }
+
+    def _run(self):
+        while not self._wake.wait(self.interval):
+            self.flush()
+        self.flush()
@@ -13,10 +13,84 @@ class Settings(BaseSettings):
     BaseSettings automatically reads from .env file.
     """
     DATABASE_URL: str
+    ASYNC_DATABASE_URL: Optional[str] = None  # Defaults to DATABASE_URL with an asyncio driver
+    READ_DATABASE_URL: Optional[str] = None  # Read replica for read-only routes (defaults to primary)
     SECRET_KEY: str
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     
+    # Connection pool (per engine; ignored for SQLite)
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: int = 30  # Seconds to wait for a free connection
+    DB_POOL_RECYCLE: int = 1800  # Seconds before a connection is replaced
+    DB_POOL_PRE_PING: bool = True
+    
+    # After a write, a client's reads go to the primary for this long (replica lag)
+    READ_YOUR_WRITES_SECONDS: int = 5
+    
+    # Cache of verified JWTs (saves signature checks on repeated tokens)
+    TOKEN_CACHE_SIZE: int = 10000
+    
+    # Cache of authenticated users (saves a DB lookup per request)
+    PRINCIPAL_CACHE_SIZE: int = 10000
+    PRINCIPAL_CACHE_TTL_SECONDS: int = 60
+    
+    # Password hashing pool (bcrypt)
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_MAX_PENDING: int = 32  # Beyond this, login/signup get 503
+    PASSWORD_HASH_RETRY_AFTER_SECONDS: int = 2
+    PASSWORD_HASH_USE_PROCESSES: bool = True
+    
+    # Cached review pages / grade charts per professor (invalidated on writes)
+    RESPONSE_CACHE_SIZE: int = 5000
+    RESPONSE_CACHE_TTL_SECONDS: int = 60
+    
+    # Content moderation
+    MODERATION_WORDLIST_PATH: Optional[str] = None  # Extra words (JSON), reloadable at runtime
+    MODERATION_CACHE_SIZE: int = 10000
+    MODERATION_CACHE_TTL_SECONDS: int = 3600
+    
+    # Accept reviews immediately and moderate them in background workers
+    ASYNC_MODERATION: bool = False
+    MODERATION_WORKERS: int = 2
+    MODERATION_QUEUE_SIZE: int = 1000
+    
+    # Recompute professor stats in coalesced batches instead of on every review write
+    STATS_RECOMPUTE_DEFERRED: bool = False
+    STATS_RECOMPUTE_INTERVAL_MS: int = 2000
+    STATS_RECOMPUTE_BATCH_SIZE: int = 500
+    
+    # Precomputed "similar professors" index (app.core.similarity)
+    SIMILARITY_TOP_K: int = 10
+    SIMILARITY_REFRESH_ENABLED: bool = True  # Refresh neighbours when a professor's aggregates change
+    SIMILARITY_REFRESH_INTERVAL_MS: int = 10000
+    SIMILARITY_REFRESH_BATCH_SIZE: int = 5000  # Changed professors per refresh
+    SIMILARITY_FEATURES_MAX_AGE_SECONDS: int = 900  # Full feature reload (changes from other workers)
+    
+    # "Students who reviewed X also reviewed Y" (app.core.related_professors)
+    RELATED_TOP_N: int = 10
+    RELATED_MIN_CO_REVIEWERS: int = 1
+    RELATED_REFRESH_ENABLED: bool = True  # Refresh when a professor gains or loses reviewers
+    RELATED_REFRESH_INTERVAL_MS: int = 10000
+    
+    # In-memory professor autocomplete (app.core.typeahead)
+    TYPEAHEAD_ENABLED: bool = True
+    TYPEAHEAD_RELOAD_SECONDS: int = 300  # Picks up professors changed by other workers
+    
+    # Event-loop lag monitoring
+    LOOP_MONITOR_ENABLED: bool = True
+    LOOP_MONITOR_INTERVAL_MS: int = 100
+    LOOP_LAG_THRESHOLD_MS: int = 200
+    STRICT_ASYNC_DB: bool = False  # Raise on sync DB access from async routes (debug)
+    
+    # SQL logging and per-request query metrics
+    DB_ECHO: bool = False  # Log every statement (development only)
+    SQL_INSTRUMENTATION_ENABLED: bool = True
+    SLOW_QUERY_MS: int = 100
+    N_PLUS_ONE_THRESHOLD: int = 10  # Same statement this many times in one request
+    SQL_SLOWEST_PER_REQUEST: int = 3
+    
     class Config:
         env_file = ".env"
         case_sensitive = True
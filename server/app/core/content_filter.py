@@ -1,14 +1,23 @@
 """
 Content Moderation Module
-Filters profanity in English (using better-profanity) and Roman Urdu (custom list)
+Filters profanity in English (better-profanity word list) and Roman Urdu (custom list)
+All lists are compiled into a single matcher that scans the text once.
+
+The matcher is built lazily on first use. Extra words can be loaded from the
+file in MODERATION_WORDLIST_PATH and reloaded at runtime (admin endpoint or
+SIGHUP) without a restart.
 """
 
-from better_profanity import profanity
+from better_profanity.utils import read_wordlist, get_complete_path_of_file
+import hashlib
+import json
 import re
-from typing import Tuple
+import signal
+import threading
+from typing import List, NamedTuple, Optional, Tuple
 
-# Initialize better-profanity for English
-profanity.load_censor_words()
+from app.core.cache import TTLCache, MISSING
+from app.core.config import settings
 
 # Comprehensive Roman Urdu profanity list
 # Organized by severity
@@ -59,41 +68,308 @@ ALL_URDU_PROFANITY = (
     URDU_PHRASES
 )
 
-# Add Roman Urdu words to better-profanity's list
-profanity.add_censor_words(ALL_URDU_PROFANITY)
+# Severity tier of every list, most severe first.
+# A word listed twice (including in the word-list file) keeps its most severe tier.
+SEVERITY_LEVELS = ('severe', 'moderate', 'mild')
+
+
+
+def load_word_lists() -> List[Tuple[str, List[str]]]:
+    """
+    Collect every word list as (severity, words) pairs.
+    
+    Built-in Roman Urdu lists, the better-profanity English list, and the
+    optional word-list file. The file is JSON mapping a severity level to
+    a list of words, e.g. {"severe": [...], "moderate": [...], "mild": [...]}
+    """
+    english_words = read_wordlist(get_complete_path_of_file("profanity_wordlist.txt"))
+    
+    word_lists = [
+        ('severe', URDU_PROFANITY_SEVERE),
+        ('moderate', URDU_PROFANITY_MODERATE),
+        ('moderate', URDU_PHRASES),
+        ('moderate', sorted(word.lower() for word in english_words)),
+        ('mild', URDU_PROFANITY_MILD),
+    ]
+    
+    if settings.MODERATION_WORDLIST_PATH:
+        with open(settings.MODERATION_WORDLIST_PATH, encoding='utf-8') as f:
+            extra = json.load(f)
+        
+        unknown = set(extra) - set(SEVERITY_LEVELS)
+        if unknown:
+            raise ValueError(f"Unknown severity levels in word-list file: {sorted(unknown)}")
+        
+        for severity in SEVERITY_LEVELS:
+            word_lists.append((severity, list(extra.get(severity, []))))
+    
+    return word_lists
+
+
+def compute_word_list_version(word_lists) -> str:
+    """Short fingerprint of the word lists, stored on reviews when they are checked"""
+    digest = hashlib.sha1()
+    for severity, words in word_lists:
+        for word in sorted(words):
+            digest.update(f"{severity}:{word.lower()}\n".encode('utf-8'))
+    return digest.hexdigest()[:12]
+
+
+# Leetspeak substitutions of better-profanity (its Profanity.CHARS_MAPPING,
+# which only exists on an instance that has loaded the whole word list)
+LEET_VARIANTS = {
+    'a': ('a', '@', '*', '4'),
+    'i': ('i', '*', 'l', '1'),
+    'o': ('o', '*', '0', '@'),
+    'u': ('u', '*', 'v'),
+    'v': ('v', '*', 'u'),
+    'l': ('l', '1'),
+    'e': ('e', '*', '3'),
+    's': ('s', '$', '5'),
+    't': ('t', '7'),
+}
+
+# Our own spelling variations, on top of the leetspeak ones
+SPELLING_VARIANTS = {
+    'a': ('ä',),
+    'e': ('ē',),
+    'i': ('ī', '!'),
+    'o': ('ō',),
+    'u': ('ū',),
+    'q': ('q', 'k'),
+    'k': ('k', 'q'),
+}
+
+# Regex unit accepted for each character
+CHAR_VARIANTS = {
+    char: '[' + ''.join(re.escape(variant) for variant in sorted(
+        {char} | set(LEET_VARIANTS.get(char, ())) | set(SPELLING_VARIANTS.get(char, ()))
+    )) + ']'
+    for char in set(LEET_VARIANTS) | set(SPELLING_VARIANTS)
+}
+CHAR_VARIANTS[' '] = r'[\s\-_]*'
+CHAR_VARIANTS['-'] = r'[\s\-_]*'
+
+# A single word may also be typed as two ("haram zada"), like better-profanity
+# matches two consecutive words that join into a listed word
+WORD_SPLIT = r'[\s\-_]+'
+
+
+class ProfanityMatch(NamedTuple):
+    """A single profanity hit inside a text"""
+    start: int
+    end: int
+    text: str
+    severity: str
+
+
+def _pattern_units(word: str) -> List[str]:
+    """Split a word into regex units, one per character"""
+    return [CHAR_VARIANTS.get(char) or re.escape(char) for char in word.lower()]
 
 
 def create_flexible_pattern(word: str) -> str:
     """
     Create regex pattern that handles spelling variations
     Examples:
-    - 'kamina' matches 'kamina', 'kameena', 'kaminah'
+    - 'kamina' matches 'kamina', 'k@mina', 'kaminas'
     - 'bewakoof' matches 'bewakoof', 'bewaqoof', 'be-waqoof'
     """
-    # Replace common variations
-    pattern = word
-    pattern = pattern.replace('a', '[aä@]')
-    pattern = pattern.replace('e', '[eē3]')
-    pattern = pattern.replace('i', '[iī1!]')
-    pattern = pattern.replace('o', '[oō0]')
-    pattern = pattern.replace('u', '[uū]')
-    pattern = pattern.replace('q', '[qk]')
-    pattern = pattern.replace('k', '[kq]')
+    # Word boundaries and optional plural 's'
+    return r'\b' + ''.join(_pattern_units(word)) + r's?\b'
+
+
+def _build_alternation(words) -> str:
+    """
+    Build one regex alternation for many words by sharing common prefixes.
+
+    The words are inserted into a trie of pattern units, so the regex engine
+    only follows the branches that agree with the text it is looking at.
+    Longer words are tried before their prefixes ('ullu ka pattha' before 'ullu').
+    Single words are also inserted split in two at every position (WORD_SPLIT).
+    """
+    trie = {}
+    for word in words:
+        units = _pattern_units(word)
+        variants = [units]
+        if ' ' not in word and '-' not in word:
+            variants += [units[:split] + [WORD_SPLIT] + units[split:] for split in range(1, len(units))]
+        for variant in variants:
+            node = trie
+            for unit in variant:
+                node = node.setdefault(unit, {})
+            node[''] = {}  # end of word
+
+    def to_regex(node: dict) -> str:
+        branches = [unit + to_regex(child) for unit, child in node.items() if unit]
+        if not branches:
+            return ''
+        if '' in node:
+            return '(?:' + '|'.join(branches) + ')?'
+        if len(branches) == 1:
+            return branches[0]
+        return '(?:' + '|'.join(branches) + ')'
+
+    # Whole words only, with an optional plural 's'
+    return r'(?<!\w)(?:' + to_regex(trie) + r')s?(?!\w)'
+
+
+class ProfanityMatcher:
+    """
+    Precompiled matcher for every word list.
+
+    One combined pattern scans the text in a single pass. The severity of a
+    hit is only resolved for the (rare) spans that actually matched.
+    """
+
+    def __init__(self, word_lists):
+        # Most severe tier of every word, whichever list it came from
+        rank = {level: i for i, level in enumerate(SEVERITY_LEVELS)}
+        severity_of_word = {}
+        for severity, words in word_lists:
+            for word in words:
+                word = word.lower()
+                current = severity_of_word.get(word)
+                if current is None or rank[severity] < rank[current]:
+                    severity_of_word[word] = severity
+
+        words_by_severity = {level: [] for level in SEVERITY_LEVELS}
+        for word, severity in severity_of_word.items():
+            words_by_severity[severity].append(word)
+
+        self.pattern = re.compile(_build_alternation(severity_of_word), re.IGNORECASE)
+        self.severity_patterns = [
+            (severity, re.compile(_build_alternation(words), re.IGNORECASE))
+            for severity, words in words_by_severity.items()
+            if words
+        ]
+
+    def search(self, text: str) -> bool:
+        """Return True as soon as one match is found"""
+        return self.pattern.search(text) is not None
+
+    def find_all(self, text: str) -> List[ProfanityMatch]:
+        """Return every match in the text with its severity"""
+        return [
+            ProfanityMatch(m.start(), m.end(), m.group(), self._severity_of(m.group()))
+            for m in self.pattern.finditer(text)
+        ]
+
+    def _severity_of(self, matched: str) -> str:
+        for severity, pattern in self.severity_patterns:
+            if pattern.fullmatch(matched):
+                return severity
+        return SEVERITY_LEVELS[-1]
+
+
+class FilterState(NamedTuple):
+    """A compiled matcher together with the version of the lists it was built from"""
+    matcher: ProfanityMatcher
+    version: str
+
+
+# Built on first use, replaced as a whole on reload. Readers take a
+# reference once per call, so a swap never affects in-flight checks.
+_state: Optional[FilterState] = None
+_state_lock = threading.Lock()
+
+
+def _build_state() -> FilterState:
+    word_lists = load_word_lists()
+    return FilterState(ProfanityMatcher(word_lists), compute_word_list_version(word_lists))
+
+
+def get_filter_state() -> FilterState:
+    """Return the current matcher, compiling it on first use"""
+    global _state
+    state = _state
+    if state is None:
+        with _state_lock:
+            if _state is None:
+                _state = _build_state()
+            state = _state
+    return state
+
+
+def get_word_list_version() -> str:
+    """Version of the word lists currently used for moderation"""
+    return get_filter_state().version
+
+
+def reload_word_lists() -> str:
+    """
+    Rebuild the matcher from the word lists and swap it in.
     
-    # Handle optional spacing and hyphens
-    pattern = pattern.replace(' ', r'[\s\-_]*')
+    Requests keep using the previous matcher until the new one is ready.
+    If the word-list file is invalid the previous matcher stays active.
     
-    # Word boundaries
-    pattern = r'\b' + pattern + r's?\b'  # Optional plural 's'
+    Returns: the new word-list version
+    """
+    global _state
+    with _state_lock:
+        _state = _build_state()
+        version = _state.version
     
-    return pattern
+    # Keys already include the version; clearing just frees the memory
+    _verdict_cache.clear()
+    return version
 
 
-# Pre-compile regex patterns for performance
-URDU_PATTERNS = [
-    re.compile(create_flexible_pattern(word), re.IGNORECASE)
-    for word in ALL_URDU_PROFANITY
-]
+def install_reload_signal_handler():
+    """Reload the word lists in a background thread on SIGHUP"""
+    # Signal handlers can only be installed from the main thread
+    if not hasattr(signal, "SIGHUP") or threading.current_thread() is not threading.main_thread():
+        return
+    
+    def handle_sighup(signum, frame):
+        threading.Thread(target=reload_word_lists, name="wordlist-reload", daemon=True).start()
+    
+    signal.signal(signal.SIGHUP, handle_sighup)
+
+
+# Verdicts for recently seen comments. Keys include the word-list version,
+# so entries computed against an older list can never be returned.
+_verdict_cache = TTLCache(
+    maxsize=settings.MODERATION_CACHE_SIZE,
+    ttl=settings.MODERATION_CACHE_TTL_SECONDS
+)
+
+
+def _normalize(text: str) -> str:
+    """Lowercase and collapse whitespace (neither changes what the matcher finds)"""
+    return ' '.join(text.lower().split())
+
+
+def _cache_key(kind: str, version: str, text: str) -> bytes:
+    """Hash of the text, so cached entries don't keep whole comments in memory"""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(f"{kind}:{version}:".encode('utf-8'))
+    digest.update(text.encode('utf-8'))
+    return digest.digest()
+
+
+def get_cache_stats() -> dict:
+    """Hit/miss counters of the moderation verdict cache"""
+    version = _state.version if _state is not None else None
+    return {"word_list_version": version, **_verdict_cache.stats()}
+
+
+def clear_cache():
+    """Forget every cached verdict"""
+    _verdict_cache.clear()
+
+
+def find_profanity(text: str) -> List[ProfanityMatch]:
+    """
+    Find every profane word or phrase in the text
+    
+    Returns:
+        List of matches with their position and severity
+    """
+    if not text:
+        return []
+    
+    return get_filter_state().matcher.find_all(text)
 
 
 def contains_profanity(text: str) -> Tuple[bool, str]:
@@ -111,16 +387,15 @@ def contains_profanity(text: str) -> Tuple[bool, str]:
     if not text or len(text.strip()) < 2:
         return False, ""
     
-    # Check using better-profanity (handles English + our added Urdu words)
-    if profanity.contains_profanity(text):
-        censored = profanity.censor(text)
-        return True, "inappropriate language detected"
+    state = get_filter_state()
+    key = _cache_key("verdict", state.version, _normalize(text))
+    is_profane = _verdict_cache.get(key)
+    if is_profane is MISSING:
+        is_profane = state.matcher.search(text)
+        _verdict_cache.set(key, is_profane)
     
-    # Additional check with regex patterns for variations
-    text_lower = text.lower()
-    for pattern in URDU_PATTERNS:
-        if pattern.search(text_lower):
-            return True, "inappropriate language detected"
+    if is_profane:
+        return True, "inappropriate language detected"
     
     return False, ""
 
@@ -138,12 +413,13 @@ def censor_text(text: str) -> str:
     if not text:
         return text
     
-    # Use better-profanity's censoring
-    censored = profanity.censor(text)
-    
-    # Additional censoring for regex patterns
-    for pattern in URDU_PATTERNS:
-        censored = pattern.sub(lambda m: '*' * len(m.group()), censored)
+    # Censored output keeps the original casing and spacing, so key on the exact text
+    state = get_filter_state()
+    key = _cache_key("censor", state.version, text)
+    censored = _verdict_cache.get(key)
+    if censored is MISSING:
+        censored = state.matcher.pattern.sub(lambda m: '*' * len(m.group()), text)
+        _verdict_cache.set(key, censored)
     
     return censored
 
@@ -154,25 +430,11 @@ def get_severity_level(text: str) -> str:
     
     Returns: 'severe', 'moderate', 'mild', or 'none'
     """
-    if not text:
-        return 'none'
-    
-    text_lower = text.lower()
-    
-    # Check severe words
-    for word in URDU_PROFANITY_SEVERE:
-        if word in text_lower:
-            return 'severe'
-    
-    # Check moderate words
-    for word in URDU_PROFANITY_MODERATE:
-        if word in text_lower:
-            return 'moderate'
+    found = {match.severity for match in find_profanity(text)}
     
-    # Check mild words
-    for word in URDU_PROFANITY_MILD:
-        if word in text_lower:
-            return 'mild'
+    for severity in SEVERITY_LEVELS:
+        if severity in found:
+            return severity
     
     return 'none'
 
@@ -5,37 +5,251 @@ It provides:
 - Engine: The connection to the database
 - SessionLocal: A factory for creating database sessions
 - Base: The base class all models will inherit from
+- async_engine / AsyncSessionLocal: the same database for `async def` routes
+- read_engine / ReadSessionLocal: an optional read replica for read-only routes
 """
-from sqlalchemy import create_engine
+import hashlib
+import hmac
+import time
+from typing import Optional
+
+from fastapi import Request
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.schema import CreateColumn
+from sqlalchemy.ext.compiler import compiles
 from .config import settings
 
+
+def get_pool_options(url: str) -> dict:
+    """
+    Connection pool settings for an engine.
+    SQLite picks its own pool class, which doesn't accept these options.
+    """
+    if make_url(url).get_backend_name() == "sqlite":
+        return {}
+    return {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+
+
+def get_async_database_url(url: str) -> str:
+    """
+    Swap the sync driver in a database URL for its asyncio counterpart.
+    postgresql:// -> postgresql+asyncpg://, sqlite:// -> sqlite+aiosqlite://
+    """
+    url = make_url(url)
+    async_drivers = {"postgresql": "asyncpg", "sqlite": "aiosqlite"}
+    driver = async_drivers.get(url.get_backend_name())
+    if driver is None:
+        return url.render_as_string(hide_password=False)
+    return url.set(drivername=f"{url.get_backend_name()}+{driver}").render_as_string(hide_password=False)
+
+
 # Create the database engine
-# echo=True logs all SQL statements (helpful for debugging)
-engine = create_engine(settings.DATABASE_URL, echo=True)
+# DB_ECHO logs all SQL statements (helpful for debugging, too noisy for production)
+engine = create_engine(
+    settings.DATABASE_URL,
+    echo=settings.DB_ECHO,
+    **get_pool_options(settings.DATABASE_URL)
+)
 
 # SessionLocal is a factory for creating database sessions
 # A session is like a "workspace" for database operations
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async engine for `async def` routes, so their queries don't block the event loop
+_async_database_url = settings.ASYNC_DATABASE_URL or get_async_database_url(settings.DATABASE_URL)
+async_engine = create_async_engine(
+    _async_database_url,
+    echo=settings.DB_ECHO,
+    **get_pool_options(_async_database_url)
+)
+
+# expire_on_commit=False: objects stay readable after commit without a lazy
+# reload (lazy loads are not allowed on an AsyncSession)
+AsyncSessionLocal = async_sessionmaker(async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+
+# Read replica (falls back to the primary when READ_DATABASE_URL is not set)
+if settings.READ_DATABASE_URL:
+    read_engine = create_engine(
+        settings.READ_DATABASE_URL,
+        echo=settings.DB_ECHO,
+        **get_pool_options(settings.READ_DATABASE_URL)
+    )
+    _async_read_database_url = get_async_database_url(settings.READ_DATABASE_URL)
+    async_read_engine = create_async_engine(
+        _async_read_database_url,
+        echo=settings.DB_ECHO,
+        **get_pool_options(_async_read_database_url)
+    )
+else:
+    read_engine = engine
+    async_read_engine = async_engine
+
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
+AsyncReadSessionLocal = async_sessionmaker(async_read_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+
 # Base is the parent class for all our database models
 Base = declarative_base()
 
 
-def get_db():
+@compiles(CreateColumn)
+def _skip_postgresql_only_columns(element, compiler, **kw):
+    """Leave columns with info={"postgresql_only": True} out of CREATE TABLE on other backends"""
+    if element.element.info.get("postgresql_only") and compiler.dialect.name != "postgresql":
+        return None
+    return compiler.visit_create_column(element, **kw)
+
+
+def escape_like(text: str) -> str:
+    """Match LIKE wildcards in user input literally (use with escape='\\')"""
+    return text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+# Read-your-writes: a response whose request committed a write carries a
+# signed cookie with the commit time. While it is younger than
+# READ_YOUR_WRITES_SECONDS, that client's reads go to the primary, whichever
+# worker process serves them. Commits made outside a request (background
+# workers) have no client to mark; readers see them once the replica has.
+READ_YOUR_WRITES_COOKIE = "last_write"
+
+
+def _sign(value: str) -> str:
+    return hmac.new(settings.SECRET_KEY.encode(), value.encode(), hashlib.sha256).hexdigest()
+
+
+def write_marker(committed_at: float) -> str:
+    """Cookie value recording a commit at committed_at (epoch seconds)"""
+    value = f"{committed_at:.3f}"
+    return f"{value}.{_sign(value)}"
+
+
+def _wrote_recently(marker: Optional[str]) -> bool:
+    """Whether a write marker is authentic and younger than READ_YOUR_WRITES_SECONDS"""
+    if not marker:
+        return False
+    value, _, signature = marker.rpartition(".")
+    if not hmac.compare_digest(signature, _sign(value)):
+        return False
+    try:
+        committed_at = float(value)
+    except ValueError:
+        return False
+    return time.time() - committed_at < settings.READ_YOUR_WRITES_SECONDS
+
+
+def _track_writes(db: Session, request: Request):
+    """Remember the request this session serves so a commit can mark its response"""
+    if read_engine is not engine:
+        db.info["request"] = request
+
+
+@event.listens_for(Session, "after_flush")
+def _flag_session_write(session, flush_context):
+    session.info["has_writes"] = True
+
+
+@event.listens_for(Session, "after_rollback")
+def _clear_session_write(session):
+    session.info.pop("has_writes", None)
+
+
+@event.listens_for(Session, "after_commit")
+def _mark_request_as_writer(session):
+    if session.info.pop("has_writes", False) and "request" in session.info:
+        session.info["request"].state.committed_at = time.time()
+
+
+def _read_from_primary(request: Request) -> bool:
+    """True when there is no replica or this client wrote within READ_YOUR_WRITES_SECONDS"""
+    if read_engine is engine:
+        return True
+    return _wrote_recently(request.cookies.get(READ_YOUR_WRITES_COOKIE))
+
+
+class ReadYourWritesMiddleware:
+    """
+    ASGI middleware that sets the write marker cookie on responses to
+    requests that committed a write (only recorded when a replica is configured).
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        state = scope.setdefault("state", {})  # request.state of the route, set by _mark_request_as_writer
+
+        async def send_with_marker(message):
+            if message["type"] == "http.response.start" and "committed_at" in state:
+                cookie = (
+                    f"{READ_YOUR_WRITES_COOKIE}={write_marker(state['committed_at'])}; "
+                    f"Max-Age={settings.READ_YOUR_WRITES_SECONDS}; Path=/; HttpOnly; SameSite=Lax"
+                )
+                message = {**message, "headers": [*message.get("headers", []), (b"set-cookie", cookie.encode())]}
+            await send(message)
+
+        await self.app(scope, receive, send_with_marker)
+
+
+def get_db(request: Request):
     """
     Dependency function that provides a database session to route handlers.
     The session is automatically closed after the request completes.
-    
+
     Usage in routes:
         @router.get("/example")
         def example(db: Session = Depends(get_db)):
             # db is now available here
     """
     db = SessionLocal()
+    _track_writes(db, request)
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+async def get_async_db(request: Request):
+    """
+    Async counterpart of get_db for `async def` route handlers.
+
+    Usage in routes:
+        @router.get("/example")
+        async def example(db: AsyncSession = Depends(get_async_db)):
+            result = await db.execute(select(Model))
+    """
+    async with AsyncSessionLocal() as db:
+        _track_writes(db.sync_session, request)
+        yield db
+
+
+def get_read_db(request: Request):
+    """
+    Session for read-only routes: the replica, or the primary for a client
+    that has just written (so they see their own changes).
+    """
+    factory = SessionLocal if _read_from_primary(request) else ReadSessionLocal
+    db = factory()
     try:
         yield db
     finally:
         db.close()
 
+
+async def get_async_read_db(request: Request):
+    """Async counterpart of get_read_db"""
+    factory = AsyncSessionLocal if _read_from_primary(request) else AsyncReadSessionLocal
+    async with factory() as db:
+        yield db
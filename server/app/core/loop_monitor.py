@@ -0,0 +1,179 @@
+"""
+Event-Loop Monitor
+Detects when something blocks the asyncio event loop and reports what it was.
+
+- A heartbeat task on the loop measures how late each wake-up is (loop lag).
+- A watchdog thread notices when heartbeats stop; it then samples the loop
+  thread's stack and records which route was executing.
+- Optionally, synchronous DB access from the loop thread raises immediately
+  (STRICT_ASYNC_DB), so blocking regressions fail loudly in development.
+"""
+import asyncio
+import logging
+import os
+import sys
+import threading
+import time
+from collections import deque, Counter
+from typing import Optional, Tuple
+
+from sqlalchemy import event
+
+from app.core.config import settings
+
+
+logger = logging.getLogger(__name__)
+
+_ROUTERS_DIR = os.path.join("app", "routers") + os.sep
+_APP_DIR = "app" + os.sep
+
+
+def _describe_stack(frame) -> Tuple[str, str]:
+    """
+    Return (route, location) for a sampled stack.
+    route is the innermost handler in app/routers, location the innermost app frame.
+    """
+    route = "unknown"
+    location = "unknown"
+    while frame is not None:
+        filename = frame.f_code.co_filename
+        if location == "unknown" and _APP_DIR in filename:
+            location = f"{os.path.basename(filename)}:{frame.f_lineno} in {frame.f_code.co_name}"
+        if _ROUTERS_DIR in filename:
+            module = os.path.splitext(os.path.basename(filename))[0]
+            route = f"{module}.{frame.f_code.co_name}"
+            break
+        frame = frame.f_back
+    return route, location
+
+
+class LoopMonitor:
+    """
+    Continuously measures event-loop lag.
+
+    - interval: how often the heartbeat runs (seconds)
+    - threshold: lag above which a stall is recorded and logged (seconds)
+    """
+
+    def __init__(self, interval: float, threshold: float):
+        self.interval = interval
+        self.threshold = threshold
+        self._loop_thread_id: Optional[int] = None
+        self._last_beat = time.monotonic()
+        self._task: Optional[asyncio.Task] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+
+        # Metrics
+        self.samples = 0
+        self.max_lag = 0.0
+        self.total_lag = 0.0
+        self.stall_count = 0
+        self.stalls_by_route = Counter()
+        self.recent_stalls = deque(maxlen=50)
+
+    @property
+    def loop_thread_id(self) -> Optional[int]:
+        return self._loop_thread_id
+
+    async def start(self):
+        """Start monitoring the running loop (call from the loop thread)"""
+        if self._task is not None:
+            return
+        self._loop_thread_id = threading.get_ident()
+        self._last_beat = time.monotonic()
+        self._stop.clear()
+        self._task = asyncio.get_running_loop().create_task(self._heartbeat())
+        self._watchdog = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+        self._watchdog.start()
+
+    async def stop(self):
+        self._stop.set()
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def _heartbeat(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            start = loop.time()
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, loop.time() - start - self.interval)
+            self._last_beat = time.monotonic()
+            with self._lock:
+                self.samples += 1
+                self.total_lag += lag
+                self.max_lag = max(self.max_lag, lag)
+
+    def _watch(self):
+        stalled = False
+        while not self._stop.wait(self.interval / 2):
+            blocked_for = time.monotonic() - self._last_beat - self.interval
+            if blocked_for <= self.threshold:
+                stalled = False
+                continue
+            if stalled:
+                continue  # Already reported this stall
+
+            stalled = True
+            frame = sys._current_frames().get(self._loop_thread_id)
+            route, location = _describe_stack(frame)
+            self._record_stall(route, location, blocked_for)
+
+    def _record_stall(self, route: str, location: str, blocked_for: float):
+        with self._lock:
+            self.stall_count += 1
+            self.stalls_by_route[route] += 1
+            self.recent_stalls.append({
+                "route": route,
+                "location": location,
+                "blocked_ms": round(blocked_for * 1000, 1),
+                "at": time.time(),
+            })
+        logger.warning(
+            "Event loop blocked for more than %.0f ms in %s (%s)",
+            blocked_for * 1000, route, location
+        )
+
+    def stats(self) -> dict:
+        with self._lock:
+            samples = self.samples or 1
+            return {
+                "threshold_ms": round(self.threshold * 1000, 1),
+                "samples": self.samples,
+                "avg_lag_ms": round(self.total_lag / samples * 1000, 2),
+                "max_lag_ms": round(self.max_lag * 1000, 2),
+                "stall_count": self.stall_count,
+                "stalls_by_route": dict(self.stalls_by_route),
+                "recent_stalls": list(self.recent_stalls),
+            }
+
+
+class BlockingDatabaseCall(RuntimeError):
+    """Raised in strict mode when the sync engine is used on the event loop"""
+
+
+def forbid_sync_db_on_loop(engine):
+    """
+    Make the (sync) engine raise when used from a coroutine on the event loop.
+    Sync routes run in the threadpool, where there is no running loop, so they are unaffected.
+    """
+    @event.listens_for(engine, "before_cursor_execute")
+    def _check_not_on_loop(conn, cursor, statement, parameters, context, executemany):
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        route, location = _describe_stack(sys._getframe(1))
+        raise BlockingDatabaseCall(
+            f"Synchronous database access on the event loop in {route} ({location}). "
+            f"Use get_async_db in async routes."
+        )
+
+
+# Shared instance, started by the application on startup
+loop_monitor = LoopMonitor(
+    interval=settings.LOOP_MONITOR_INTERVAL_MS / 1000,
+    threshold=settings.LOOP_LAG_THRESHOLD_MS / 1000
+)
@@ -0,0 +1,71 @@
+"""
+Keyset Pagination
+Opaque cursors for "seek" pagination: instead of OFFSET, each page starts
+right after the (sort value, id) of the previous page's last row, so any
+page costs the same as the first one when an index matches the ordering.
+"""
+import base64
+import json
+import math
+from datetime import datetime
+from typing import Any, Optional, Tuple
+
+from fastapi import HTTPException, status
+from sqlalchemy import tuple_
+
+
+def encode_cursor(sort: str, value: Any, row_id: int) -> str:
+    """Encode the position after a row as a URL-safe token"""
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    raw = json.dumps([sort, value, row_id], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort: str, value_type: type) -> Tuple[Any, int]:
+    """
+    Decode a cursor produced by encode_cursor for the same sort mode.
+    The sort value must be a value_type (int, float or datetime), since it
+    goes into the WHERE clause.
+    Raises a 400 for malformed cursors or cursors from another sort.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        cursor_sort, value, row_id = json.loads(raw)
+        if cursor_sort != sort or not _is_int(row_id):
+            raise ValueError("cursor does not match sort")
+        return _parse_value(value, value_type), row_id
+    except (ValueError, TypeError, json.JSONDecodeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid pagination cursor"
+        )
+
+
+def _is_int(value: Any) -> bool:
+    """A JSON integer that fits the INTEGER columns it is compared with"""
+    return isinstance(value, int) and not isinstance(value, bool) and -2**31 <= value < 2**31
+
+
+def _parse_value(value: Any, value_type: type) -> Any:
+    """The cursor's sort value as value_type, or ValueError"""
+    if value_type is datetime and isinstance(value, str):
+        return datetime.fromisoformat(value)
+    if value_type is int and _is_int(value):
+        return value
+    if value_type is float and (_is_int(value) or isinstance(value, float)) and math.isfinite(value):
+        return float(value)
+    raise ValueError(f"cursor value is not a {value_type.__name__}")
+
+
+def keyset_filter(column, id_column, cursor: Optional[Tuple[Any, int]], descending: bool):
+    """
+    WHERE clause selecting the rows after the cursor for ORDER BY column, id
+    (both in the same direction), or None for the first page.
+    """
+    if cursor is None:
+        return None
+    value, row_id = cursor
+    if descending:
+        return tuple_(column, id_column) < tuple_(value, row_id)
+    return tuple_(column, id_column) > tuple_(value, row_id)
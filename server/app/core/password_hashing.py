@@ -0,0 +1,141 @@
+"""
+Password Hashing
+bcrypt helpers plus a dedicated, size-capped worker pool for running them.
+
+bcrypt is deliberately slow, so a burst of logins must not take the shared
+threadpool that every other sync endpoint relies on. Requests beyond the
+pool's pending limit are rejected right away instead of queueing forever.
+
+This module only depends on bcrypt, so worker processes start cheaply.
+"""
+import asyncio
+import multiprocessing
+import threading
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Optional, Tuple
+
+import bcrypt  # Use bcrypt directly instead of passlib
+
+
+def hash_password(password: str) -> str:
+    """
+    Hash a plain password using bcrypt directly.
+
+    Using bcrypt library directly avoids passlib compatibility issues.
+    """
+    # Encode password to bytes (bcrypt requires bytes)
+    password_bytes = password.encode('utf-8')
+    # Generate salt and hash
+    salt = bcrypt.gensalt(rounds=12)
+    hashed = bcrypt.hashpw(password_bytes, salt)
+    # Return as string for database storage
+    return hashed.decode('utf-8')
+
+
+def verify_password(plain_password: str, hashed_password: str) -> bool:
+    """
+    Verify a plain password against a hashed password.
+    """
+    password_bytes = plain_password.encode('utf-8')
+    hashed_bytes = hashed_password.encode('utf-8')
+    return bcrypt.checkpw(password_bytes, hashed_bytes)
+
+
+def _timed_call(func: Callable, *args) -> Tuple[Any, float]:
+    """Run func in the worker and report how long the hashing itself took"""
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+class HashPoolFull(Exception):
+    """Raised when the pool already has the maximum number of pending jobs"""
+
+
+class PasswordHashPool:
+    """
+    Bounded executor for bcrypt work with admission control and timing metrics.
+
+    - workers: number of processes (or threads) doing the hashing
+    - max_pending: jobs allowed in flight (running + waiting) before rejecting
+    """
+
+    def __init__(self, workers: int, max_pending: int, use_processes: bool = True):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.use_processes = use_processes
+        self._executor: Optional[Executor] = None
+        self._lock = threading.Lock()
+        self._pending = 0
+
+        # Metrics
+        self.completed = 0
+        self.rejected = 0
+        self.total_wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+        self.total_hash_seconds = 0.0
+        self.max_hash_seconds = 0.0
+
+    def _get_executor(self) -> Executor:
+        # Created on first use so importing the app does not fork/spawn workers
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    if self.use_processes:
+                        self._executor = ProcessPoolExecutor(
+                            max_workers=self.workers,
+                            mp_context=multiprocessing.get_context("spawn")
+                        )
+                    else:
+                        self._executor = ThreadPoolExecutor(
+                            max_workers=self.workers,
+                            thread_name_prefix="password-hash"
+                        )
+        return self._executor
+
+    async def run(self, func: Callable, *args) -> Any:
+        """Run a hashing function in the pool; raises HashPoolFull when saturated"""
+        with self._lock:
+            if self._pending >= self.max_pending:
+                self.rejected += 1
+                raise HashPoolFull()
+            self._pending += 1
+
+        start = time.perf_counter()
+        try:
+            future = self._get_executor().submit(_timed_call, func, *args)
+            result, hash_seconds = await asyncio.wrap_future(future)
+        finally:
+            with self._lock:
+                self._pending -= 1
+
+        wait_seconds = max(0.0, time.perf_counter() - start - hash_seconds)
+        with self._lock:
+            self.completed += 1
+            self.total_wait_seconds += wait_seconds
+            self.max_wait_seconds = max(self.max_wait_seconds, wait_seconds)
+            self.total_hash_seconds += hash_seconds
+            self.max_hash_seconds = max(self.max_hash_seconds, hash_seconds)
+        return result
+
+    def shutdown(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def stats(self) -> dict:
+        with self._lock:
+            completed = self.completed or 1
+            return {
+                "workers": self.workers,
+                "pending": self._pending,
+                "max_pending": self.max_pending,
+                "completed": self.completed,
+                "rejected": self.rejected,
+                "avg_wait_ms": round(self.total_wait_seconds / completed * 1000, 2),
+                "max_wait_ms": round(self.max_wait_seconds * 1000, 2),
+                "avg_hash_ms": round(self.total_hash_seconds / completed * 1000, 2),
+                "max_hash_ms": round(self.max_hash_seconds * 1000, 2),
+            }
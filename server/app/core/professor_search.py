@@ -0,0 +1,56 @@
+"""
+Professor Search
+Name matching for GET /professors.
+
+On PostgreSQL, professors.name and professors.department have pg_trgm GIN
+indexes. They serve ILIKE '%term%' as well as the trigram similarity
+operators, so a search is an index scan no matter how many professors
+there are (a btree can't help with a leading wildcard).
+
+Modes:
+- substring: names containing the term
+- similarity: also tolerates typos ("Turnig" finds "Turing"), ranked by
+  trigram word similarity to the term
+
+SQLite has no pg_trgm. There, similarity mode matches substrings only and
+ranks them by where the term matches: whole name, name prefix, word
+prefix, anywhere.
+"""
+from sqlalchemy import case, func, or_
+from sqlalchemy.orm import Query, Session
+
+from app.core.database import escape_like
+from app.models.professor import Professor
+from app.schemas.professor import ProfessorSearchMode
+
+
+def has_trigram_search(db: Session) -> bool:
+    """Whether the session's database has the pg_trgm operators"""
+    return db.get_bind().dialect.name == "postgresql"
+
+
+def search_professors(query: Query, search: str, mode: ProfessorSearchMode, trigram: bool) -> Query:
+    """Filter a Professor query by name, ordered by relevance in similarity mode"""
+    # % and _ typed by the user are matched literally
+    term = escape_like(search)
+    pattern = f"%{term}%"
+
+    if mode == ProfessorSearchMode.SUBSTRING:
+        return query.filter(Professor.name.ilike(pattern, escape="\\")).order_by(Professor.id)
+
+    if trigram:
+        # name %> term is "term <% name": some word of the name is trigram-similar to the term
+        return query.filter(or_(
+            Professor.name.ilike(pattern, escape="\\"),
+            Professor.name.op("%>")(search)
+        )).order_by(func.word_similarity(search, Professor.name).desc(), Professor.id)
+
+    name = func.lower(Professor.name)
+    term = term.lower()
+    rank = case(
+        (name == search.lower(), 0),
+        (name.like(f"{term}%", escape="\\"), 1),
+        (name.like(f"% {term}%", escape="\\"), 2),
+        else_=3
+    )
+    return query.filter(Professor.name.ilike(pattern, escape="\\")).order_by(rank, func.length(Professor.name), Professor.id)
@@ -0,0 +1,411 @@
+"""
+Professor Statistics
+Keeps each professor's review aggregates current with O(1) writes.
+
+Two read models are maintained from the visible reviews:
+- Professor: running sums (rating_sum, difficulty_sum) next to total_reviews,
+  from which avg_rating and avg_difficulty are derived
+- ProfessorGradeHistogram: one count column per grade
+
+Every change to the set of visible reviews is applied as a delta in single
+atomic UPDATEs:
+
+    UPDATE professors SET rating_sum = rating_sum + :d, ... WHERE id = :id
+
+so the cost of a write does not depend on how many reviews the professor has,
+and concurrent writers can't overwrite each other's totals.
+
+Only visible reviews (is_hidden == REVIEW_VISIBLE) count. Call the helpers
+after changing the review in the session and before committing, so the
+review change and the stats change share a transaction.
+
+With STATS_RECOMPUTE_DEFERRED, the app instead marks the professor as stale
+on commit, and a coalescing queue recomputes all stale professors every
+STATS_RECOMPUTE_INTERVAL_MS with set-based UPDATEs. A burst of reviews for
+one professor then costs one recompute per interval and no hot-row updates
+on the request path.
+"""
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy import Float, and_, case, cast, event, exists, func, insert, or_, select, update
+from sqlalchemy.orm import Session
+
+from app.core.background import CoalescingQueue
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core.response_cache import professor_response_cache
+from app.core.related_professors import reviewers_changed
+from app.core.similarity import professors_changed
+from app.models.professor import Professor
+from app.models.professor_grade_histogram import ProfessorGradeHistogram, GRADE_COLUMNS
+from app.models.review import Review, GradeEnum, REVIEW_VISIBLE, REVIEW_HIDDEN
+
+
+def stats_delta_statement(professor_id: int, count: int, rating: int, difficulty: int):
+    """
+    Build the UPDATE that shifts a professor's aggregates by a delta.
+    The averages are derived from the new sums in the same statement
+    (SET expressions see the row's old values).
+    """
+    new_total = Professor.total_reviews + count
+    return update(Professor).where(Professor.id == professor_id).values(
+        rating_sum=Professor.rating_sum + rating,
+        difficulty_sum=Professor.difficulty_sum + difficulty,
+        total_reviews=new_total,
+        avg_rating=case(
+            (new_total > 0, cast(Professor.rating_sum + rating, Float) / new_total),
+            else_=0.0
+        ),
+        avg_difficulty=case(
+            (new_total > 0, cast(Professor.difficulty_sum + difficulty, Float) / new_total),
+            else_=0.0
+        ),
+    ).execution_options(synchronize_session=False)
+
+
+def histogram_delta_statement(professor_id: int, deltas: Dict[GradeEnum, int]):
+    """Build the UPDATE that shifts a professor's grade counts and bumps the version"""
+    values = {
+        GRADE_COLUMNS[grade]: getattr(ProfessorGradeHistogram, GRADE_COLUMNS[grade]) + delta
+        for grade, delta in deltas.items() if delta
+    }
+    values["version"] = ProfessorGradeHistogram.version + 1
+    return update(ProfessorGradeHistogram).where(
+        ProfessorGradeHistogram.professor_id == professor_id
+    ).values(**values).execution_options(synchronize_session=False)
+
+
+def _apply_histogram_delta(db: Session, professor_id: int, deltas: Dict[GradeEnum, int]):
+    if not any(deltas.values()):
+        return
+    result = db.execute(histogram_delta_statement(professor_id, deltas))
+    if result.rowcount == 0:
+        # No row yet: build it from the (already flushed) reviews
+        rebuild_histograms(db, [professor_id])
+
+
+def _apply_review(db: Session, review: Review, sign: int):
+    db.flush()
+    _track_reviewers(db, [review.professor_id])
+    if _defer(db, review.professor_id):
+        return
+    db.execute(stats_delta_statement(
+        review.professor_id,
+        sign,
+        sign * review.rating_quality,
+        sign * review.rating_difficulty
+    ))
+    _apply_histogram_delta(db, review.professor_id, {review.grade_received: sign})
+
+
+def review_added(db: Session, review: Review):
+    """A review became visible (created, approved by moderation, or unhidden)"""
+    _apply_review(db, review, 1)
+
+
+def review_removed(db: Session, review: Review):
+    """A visible review went away (deleted or hidden)"""
+    _apply_review(db, review, -1)
+
+
+def review_changed(db: Session, review: Review, old_rating: int, old_difficulty: int, old_grade: GradeEnum):
+    """A visible review was edited (review holds the new values)"""
+    db.flush()
+    if _defer(db, review.professor_id):
+        return
+    if review.rating_quality != old_rating or review.rating_difficulty != old_difficulty:
+        db.execute(stats_delta_statement(
+            review.professor_id,
+            0,
+            review.rating_quality - old_rating,
+            review.rating_difficulty - old_difficulty
+        ))
+    if review.grade_received != old_grade:
+        _apply_histogram_delta(db, review.professor_id, {old_grade: -1, review.grade_received: 1})
+
+
+def hide_reviews(db: Session, review_ids: List[int]) -> int:
+    """
+    Hide a batch of reviews, removing the visible ones from the stats with
+    one delta per affected professor (computed with GROUP BY).
+
+    Returns:
+        Number of previously visible reviews that were hidden
+    """
+    removed = db.execute(
+        select(
+            Review.professor_id,
+            Review.grade_received,
+            func.count(Review.id),
+            func.sum(Review.rating_quality),
+            func.sum(Review.rating_difficulty)
+        ).where(
+            Review.id.in_(review_ids),
+            Review.is_hidden == REVIEW_VISIBLE
+        ).group_by(Review.professor_id, Review.grade_received)
+    ).all()
+
+    db.execute(
+        update(Review).where(Review.id.in_(review_ids)).values(is_hidden=REVIEW_HIDDEN)
+    )
+
+    totals = defaultdict(lambda: [0, 0, 0])
+    grade_deltas = defaultdict(dict)
+    for professor_id, grade, count, rating, difficulty in removed:
+        totals[professor_id][0] += count
+        totals[professor_id][1] += rating
+        totals[professor_id][2] += difficulty
+        grade_deltas[professor_id][grade] = -count
+
+    _track_reviewers(db, totals)
+    for professor_id, (count, rating, difficulty) in totals.items():
+        if _defer(db, professor_id):
+            continue
+        db.execute(stats_delta_statement(professor_id, -count, -rating, -difficulty))
+        _apply_histogram_delta(db, professor_id, grade_deltas[professor_id])
+
+    return sum(count for count, _, _ in totals.values())
+
+
+def is_counted(review: Review) -> bool:
+    """Whether a review contributes to its professor's stats"""
+    return review.is_hidden == REVIEW_VISIBLE
+
+
+def _professor_filters(professor_ids: Optional[Iterable[int]], department: Optional[str]) -> list:
+    """WHERE clauses restricting a statement to some professors"""
+    filters = []
+    if professor_ids is not None:
+        filters.append(Professor.id.in_(list(professor_ids)))
+    if department is not None:
+        filters.append(Professor.department == department)
+    return filters
+
+
+def aggregates_query(professor_ids: Optional[Iterable[int]] = None, department: Optional[str] = None):
+    """
+    Per-professor review count, rating sums and grade counts over visible
+    reviews, one row per professor (professors without reviews get zeros).
+    """
+    return select(
+        Professor.id.label("professor_id"),
+        func.count(Review.id).label("review_count"),
+        func.coalesce(func.sum(Review.rating_quality), 0).label("rating_sum"),
+        func.coalesce(func.sum(Review.rating_difficulty), 0).label("difficulty_sum"),
+        *[
+            func.coalesce(func.sum(case((Review.grade_received == grade, 1), else_=0)), 0).label(column)
+            for grade, column in GRADE_COLUMNS.items()
+        ]
+    ).outerjoin(
+        Review, and_(Review.professor_id == Professor.id, Review.is_hidden == REVIEW_VISIBLE)
+    ).where(
+        *_professor_filters(professor_ids, department)
+    ).group_by(Professor.id)
+
+
+def _average(total, count):
+    return case((count > 0, cast(total, Float) / count), else_=0.0)
+
+
+def rebuild_professor_stats(
+    db: Session,
+    professor_ids: Optional[Iterable[int]] = None,
+    department: Optional[str] = None
+) -> int:
+    """
+    Recompute sums, counts and averages from the reviews in one UPDATE ... FROM.
+
+    Returns:
+        Number of professors updated
+    """
+    aggregates = aggregates_query(professor_ids, department).subquery()
+    result = db.execute(
+        update(Professor).where(Professor.id == aggregates.c.professor_id).values(
+            rating_sum=aggregates.c.rating_sum,
+            difficulty_sum=aggregates.c.difficulty_sum,
+            total_reviews=aggregates.c.review_count,
+            avg_rating=_average(aggregates.c.rating_sum, aggregates.c.review_count),
+            avg_difficulty=_average(aggregates.c.difficulty_sum, aggregates.c.review_count),
+        ).execution_options(synchronize_session=False)
+    )
+    return result.rowcount
+
+
+def rebuild_histograms(
+    db: Session,
+    professor_ids: Optional[Iterable[int]] = None,
+    department: Optional[str] = None
+) -> int:
+    """
+    Recompute grade histograms from the reviews with set-based statements:
+    missing rows are inserted, then every row is overwritten from a GROUP BY.
+    Fixes any drift; versions are bumped so cached charts are refreshed.
+
+    Returns:
+        Number of histogram rows rewritten
+    """
+    if professor_ids is not None:
+        professor_ids = list(professor_ids)
+
+    missing = select(Professor.id).where(
+        ~exists().where(ProfessorGradeHistogram.professor_id == Professor.id),
+        *_professor_filters(professor_ids, department)
+    )
+    db.execute(
+        insert(ProfessorGradeHistogram).from_select(["professor_id"], missing)
+    )
+
+    counts = aggregates_query(professor_ids, department).subquery()
+    result = db.execute(
+        update(ProfessorGradeHistogram).where(
+            ProfessorGradeHistogram.professor_id == counts.c.professor_id
+        ).values(
+            **{column: counts.c[column] for column in GRADE_COLUMNS.values()},
+            version=ProfessorGradeHistogram.version + 1
+        ).execution_options(synchronize_session=False)
+    )
+    return result.rowcount
+
+
+def find_stats_drift(db: Session, department: Optional[str] = None) -> List[dict]:
+    """
+    Compare the stored aggregates and histograms with the reviews, without
+    writing anything. One GROUP BY joined to the stored rows.
+
+    Returns:
+        One dict per professor whose stored values differ, with
+        "stored" and "actual" values for the fields that differ
+    """
+    aggregates = aggregates_query(department=department).subquery()
+    stored_total = func.coalesce(Professor.total_reviews, 0)
+    actual_avg_rating = _average(aggregates.c.rating_sum, aggregates.c.review_count)
+    actual_avg_difficulty = _average(aggregates.c.difficulty_sum, aggregates.c.review_count)
+
+    rows = db.execute(
+        select(
+            Professor.id,
+            Professor.name,
+            Professor.department,
+            stored_total.label("total_reviews"),
+            Professor.rating_sum,
+            Professor.difficulty_sum,
+            func.coalesce(Professor.avg_rating, 0.0).label("avg_rating"),
+            func.coalesce(Professor.avg_difficulty, 0.0).label("avg_difficulty"),
+            aggregates.c.review_count,
+            aggregates.c.rating_sum.label("actual_rating_sum"),
+            aggregates.c.difficulty_sum.label("actual_difficulty_sum"),
+            actual_avg_rating.label("actual_avg_rating"),
+            actual_avg_difficulty.label("actual_avg_difficulty"),
+            ProfessorGradeHistogram.professor_id.label("histogram_id"),
+            *[getattr(ProfessorGradeHistogram, column).label(f"stored_{column}") for column in GRADE_COLUMNS.values()],
+            *[aggregates.c[column] for column in GRADE_COLUMNS.values()],
+        ).join(
+            aggregates, aggregates.c.professor_id == Professor.id
+        ).outerjoin(
+            ProfessorGradeHistogram, ProfessorGradeHistogram.professor_id == Professor.id
+        ).where(
+            or_(
+                stored_total != aggregates.c.review_count,
+                Professor.rating_sum != aggregates.c.rating_sum,
+                Professor.difficulty_sum != aggregates.c.difficulty_sum,
+                func.abs(func.coalesce(Professor.avg_rating, 0.0) - actual_avg_rating) > 1e-6,
+                func.abs(func.coalesce(Professor.avg_difficulty, 0.0) - actual_avg_difficulty) > 1e-6,
+                # Professors without reviews don't need a histogram row yet
+                and_(ProfessorGradeHistogram.professor_id.is_(None), aggregates.c.review_count > 0),
+                *[
+                    getattr(ProfessorGradeHistogram, column) != aggregates.c[column]
+                    for column in GRADE_COLUMNS.values()
+                ]
+            )
+        ).order_by(Professor.id)
+    ).mappings().all()
+
+    fields = [
+        ("total_reviews", "review_count"),
+        ("rating_sum", "actual_rating_sum"),
+        ("difficulty_sum", "actual_difficulty_sum"),
+        ("avg_rating", "actual_avg_rating"),
+        ("avg_difficulty", "actual_avg_difficulty"),
+    ]
+    drift = []
+    for row in rows:
+        stored, actual = {}, {}
+        for field, actual_field in fields:
+            if abs(row[field] - row[actual_field]) > 1e-6:
+                stored[field], actual[field] = row[field], row[actual_field]
+        if row["histogram_id"] is None:
+            if row["review_count"]:
+                stored["histogram"], actual["histogram"] = "missing", "built"
+        else:
+            for grade, column in GRADE_COLUMNS.items():
+                if row[f"stored_{column}"] != row[column]:
+                    stored[f"grade {grade.value}"], actual[f"grade {grade.value}"] = row[f"stored_{column}"], row[column]
+        drift.append({
+            "professor_id": row["id"],
+            "name": row["name"],
+            "department": row["department"],
+            "stored": stored,
+            "actual": actual,
+        })
+    return drift
+
+
+def recompute_professors(professor_ids: List[int]):
+    """Recompute stats and histograms for a batch of professors (queue handler)"""
+    db = SessionLocal()
+    try:
+        rebuild_professor_stats(db, professor_ids)
+        rebuild_histograms(db, professor_ids)
+        db.commit()
+        for professor_id in professor_ids:
+            professor_response_cache.invalidate(professor_id)
+        professors_changed(professor_ids)
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+# Professors whose stats are stale, flushed every STATS_RECOMPUTE_INTERVAL_MS
+stats_recompute_queue = CoalescingQueue(
+    "stats-recompute",
+    recompute_professors,
+    interval=settings.STATS_RECOMPUTE_INTERVAL_MS / 1000,
+    max_batch=settings.STATS_RECOMPUTE_BATCH_SIZE
+)
+
+
+def _defer(db: Session, professor_id: int) -> bool:
+    """
+    In deferred mode, remember the professor and queue it once the session
+    commits (recomputing earlier could miss the uncommitted review).
+    Otherwise the caller updates the stats now, which the similarity index
+    hears about on commit.
+    """
+    if not stats_recompute_queue.running:
+        db.info.setdefault("changed_professors", set()).add(professor_id)
+        return False
+    db.info.setdefault("stale_professors", set()).add(professor_id)
+    return True
+
+
+def _track_reviewers(db: Session, professor_ids: Iterable[int]):
+    """The related-professors lists of these professors need a refresh once the session commits"""
+    db.info.setdefault("reviewers_changed", set()).update(professor_ids)
+
+
+@event.listens_for(Session, "after_commit")
+def _queue_stale_professors(session):
+    for professor_id in session.info.pop("stale_professors", ()):
+        stats_recompute_queue.add(professor_id)
+    professors_changed(session.info.pop("changed_professors", ()))
+    reviewers_changed(session.info.pop("reviewers_changed", ()))
+
+
+@event.listens_for(Session, "after_rollback")
+def _drop_stale_professors(session):
+    session.info.pop("stale_professors", None)
+    session.info.pop("changed_professors", None)
+    session.info.pop("reviewers_changed", None)
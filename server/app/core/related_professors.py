@@ -0,0 +1,295 @@
+"""
+Related Professors
+"Students who reviewed X also reviewed Y", from the reviews table.
+
+Professor X and Y co-occur once for every student who has a visible review
+of both. The co-occurrence counts form a sparse professor x professor matrix
+C = A^T A, where A is the student x professor incidence matrix. Each count is
+normalized by the professors' reviewer counts (cosine similarity):
+
+    score(X, Y) = C[X, Y] / sqrt(reviewers(X) * reviewers(Y))
+
+so popular professors don't top every list. The top RELATED_TOP_N professors
+of each row are stored in related_professors, and serving them is a single
+indexed lookup.
+
+build_related_professors.py builds the whole matrix in NumPy from the
+(student, professor) pairs. When a professor gains or loses a reviewer,
+refresh_related() recomputes only the rows that involve it, with SQL
+grouped over the affected professors.
+"""
+from typing import Dict, Iterable, List, Tuple
+
+import numpy as np
+from sqlalchemy import and_, delete, distinct, func, insert, select
+from sqlalchemy.orm import Session, aliased
+
+from app.core.background import CoalescingQueue
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.professor import Professor
+from app.models.related_professor import RelatedProfessor
+from app.models.review import Review, REVIEW_VISIBLE
+
+
+# Related lists of a professor: [(related_professor_id, score, co_reviewers), ...]
+RelatedLists = Dict[int, List[Tuple[int, float, int]]]
+
+_IN_BATCH = 500
+
+
+def co_review_matrix(students: np.ndarray, professors: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Sparse co-occurrence matrix from distinct (student, professor) pairs.
+
+    Every pair of professors reviewed by the same student is generated in
+    one vectorized pass (grouping by student), then counted with np.unique.
+
+    Returns:
+        (rows, cols, counts) for every co-reviewed pair, both directions, no diagonal
+    """
+    empty = np.empty(0, dtype=np.int64)
+    if len(students) == 0:
+        return empty, empty, empty
+
+    order = np.lexsort((professors, students))
+    students = students[order]
+    professors = professors[order]
+
+    # Each review is paired with every review of the same student
+    group_starts = np.flatnonzero(np.r_[True, students[1:] != students[:-1]])
+    group_sizes = np.diff(np.r_[group_starts, len(students)])
+    member_group = np.repeat(np.arange(len(group_starts)), group_sizes)
+    pairs_per_member = group_sizes[member_group]
+
+    left = np.repeat(np.arange(len(students)), pairs_per_member)
+    offsets = np.arange(len(left)) - np.repeat(np.cumsum(pairs_per_member) - pairs_per_member, pairs_per_member)
+    right = np.repeat(group_starts[member_group], pairs_per_member) + offsets
+    keep = left != right
+
+    rows = professors[left[keep]]
+    cols = professors[right[keep]]
+    if len(rows) == 0:
+        return empty, empty, empty
+
+    width = int(professors.max()) + 1
+    keys, counts = np.unique(rows * width + cols, return_counts=True)
+    return keys // width, keys % width, counts
+
+
+def top_related(
+    rows: np.ndarray,
+    cols: np.ndarray,
+    counts: np.ndarray,
+    reviewers: Dict[int, int],
+    top_n: int,
+    min_co_reviewers: int
+) -> RelatedLists:
+    """
+    Normalize co-occurrence counts and keep the best top_n per row.
+
+    - reviewers: distinct reviewers per professor (for every id in rows/cols)
+    """
+    keep = counts >= min_co_reviewers
+    rows, cols, counts = rows[keep], cols[keep], counts[keep]
+    if len(rows) == 0:
+        return {}
+
+    # Counts can only lag behind the pairs if reviews changed between the two queries
+    reviewer_counts = np.array([reviewers.get(professor_id, 1) for professor_id in rows.tolist()], dtype=np.float64)
+    related_counts = np.array([reviewers.get(professor_id, 1) for professor_id in cols.tolist()], dtype=np.float64)
+    scores = np.minimum(counts / np.sqrt(reviewer_counts * related_counts), 1.0)
+
+    # Group by row, best score first (ties: most co-reviewers, then lowest id)
+    order = np.lexsort((cols, -counts, -scores, rows))
+    rows, cols, counts, scores = rows[order], cols[order], counts[order], scores[order]
+
+    row_starts = np.flatnonzero(np.r_[True, rows[1:] != rows[:-1]])
+    rank = np.arange(len(rows)) - np.repeat(row_starts, np.diff(np.r_[row_starts, len(rows)]))
+    keep = rank < top_n
+
+    related = {}
+    for row, col, score, count in zip(rows[keep].tolist(), cols[keep].tolist(), scores[keep].tolist(), counts[keep].tolist()):
+        related.setdefault(row, []).append((col, score, count))
+    return related
+
+
+def _store(db: Session, related: RelatedLists):
+    """Replace the stored related lists of the given professors"""
+    professor_ids = list(related)
+    for start in range(0, len(professor_ids), _IN_BATCH):
+        db.execute(delete(RelatedProfessor).where(
+            RelatedProfessor.professor_id.in_(professor_ids[start:start + _IN_BATCH])
+        ))
+    rows = [
+        {
+            "professor_id": professor_id,
+            "rank": rank,
+            "related_professor_id": related_id,
+            "score": score,
+            "co_reviewers": co_reviewers,
+        }
+        for professor_id, entries in related.items()
+        for rank, (related_id, score, co_reviewers) in enumerate(entries)
+    ]
+    if rows:
+        db.execute(insert(RelatedProfessor), rows)
+
+
+def rebuild_related_professors(
+    db: Session,
+    top_n: int = settings.RELATED_TOP_N,
+    min_co_reviewers: int = settings.RELATED_MIN_CO_REVIEWERS
+) -> int:
+    """
+    Rebuild every related list from the full co-occurrence matrix (doesn't commit).
+
+    Returns:
+        Number of professors with related professors
+    """
+    pairs = db.execute(
+        select(Review.student_id, Review.professor_id)
+        .where(Review.is_hidden == REVIEW_VISIBLE)
+        .distinct()
+    ).all()
+    students = np.array([student_id for student_id, _ in pairs], dtype=np.int64)
+    professors = np.array([professor_id for _, professor_id in pairs], dtype=np.int64)
+
+    professor_ids, reviewer_counts = np.unique(professors, return_counts=True)
+    reviewers = dict(zip(professor_ids.tolist(), reviewer_counts.tolist()))
+
+    rows, cols, counts = co_review_matrix(students, professors)
+    related = top_related(rows, cols, counts, reviewers, top_n, min_co_reviewers)
+
+    db.execute(delete(RelatedProfessor))
+    _store(db, related)
+    return len(related)
+
+
+def _co_review_rows(db: Session, professor_ids: List[int]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Rows of the co-occurrence matrix for the given professors, straight from the reviews"""
+    reviewed = aliased(Review)
+    also_reviewed = aliased(Review)
+    rows, cols, counts = [], [], []
+    for start in range(0, len(professor_ids), _IN_BATCH):
+        result = db.execute(
+            select(reviewed.professor_id, also_reviewed.professor_id, func.count(distinct(reviewed.student_id)))
+            .join(also_reviewed, and_(
+                also_reviewed.student_id == reviewed.student_id,
+                also_reviewed.professor_id != reviewed.professor_id,
+                also_reviewed.is_hidden == REVIEW_VISIBLE
+            ))
+            .where(
+                reviewed.professor_id.in_(professor_ids[start:start + _IN_BATCH]),
+                reviewed.is_hidden == REVIEW_VISIBLE
+            )
+            .group_by(reviewed.professor_id, also_reviewed.professor_id)
+        )
+        for row, col, count in result:
+            rows.append(row)
+            cols.append(col)
+            counts.append(count)
+    return (
+        np.array(rows, dtype=np.int64),
+        np.array(cols, dtype=np.int64),
+        np.array(counts, dtype=np.int64),
+    )
+
+
+def _reviewer_counts(db: Session, professor_ids: List[int]) -> Dict[int, int]:
+    """Distinct visible reviewers per professor"""
+    reviewers = {}
+    for start in range(0, len(professor_ids), _IN_BATCH):
+        reviewers.update(db.execute(
+            select(Review.professor_id, func.count(distinct(Review.student_id)))
+            .where(
+                Review.professor_id.in_(professor_ids[start:start + _IN_BATCH]),
+                Review.is_hidden == REVIEW_VISIBLE
+            )
+            .group_by(Review.professor_id)
+        ).all())
+    return reviewers
+
+
+def refresh_related(
+    db: Session,
+    professor_ids: Iterable[int],
+    top_n: int = settings.RELATED_TOP_N,
+    min_co_reviewers: int = settings.RELATED_MIN_CO_REVIEWERS
+) -> int:
+    """
+    Update the related lists after the given professors gained or lost reviewers
+    (doesn't commit).
+
+    A changed professor's reviewer count is part of every score in its row and
+    column, so the rows recomputed are: the changed professors', those of every
+    professor co-reviewed with them, and those that currently list them.
+
+    Returns:
+        Number of related lists recomputed
+    """
+    changed_ids = sorted(set(professor_ids))
+    if not changed_ids:
+        return 0
+
+    rows, cols, counts = _co_review_rows(db, changed_ids)
+    affected = set(changed_ids) | set(cols.tolist())
+    for start in range(0, len(changed_ids), _IN_BATCH):
+        affected.update(db.scalars(
+            select(distinct(RelatedProfessor.professor_id))
+            .where(RelatedProfessor.related_professor_id.in_(changed_ids[start:start + _IN_BATCH]))
+        ))
+
+    others = sorted(affected.difference(changed_ids))
+    if others:
+        other_rows, other_cols, other_counts = _co_review_rows(db, others)
+        rows = np.concatenate([rows, other_rows])
+        cols = np.concatenate([cols, other_cols])
+        counts = np.concatenate([counts, other_counts])
+
+    reviewers = _reviewer_counts(db, sorted(affected | set(cols.tolist())))
+    related = top_related(rows, cols, counts, reviewers, top_n, min_co_reviewers)
+
+    # Professors left without related professors get an empty list (clears their rows)
+    _store(db, {professor_id: related.get(professor_id, []) for professor_id in affected})
+    return len(affected)
+
+
+def related_professors_query(professor_id: int, limit: int):
+    """(Professor, score, co_reviewers) rows of a professor's related list, best first"""
+    return (
+        select(Professor, RelatedProfessor.score, RelatedProfessor.co_reviewers)
+        .join(RelatedProfessor, RelatedProfessor.related_professor_id == Professor.id)
+        .where(RelatedProfessor.professor_id == professor_id)
+        .order_by(RelatedProfessor.rank)
+        .limit(limit)
+    )
+
+
+def refresh_professors(professor_ids: List[int]):
+    """Refresh the related lists around a batch of professors (queue handler)"""
+    db = SessionLocal()
+    try:
+        refresh_related(db, professor_ids)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+# Professors that gained or lost reviewers, refreshed every RELATED_REFRESH_INTERVAL_MS
+related_refresh_queue = CoalescingQueue(
+    "related-refresh",
+    refresh_professors,
+    interval=settings.RELATED_REFRESH_INTERVAL_MS / 1000,
+    max_batch=_IN_BATCH
+)
+
+
+def reviewers_changed(professor_ids: Iterable[int]):
+    """Queue a refresh for professors whose set of reviewers changed (after commit)"""
+    if related_refresh_queue.running:
+        for professor_id in professor_ids:
+            related_refresh_queue.add(professor_id)
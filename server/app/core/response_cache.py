@@ -0,0 +1,95 @@
+"""
+Professor Response Cache
+Serialized JSON responses of the per-professor read endpoints (review
+pages, grade distribution), so repeat views skip the database and
+serialization entirely.
+
+Invalidation is per professor and O(1): every professor has a generation
+number that is part of each cache key. Writes give the professor a new
+generation, which makes all of its cached responses unreachable; they then
+age out of the LRU. A read captures its key before querying, so a response
+computed from pre-write data can never be stored under the new generation.
+
+Generations come from one counter and never repeat. Only recently
+invalidated professors have their own; the rest share a floor generation.
+When the table is full its older half is dropped and the floor moves past
+every generation issued so far. Those professors' responses are then
+invalidated too, but never resurrected.
+
+The cache is per process. Other workers (and scripts) don't see this
+process's invalidations, so RESPONSE_CACHE_TTL_SECONDS bounds how stale
+a response can get there.
+"""
+import threading
+from collections import OrderedDict
+from typing import Any, Hashable, Tuple
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+
+
+class ProfessorResponseCache:
+    """
+    TTLCache of response bodies keyed by (professor_id, generation, *parts).
+
+    Usage:
+        key = cache.key(professor_id, "reviews", sort, cursor)
+        body = cache.get(key)
+        if body is MISSING:
+            body = render()
+            cache.set(key, body)
+        ...
+        cache.invalidate(professor_id)  # after committing a write
+    """
+
+    def __init__(self, maxsize: int, ttl: float, max_generations: int):
+        self._cache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self.max_generations = max_generations
+        self._generations = OrderedDict()  # professor_id -> generation, oldest invalidation first
+        self._floor = 0  # generation of professors without an entry
+        self._last_generation = 0
+        self._lock = threading.Lock()
+        self.invalidations = 0
+
+    def key(self, professor_id: int, *parts: Hashable) -> Tuple:
+        """Cache key for the professor's current generation"""
+        return (professor_id, self._generations.get(professor_id, self._floor)) + parts
+
+    def get(self, key: Tuple) -> Any:
+        """Return the cached value, or MISSING"""
+        return self._cache.get(key)
+
+    def set(self, key: Tuple, value: Any):
+        self._cache.set(key, value)
+
+    def invalidate(self, professor_id: int):
+        """Drop every cached response for a professor"""
+        with self._lock:
+            self._last_generation += 1
+            self._generations[professor_id] = self._last_generation
+            self._generations.move_to_end(professor_id)
+            self.invalidations += 1
+            if len(self._generations) > self.max_generations:
+                # Professors dropped here fall back to a floor newer than any generation they had
+                for _ in range(len(self._generations) // 2):
+                    self._generations.popitem(last=False)
+                self._floor = self._last_generation
+
+    def clear(self):
+        self._cache.clear()
+
+    def stats(self) -> dict:
+        return {
+            **self._cache.stats(),
+            "ttl_seconds": self._cache.ttl,
+            "invalidations": self.invalidations,
+            "generations": len(self._generations),
+        }
+
+
+# Shared instance for the professor read endpoints
+professor_response_cache = ProfessorResponseCache(
+    maxsize=settings.RESPONSE_CACHE_SIZE,
+    ttl=settings.RESPONSE_CACHE_TTL_SECONDS,
+    max_generations=settings.RESPONSE_CACHE_SIZE
+)
@@ -0,0 +1,67 @@
+"""
+Review Search
+Full-text search over review comments for GET /reviews/search.
+
+On PostgreSQL, reviews.search_vector is a generated tsvector column
+(to_tsvector('english', comment)) with a GIN index, so the database keeps it
+current on every insert/update and a search only visits the reviews whose
+comment contains the query's lexemes. The column is declared on the reviews
+table but only created on PostgreSQL, and never loaded into Review objects.
+
+Results are ranked with ts_rank and paginated on (rank, id): the rank is
+only computed for the matching reviews, never for the whole table.
+
+SQLite has no full-text column. There, every query word must appear in the
+comment (ILIKE) and results come newest first with a rank of 0.
+"""
+from typing import Optional
+
+from sqlalchemy import and_, func, literal, literal_column, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import escape_like
+from app.models.professor import Professor
+from app.models.review import Review, REVIEW_VISIBLE
+
+
+# Must match the generated column's configuration so query lexemes are stemmed the same way
+SEARCH_CONFIG = literal_column("'english'::regconfig")
+
+search_vector = Review.__table__.c.search_vector
+
+
+def has_full_text_search(db: AsyncSession) -> bool:
+    """Whether the session's database has the search_vector column"""
+    return db.get_bind().dialect.name == "postgresql"
+
+
+def search_reviews_query(
+    q: str,
+    full_text: bool,
+    professor_id: Optional[int] = None,
+    department: Optional[str] = None
+):
+    """
+    (Review, professor name, department, rank) rows of the visible reviews
+    matching q, and the rank expression the rows are ordered by (with id).
+    """
+    if full_text:
+        # websearch syntax: "office hours" -curve, or plain words (all required)
+        ts_query = func.websearch_to_tsquery(SEARCH_CONFIG, q)
+        rank = func.ts_rank(search_vector, ts_query)
+        match = search_vector.op("@@")(ts_query)
+    else:
+        rank = literal(0.0)
+        match = and_(*[Review.comment.ilike(f"%{escape_like(word)}%", escape="\\") for word in q.split()])
+
+    query = (
+        select(Review, Professor.name, Professor.department, rank.label("rank"))
+        .join(Professor, Professor.id == Review.professor_id)
+        .where(match, Review.is_hidden == REVIEW_VISIBLE)
+    )
+    if professor_id is not None:
+        query = query.where(Review.professor_id == professor_id)
+    if department:
+        query = query.where(Professor.department == department)
+
+    return query, rank
@@ -1,44 +1,52 @@
 """Security utilities for password hashing and JWT tokens"""
 
+import time
 from datetime import datetime, timedelta
 from typing import Optional
 from jose import JWTError, jwt
-import bcrypt  # Use bcrypt directly instead of passlib
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, object_session
 
+from app.core.cache import TTLCache, MISSING
 from app.core.config import settings
-from app.core.database import get_db
-from app.models.user import User
+from app.core.database import get_async_db
+from app.core.password_hashing import hash_password, verify_password, PasswordHashPool, HashPoolFull
+from app.models.user import User, UserRole
 from app.schemas.user import TokenData
 
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login")
 
+# bcrypt runs here instead of the shared threadpool used by sync endpoints
+password_hash_pool = PasswordHashPool(
+    workers=settings.PASSWORD_HASH_WORKERS,
+    max_pending=settings.PASSWORD_HASH_MAX_PENDING,
+    use_processes=settings.PASSWORD_HASH_USE_PROCESSES
+)
 
-def hash_password(password: str) -> str:
-    """
-    Hash a plain password using bcrypt directly.
-    
-    Using bcrypt library directly avoids passlib compatibility issues.
-    """
-    # Encode password to bytes (bcrypt requires bytes)
-    password_bytes = password.encode('utf-8')
-    # Generate salt and hash
-    salt = bcrypt.gensalt(rounds=12)
-    hashed = bcrypt.hashpw(password_bytes, salt)
-    # Return as string for database storage
-    return hashed.decode('utf-8')
 
+async def hash_password_async(password: str) -> str:
+    """Hash a password in the dedicated hashing pool (503 when saturated)"""
+    return await _run_in_hash_pool(hash_password, password)
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    """
-    Verify a plain password against a hashed password.
-    """
-    password_bytes = plain_password.encode('utf-8')
-    hashed_bytes = hashed_password.encode('utf-8')
-    return bcrypt.checkpw(password_bytes, hashed_bytes)
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password in the dedicated hashing pool (503 when saturated)"""
+    return await _run_in_hash_pool(verify_password, plain_password, hashed_password)
+
+
+async def _run_in_hash_pool(func, *args):
+    try:
+        return await password_hash_pool.run(func, *args)
+    except HashPoolFull:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many authentication requests. Please try again shortly.",
+            headers={"Retry-After": str(settings.PASSWORD_HASH_RETRY_AFTER_SECONDS)},
+        )
 
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
@@ -55,6 +63,13 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     return encoded_jwt
 
 
+# Already-verified tokens, each kept only until its own `exp`
+_token_cache = TTLCache(
+    maxsize=settings.TOKEN_CACHE_SIZE,
+    ttl=settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60
+)
+
+
 def decode_access_token(token: str) -> TokenData:
     """Decode and validate a JWT token"""
     credentials_exception = HTTPException(
@@ -63,6 +78,10 @@ def decode_access_token(token: str) -> TokenData:
         headers={"WWW-Authenticate": "Bearer"},
     )
     
+    token_data = _token_cache.get(token)
+    if token_data is not MISSING:
+        return token_data
+    
     try:
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
         email: str = payload.get("sub")
@@ -71,15 +90,114 @@ def decode_access_token(token: str) -> TokenData:
         if email is None:
             raise credentials_exception
             
-        return TokenData(email=email, role=role)
+        token_data = TokenData(email=email, role=role)
     except JWTError:
         raise credentials_exception
+    
+    # Only tokens that expire are cached, and never past their expiry
+    exp = payload.get("exp")
+    if isinstance(exp, (int, float)):
+        remaining = exp - time.time()
+        if remaining > 0:
+            _token_cache.set(token, token_data, ttl=remaining)
+    
+    return token_data
+
+
+class Principal:
+    """
+    The authenticated user as seen by route handlers.
+    A detached snapshot of the User row, safe to cache between requests.
+    """
+    __slots__ = ("id", "email", "role", "created_at")
+
+    def __init__(self, id: int, email: str, role: UserRole, created_at: datetime):
+        self.id = id
+        self.email = email
+        self.role = role
+        self.created_at = created_at
+
+    @classmethod
+    def from_user(cls, user: User) -> "Principal":
+        return cls(user.id, user.email, user.role, user.created_at)
+
+    def __repr__(self):
+        return f"<Principal(id={self.id}, email='{self.email}', role='{self.role.value}')>"
+
+    def is_admin(self):
+        return self.role == UserRole.ADMIN
+
+    def is_professor(self):
+        return self.role == UserRole.PROFESSOR
+
+    def is_student(self):
+        return self.role == UserRole.STUDENT
+
+
+# Resolved principals keyed by token subject (email)
+_principal_cache = TTLCache(
+    maxsize=settings.PRINCIPAL_CACHE_SIZE,
+    ttl=settings.PRINCIPAL_CACHE_TTL_SECONDS
+)
+
+
+def invalidate_principal(email: str):
+    """Drop the cached principal for a user (call when their role or email changes)"""
+    _principal_cache.delete(email)
+
+
+def _invalidate_after_commit(user: User, email: str):
+    """
+    Drop the user's cached principal once the change is committed. Evicting
+    earlier would let a concurrent request re-cache the old role for the
+    full TTL; a rollback leaves the cache as it is.
+    """
+    session = object_session(user)
+    if session is None:
+        invalidate_principal(email)
+    else:
+        session.info.setdefault("stale_principals", set()).add(email)
+
+
+@event.listens_for(User.role, "set")
+def _on_role_change(user, value, oldvalue, initiator):
+    if user.email:
+        _invalidate_after_commit(user, user.email)
+
+
+@event.listens_for(User.email, "set")
+def _on_email_change(user, value, oldvalue, initiator):
+    if isinstance(oldvalue, str):
+        _invalidate_after_commit(user, oldvalue)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_stale_principals(session):
+    for email in session.info.pop("stale_principals", ()):
+        invalidate_principal(email)
+
+
+@event.listens_for(Session, "after_rollback")
+def _keep_principals(session):
+    session.info.pop("stale_principals", None)
+
+
+async def _resolve_principal(db: AsyncSession, email: str) -> Optional[Principal]:
+    """Look up the user for a token subject, using the principal cache"""
+    principal = _principal_cache.get(email)
+    if principal is MISSING:
+        user = await db.scalar(select(User).where(User.email == email))
+        if user is None:
+            return None
+        principal = Principal.from_user(user)
+        _principal_cache.set(email, principal)
+    return principal
 
 
 async def get_current_user(
     token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db)
-) -> User:
+    db: AsyncSession = Depends(get_async_db)
+) -> Principal:
     """Get the current authenticated user from JWT token"""
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -88,7 +206,7 @@ async def get_current_user(
     )
     
     token_data = decode_access_token(token)
-    user = db.query(User).filter(User.email == token_data.email).first()
+    user = await _resolve_principal(db, token_data.email)
     
     if user is None:
         raise credentials_exception
@@ -97,31 +215,30 @@ async def get_current_user(
 
 
 async def get_current_active_user(
-    current_user: User = Depends(get_current_user)
-) -> User:
+    current_user: Principal = Depends(get_current_user)
+) -> Principal:
     """Get current user and verify they're active"""
     return current_user
 
 
 async def get_current_user_optional(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     token: Optional[str] = Depends(OAuth2PasswordBearer(tokenUrl="auth/login", auto_error=False))
-) -> Optional[User]:
+) -> Optional[Principal]:
     """Get the current user if authenticated, None otherwise (for optional auth)"""
     if not token:
         return None
     
     try:
         token_data = decode_access_token(token)
-        user = db.query(User).filter(User.email == token_data.email).first()
-        return user
+        return await _resolve_principal(db, token_data.email)
     except:
         return None
 
 
 def require_role(allowed_roles: list[str]):
     """Dependency to require specific user roles"""
-    async def role_checker(current_user: User = Depends(get_current_user)):
+    async def role_checker(current_user: Principal = Depends(get_current_user)):
         if current_user.role.value not in allowed_roles:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
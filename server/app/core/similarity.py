@@ -0,0 +1,432 @@
+"""
+Professor Similarity Index
+Precomputed "similar professors" for the profile page.
+
+Each professor is described by a feature vector made of blocks:
+- department (one-hot)
+- average rating and average difficulty, each spread over the 1-5 scale
+  with a Gaussian kernel so that close averages overlap
+- grade histogram shape
+- courses taught (course codes hashed into COURSE_BUCKETS buckets)
+
+Every block is scaled to unit length and weighted, and the whole vector is
+normalized, so the cosine similarity of two professors is a dot product:
+a weighted mix of the per-block similarities.
+
+The top SIMILARITY_TOP_K neighbours of each professor are stored in
+professor_similarities, so serving them is a single indexed lookup.
+build_similarity_index.py rebuilds everything; when a professor's
+aggregates change, refresh_similarities() reloads only that professor's
+features into a cached matrix and recomputes only the rows that can be
+affected: the professor's own, the rows that list it, and the rows it now
+beats.
+"""
+import threading
+import time
+import zlib
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import delete, distinct, func, insert, select
+from sqlalchemy.orm import Session
+
+from app.core.background import CoalescingQueue
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.professor import Professor
+from app.models.professor_grade_histogram import ProfessorGradeHistogram, GRADE_COLUMNS
+from app.models.professor_similarity import ProfessorSimilarity
+from app.models.review import Review, REVIEW_VISIBLE
+
+
+# Relative weight of each feature block in the similarity score
+FEATURE_WEIGHTS = {
+    "department": 1.0,
+    "rating": 0.5,
+    "difficulty": 0.5,
+    "grades": 1.0,
+    "courses": 1.0,
+}
+
+COURSE_BUCKETS = 256
+RATING_KERNEL_WIDTH = 0.75
+
+# Rows of the similarity matrix computed at once (CHUNK_SIZE x professors floats)
+CHUNK_SIZE = 1024
+
+_RATING_SCALE = np.arange(1, 6, dtype=np.float64)
+
+_IN_BATCH = 500
+
+
+class RawFeatures(NamedTuple):
+    """Per-professor inputs of the feature vectors, as loaded from the database"""
+    professor_ids: np.ndarray
+    departments: List[str]
+    reviewed: np.ndarray
+    avg_rating: np.ndarray
+    avg_difficulty: np.ndarray
+    grades: np.ndarray
+    courses: np.ndarray
+
+
+def _unit_rows(block: np.ndarray) -> np.ndarray:
+    """Scale each row to length 1 (all-zero rows stay zero)"""
+    norms = np.linalg.norm(block, axis=1, keepdims=True)
+    return np.divide(block, norms, out=np.zeros_like(block), where=norms > 0)
+
+
+def _rating_kernel(values: np.ndarray, present: np.ndarray) -> np.ndarray:
+    """Spread averages over the 1-5 scale; professors without reviews get zeros"""
+    block = np.exp(-((values[:, None] - _RATING_SCALE[None, :]) ** 2) / (2 * RATING_KERNEL_WIDTH ** 2))
+    block[~present] = 0.0
+    return block
+
+
+def _course_bucket(course_code: str) -> int:
+    """Stable (unlike hash()) bucket for a course code"""
+    return zlib.crc32(course_code.encode("utf-8")) % COURSE_BUCKETS
+
+
+class FeatureMatrix:
+    """
+    Unit-length feature vectors, one row per professor.
+
+    Rows can be replaced in place (update), so a refresh only reloads the
+    professors that changed. New departments are appended to the one-hot
+    block as zero columns for everyone else.
+    """
+
+    def __init__(self, raw: RawFeatures):
+        self.departments = {name: column for column, name in enumerate(sorted(set(raw.departments)))}
+        self.professor_ids = raw.professor_ids
+        self.vectors = self._vectors(raw)
+        # Score a professor must beat to enter each row's stored top-k (0 when the list isn't full)
+        self.score_to_beat = np.zeros(len(raw.professor_ids))
+        self._index_rows()
+
+    def __len__(self):
+        return len(self.professor_ids)
+
+    def _index_rows(self):
+        self.rows = {professor_id: row for row, professor_id in enumerate(self.professor_ids.tolist())}
+
+    def _vectors(self, raw: RawFeatures) -> np.ndarray:
+        count = len(raw.professor_ids)
+        department = np.zeros((count, len(self.departments)))
+        department[np.arange(count), [self.departments[name] for name in raw.departments]] = 1.0
+        blocks = {
+            "department": department,
+            "rating": _rating_kernel(raw.avg_rating, raw.reviewed),
+            "difficulty": _rating_kernel(raw.avg_difficulty, raw.reviewed),
+            "grades": raw.grades,
+            "courses": raw.courses,
+        }
+        vectors = np.hstack([np.sqrt(FEATURE_WEIGHTS[name]) * _unit_rows(block) for name, block in blocks.items()])
+        return _unit_rows(vectors)
+
+    def update(self, professor_ids: Iterable[int], raw: RawFeatures):
+        """
+        Replace the rows of the given professors with freshly loaded features.
+        Professors missing from the matrix are appended, those missing from
+        `raw` (deleted) are dropped.
+        """
+        new_departments = sorted(set(raw.departments).difference(self.departments))
+        if new_departments:
+            width = len(self.departments)
+            self.vectors = np.insert(self.vectors, [width] * len(new_departments), 0.0, axis=1)
+            for name in new_departments:
+                self.departments[name] = len(self.departments)
+
+        vectors = self._vectors(raw)
+        loaded = raw.professor_ids.tolist()
+        known = [index for index, professor_id in enumerate(loaded) if professor_id in self.rows]
+        added = [index for index, professor_id in enumerate(loaded) if professor_id not in self.rows]
+        self.vectors[[self.rows[loaded[index]] for index in known]] = vectors[known]
+
+        removed = [self.rows[professor_id] for professor_id in set(professor_ids).difference(loaded) if professor_id in self.rows]
+        if added or removed:
+            keep = np.ones(len(self.professor_ids), dtype=bool)
+            keep[removed] = False
+            self.professor_ids = np.concatenate([self.professor_ids[keep], raw.professor_ids[added]])
+            self.vectors = np.vstack([self.vectors[keep], vectors[added]])
+            self.score_to_beat = np.concatenate([self.score_to_beat[keep], np.zeros(len(added))])
+            self._index_rows()
+
+    def load_cutoffs(self, db: Session, top_k: int):
+        """Read each stored list's k-th score (score_to_beat) from professor_similarities"""
+        self.score_to_beat = np.zeros(len(self.professor_ids))
+        cutoffs = db.execute(
+            select(ProfessorSimilarity.professor_id, func.min(ProfessorSimilarity.score), func.count())
+            .group_by(ProfessorSimilarity.professor_id)
+        )
+        for professor_id, min_score, listed in cutoffs:
+            if professor_id in self.rows and listed >= top_k:
+                self.score_to_beat[self.rows[professor_id]] = min_score
+
+    def set_cutoffs(self, neighbours: Dict[int, List[Tuple[int, float]]], top_k: int):
+        """Record the k-th scores of freshly computed neighbour lists"""
+        for professor_id, similar in neighbours.items():
+            self.score_to_beat[self.rows[professor_id]] = similar[-1][1] if len(similar) >= top_k else 0.0
+
+
+def _id_batches(professor_ids: Optional[Iterable[int]]):
+    """IN-list batches of professor ids, or a single None batch (no filter)"""
+    if professor_ids is None:
+        yield None
+        return
+    professor_ids = sorted(professor_ids)
+    for start in range(0, len(professor_ids), _IN_BATCH):
+        yield professor_ids[start:start + _IN_BATCH]
+
+
+def _for_batch(query, column, batch):
+    return query if batch is None else query.where(column.in_(batch))
+
+
+def load_raw_features(db: Session, professor_ids: Optional[Iterable[int]] = None) -> RawFeatures:
+    """
+    Feature inputs of all professors, or only of the given ones, with three
+    set-based queries (per batch of ids)
+    """
+    batches = list(_id_batches(professor_ids))
+    professors = []
+    for batch in batches:
+        professors += db.execute(_for_batch(
+            select(
+                Professor.id,
+                Professor.department,
+                Professor.avg_rating,
+                Professor.avg_difficulty,
+                Professor.total_reviews
+            ).order_by(Professor.id),
+            Professor.id, batch
+        )).all()
+    rows = {professor.id: row for row, professor in enumerate(professors)}
+    count = len(professors)
+
+    grades = np.zeros((count, len(GRADE_COLUMNS)))
+    grade_columns = [getattr(ProfessorGradeHistogram, column) for column in GRADE_COLUMNS.values()]
+    for batch in batches:
+        histograms = db.execute(_for_batch(
+            select(ProfessorGradeHistogram.professor_id, *grade_columns),
+            ProfessorGradeHistogram.professor_id, batch
+        ))
+        for professor_id, *counts in histograms:
+            if professor_id in rows:
+                grades[rows[professor_id]] = counts
+
+    courses = np.zeros((count, COURSE_BUCKETS))
+    course_code = func.upper(func.trim(Review.course_code))
+    for batch in batches:
+        taught = db.execute(_for_batch(
+            select(Review.professor_id, course_code).where(
+                Review.is_hidden == REVIEW_VISIBLE,
+                Review.course_code.isnot(None)
+            ).group_by(Review.professor_id, course_code),
+            Review.professor_id, batch
+        ))
+        for professor_id, code in taught:
+            if professor_id in rows and code:
+                courses[rows[professor_id], _course_bucket(code)] = 1.0
+
+    return RawFeatures(
+        professor_ids=np.array([professor.id for professor in professors], dtype=np.int64),
+        departments=[professor.department for professor in professors],
+        reviewed=np.array([bool(professor.total_reviews) for professor in professors], dtype=bool),
+        avg_rating=np.array([professor.avg_rating or 0.0 for professor in professors], dtype=np.float64),
+        avg_difficulty=np.array([professor.avg_difficulty or 0.0 for professor in professors], dtype=np.float64),
+        grades=grades,
+        courses=courses,
+    )
+
+
+def load_features(db: Session) -> FeatureMatrix:
+    """Build the feature vectors of all professors"""
+    return FeatureMatrix(load_raw_features(db))
+
+
+def top_neighbours(features: FeatureMatrix, rows: Iterable[int], top_k: int) -> Dict[int, List[Tuple[int, float]]]:
+    """
+    Top-k most similar professors for the given matrix rows.
+
+    Returns:
+        {professor_id: [(similar_professor_id, score), ...]} best first,
+        without zero-similarity neighbours
+    """
+    rows = np.fromiter(rows, dtype=np.int64)
+    k = min(top_k, len(features) - 1)
+    neighbours = {}
+
+    for start in range(0, len(rows), CHUNK_SIZE):
+        chunk = rows[start:start + CHUNK_SIZE]
+        if k <= 0:
+            neighbours.update((int(features.professor_ids[row]), []) for row in chunk)
+            continue
+
+        scores = features.vectors[chunk] @ features.vectors.T
+        scores[np.arange(len(chunk)), chunk] = -np.inf  # a professor is not its own neighbour
+
+        top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        top_scores = np.take_along_axis(scores, top, axis=1)
+        order = np.argsort(-top_scores, axis=1, kind="stable")
+        top = np.take_along_axis(top, order, axis=1)
+        top_scores = np.take_along_axis(top_scores, order, axis=1)
+
+        for row, columns, row_scores in zip(chunk, top, top_scores):
+            neighbours[int(features.professor_ids[row])] = [
+                (int(features.professor_ids[column]), float(score))
+                for column, score in zip(columns, row_scores)
+                if score > 0
+            ]
+
+    return neighbours
+
+
+def _store(db: Session, neighbours: Dict[int, List[Tuple[int, float]]]):
+    """Replace the stored neighbour lists of the given professors"""
+    professor_ids = list(neighbours)
+    for start in range(0, len(professor_ids), _IN_BATCH):
+        db.execute(delete(ProfessorSimilarity).where(
+            ProfessorSimilarity.professor_id.in_(professor_ids[start:start + _IN_BATCH])
+        ))
+    rows = [
+        {"professor_id": professor_id, "rank": rank, "similar_professor_id": similar_id, "score": score}
+        for professor_id, similar in neighbours.items()
+        for rank, (similar_id, score) in enumerate(similar)
+    ]
+    if rows:
+        db.execute(insert(ProfessorSimilarity), rows)
+
+
+def rebuild_similarity_index(db: Session, top_k: int = settings.SIMILARITY_TOP_K) -> int:
+    """
+    Recompute every professor's neighbours (doesn't commit).
+
+    Returns:
+        Number of professors indexed
+    """
+    global _cached_features
+    features = load_features(db)
+    neighbours = top_neighbours(features, range(len(features)), top_k)
+    db.execute(delete(ProfessorSimilarity))
+    _store(db, neighbours)
+    with _cache_lock:
+        _cached_features = None
+    return len(neighbours)
+
+
+# Feature matrix kept between refreshes, so a flush only reloads the changed
+# professors. Reloaded in full every SIMILARITY_FEATURES_MAX_AGE_SECONDS to
+# pick up changes queued in other worker processes.
+_cached_features: Optional[FeatureMatrix] = None
+_cached_at = 0.0
+_cache_lock = threading.Lock()
+
+
+def _features_for_refresh(db: Session, changed_ids: List[int], top_k: int) -> FeatureMatrix:
+    """The cached feature matrix with the changed professors' rows reloaded"""
+    global _cached_features, _cached_at
+    features = _cached_features
+    if features is None or time.monotonic() - _cached_at > settings.SIMILARITY_FEATURES_MAX_AGE_SECONDS:
+        features = load_features(db)
+        features.load_cutoffs(db, top_k)
+        _cached_features, _cached_at = features, time.monotonic()
+    else:
+        features.update(changed_ids, load_raw_features(db, changed_ids))
+    return features
+
+
+def refresh_similarities(db: Session, professor_ids: Iterable[int], top_k: int = settings.SIMILARITY_TOP_K) -> int:
+    """
+    Update the index after the given professors' features changed (doesn't commit).
+
+    Besides the changed professors' own rows, a professor's row is recomputed
+    when it lists one of them (its score may have dropped) or when one of them
+    now scores above its current k-th neighbour.
+
+    Only the changed professors' features are read from the database; the
+    rest of the matrix and the k-th scores come from the cache.
+
+    Returns:
+        Number of neighbour lists recomputed
+    """
+    global _cached_features
+    with _cache_lock:
+        try:
+            return _refresh(db, sorted(set(professor_ids)), top_k)
+        except Exception:
+            _cached_features = None  # May no longer match the database
+            raise
+
+
+def _refresh(db: Session, professor_ids: List[int], top_k: int) -> int:
+    if not professor_ids:
+        return 0
+    features = _features_for_refresh(db, professor_ids, top_k)
+    changed_ids = [professor_id for professor_id in professor_ids if professor_id in features.rows]
+    if not changed_ids:
+        return 0
+    changed_rows = np.array([features.rows[professor_id] for professor_id in changed_ids], dtype=np.int64)
+
+    # Best score of each professor against any changed professor, CHUNK_SIZE changed professors at a time
+    best = np.full(len(features), -np.inf)
+    for start in range(0, len(changed_rows), CHUNK_SIZE):
+        chunk = changed_rows[start:start + CHUNK_SIZE]
+        scores = features.vectors @ features.vectors[chunk].T
+        scores[chunk, np.arange(len(chunk))] = -np.inf  # a professor is not its own neighbour
+        np.maximum(best, scores.max(axis=1), out=best)
+    affected = set(np.flatnonzero(best > features.score_to_beat).tolist())
+
+    for batch in _id_batches(changed_ids):
+        listing = db.scalars(
+            select(distinct(ProfessorSimilarity.professor_id))
+            .where(ProfessorSimilarity.similar_professor_id.in_(batch))
+        )
+        affected.update(features.rows[professor_id] for professor_id in listing if professor_id in features.rows)
+    affected.update(changed_rows.tolist())
+
+    neighbours = top_neighbours(features, sorted(affected), top_k)
+    _store(db, neighbours)
+    features.set_cutoffs(neighbours, top_k)
+    return len(affected)
+
+
+def similar_professors_query(professor_id: int, limit: int):
+    """(Professor, score) rows of a professor's stored neighbours, best first"""
+    return (
+        select(Professor, ProfessorSimilarity.score)
+        .join(ProfessorSimilarity, ProfessorSimilarity.similar_professor_id == Professor.id)
+        .where(ProfessorSimilarity.professor_id == professor_id)
+        .order_by(ProfessorSimilarity.rank)
+        .limit(limit)
+    )
+
+
+def refresh_professors(professor_ids: List[int]):
+    """Refresh the neighbours around a batch of changed professors (queue handler)"""
+    db = SessionLocal()
+    try:
+        refresh_similarities(db, professor_ids)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+# Professors whose aggregates changed, folded into the index every SIMILARITY_REFRESH_INTERVAL_MS
+similarity_refresh_queue = CoalescingQueue(
+    "similarity-refresh",
+    refresh_professors,
+    interval=settings.SIMILARITY_REFRESH_INTERVAL_MS / 1000,
+    max_batch=settings.SIMILARITY_REFRESH_BATCH_SIZE
+)
+
+
+def professors_changed(professor_ids: Iterable[int]):
+    """Queue a refresh for professors whose aggregates changed (after commit)"""
+    if similarity_refresh_queue.running:
+        for professor_id in professor_ids:
+            similarity_refresh_queue.add(professor_id)
@@ -0,0 +1,212 @@
+"""
+SQL Instrumentation
+Per-request database metrics collected from SQLAlchemy cursor events.
+
+For every HTTP request we record:
+- how many statements ran and the total time spent in the database
+- the slowest statements
+- statement "shapes" (SQL with literals and IN-lists collapsed) that repeat
+  more than N_PLUS_ONE_THRESHOLD times, the signature of an N+1 query loop
+
+Independently of requests, any statement slower than SLOW_QUERY_MS is logged.
+Replaces engine echo, which printed every statement synchronously.
+"""
+import logging
+import re
+import threading
+import time
+from collections import Counter
+from contextvars import ContextVar
+from typing import List, Optional, Tuple
+
+from sqlalchemy import event
+
+from app.core.config import settings
+
+
+logger = logging.getLogger(__name__)
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PARAMETER_LIST = re.compile(r"\(\s*(?:\?|%\([^)]*\)s|\$\d+|:\w+|__\[POSTCOMPILE_\w+\])(?:\s*,\s*(?:\?|%\([^)]*\)s|\$\d+|:\w+|__\[POSTCOMPILE_\w+\]))*\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def statement_shape(statement: str) -> str:
+    """
+    Normalize a SQL statement so repeats of the same query compare equal.
+    Literals become ? and parameter lists of any length become (...).
+    """
+    shape = _STRING_LITERAL.sub("?", statement)
+    shape = _NUMBER_LITERAL.sub("?", shape)
+    shape = _PARAMETER_LIST.sub("(...)", shape)
+    return _WHITESPACE.sub(" ", shape).strip()
+
+
+class RequestQueryStats:
+    """Statements executed while handling one request"""
+
+    def __init__(self, keep_slowest: int):
+        self.keep_slowest = keep_slowest
+        self.query_count = 0
+        self.db_time = 0.0
+        self.slowest: List[Tuple[float, str]] = []
+        self.shapes = Counter()
+
+    def record(self, statement: str, elapsed: float):
+        self.query_count += 1
+        self.db_time += elapsed
+        self.shapes[statement_shape(statement)] += 1
+        if len(self.slowest) < self.keep_slowest or elapsed > self.slowest[-1][0]:
+            self.slowest.append((elapsed, statement))
+            self.slowest.sort(key=lambda item: item[0], reverse=True)
+            del self.slowest[self.keep_slowest:]
+
+    def repeated_shapes(self, threshold: int) -> List[Tuple[str, int]]:
+        """Statement shapes executed more than `threshold` times"""
+        return [(shape, count) for shape, count in self.shapes.most_common() if count > threshold]
+
+
+_current_request: ContextVar[Optional[RequestQueryStats]] = ContextVar("sql_request_stats", default=None)
+
+
+class QueryMetrics:
+    """
+    Aggregated per-route metrics, exposed through the admin API.
+
+    - slow_query_threshold: statements slower than this are logged (seconds)
+    - n_plus_one_threshold: repeats of one shape per request before flagging
+    """
+
+    def __init__(self, slow_query_threshold: float, n_plus_one_threshold: int, keep_slowest: int):
+        self.slow_query_threshold = slow_query_threshold
+        self.n_plus_one_threshold = n_plus_one_threshold
+        self.keep_slowest = keep_slowest
+        self._lock = threading.Lock()
+        self._routes = {}
+        self.slow_queries = 0
+        self.n_plus_one_count = 0
+        self.n_plus_one_by_route = Counter()
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["query_start_time"].pop()
+
+        request_stats = _current_request.get()
+        if request_stats is not None:
+            request_stats.record(statement, elapsed)
+
+        if elapsed >= self.slow_query_threshold:
+            with self._lock:
+                self.slow_queries += 1
+            logger.warning("Slow query (%.1f ms): %s", elapsed * 1000, _WHITESPACE.sub(" ", statement))
+
+    def instrument(self, engine):
+        """Attach the timing listeners to a (sync) engine"""
+        event.listen(engine, "before_cursor_execute", self._before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", self._after_cursor_execute)
+
+    def finish_request(self, route: str, request_stats: RequestQueryStats):
+        """Fold one request's statements into the route totals and flag N+1 patterns"""
+        repeated = request_stats.repeated_shapes(self.n_plus_one_threshold)
+        for shape, count in repeated:
+            logger.warning("Possible N+1 in %s: statement ran %d times: %s", route, count, shape)
+
+        with self._lock:
+            totals = self._routes.setdefault(route, {
+                "requests": 0, "queries": 0, "db_time": 0.0, "max_queries": 0, "max_db_time": 0.0,
+                "slowest": [],
+            })
+            totals["requests"] += 1
+            totals["queries"] += request_stats.query_count
+            totals["db_time"] += request_stats.db_time
+            totals["max_queries"] = max(totals["max_queries"], request_stats.query_count)
+            totals["max_db_time"] = max(totals["max_db_time"], request_stats.db_time)
+            slowest = totals["slowest"] + request_stats.slowest
+            slowest.sort(key=lambda item: item[0], reverse=True)
+            totals["slowest"] = slowest[:self.keep_slowest]
+            if repeated:
+                self.n_plus_one_count += 1
+                self.n_plus_one_by_route[route] += 1
+
+        logger.debug(
+            "%s: %d queries, %.1f ms in database",
+            route, request_stats.query_count, request_stats.db_time * 1000
+        )
+
+    def stats(self) -> dict:
+        with self._lock:
+            routes = {
+                route: {
+                    "requests": totals["requests"],
+                    "avg_queries": round(totals["queries"] / totals["requests"], 2),
+                    "max_queries": totals["max_queries"],
+                    "avg_db_ms": round(totals["db_time"] / totals["requests"] * 1000, 2),
+                    "max_db_ms": round(totals["max_db_time"] * 1000, 2),
+                    "slowest": [
+                        {"ms": round(elapsed * 1000, 2), "statement": _WHITESPACE.sub(" ", statement)}
+                        for elapsed, statement in totals["slowest"]
+                    ],
+                }
+                for route, totals in self._routes.items()
+            }
+            return {
+                "slow_query_ms": round(self.slow_query_threshold * 1000, 1),
+                "n_plus_one_threshold": self.n_plus_one_threshold,
+                "slow_queries": self.slow_queries,
+                "n_plus_one_requests": self.n_plus_one_count,
+                "n_plus_one_by_route": dict(self.n_plus_one_by_route),
+                "routes": routes,
+            }
+
+
+def _route_name(scope) -> str:
+    """Handler name once routing has run, e.g. reviews.get_professor_reviews"""
+    endpoint = scope.get("endpoint")
+    if endpoint is not None:
+        module = endpoint.__module__.rsplit(".", 1)[-1]
+        return f"{module}.{endpoint.__name__}"
+    return f"{scope.get('method', '')} {scope.get('path', '')}".strip()
+
+
+class SQLInstrumentationMiddleware:
+    """
+    ASGI middleware that collects the statements run by each HTTP request.
+    Adds X-DB-Query-Count and X-DB-Time-Ms headers to the response.
+    """
+
+    def __init__(self, app, metrics: "QueryMetrics"):
+        self.app = app
+        self.metrics = metrics
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_stats = RequestQueryStats(self.metrics.keep_slowest)
+        token = _current_request.set(request_stats)
+
+        async def send_with_headers(message):
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.append((b"x-db-query-count", str(request_stats.query_count).encode()))
+                headers.append((b"x-db-time-ms", f"{request_stats.db_time * 1000:.1f}".encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_headers)
+        finally:
+            _current_request.reset(token)
+            self.metrics.finish_request(_route_name(scope), request_stats)
+
+
+# Shared instance, attached to the engines by the application
+query_metrics = QueryMetrics(
+    slow_query_threshold=settings.SLOW_QUERY_MS / 1000,
+    n_plus_one_threshold=settings.N_PLUS_ONE_THRESHOLD,
+    keep_slowest=settings.SQL_SLOWEST_PER_REQUEST
+)
@@ -0,0 +1,407 @@
+"""
+Professor Typeahead
+In-process index behind GET /professors/autocomplete, so suggestions as the
+user types never touch the database.
+
+Names and departments are split into lowercase, accent-free tokens:
+- a sorted vocabulary answers prefix lookups with a binary search (what a
+  prefix trie does, in a flat list)
+- a trigram -> tokens inverted index finds candidates for misspelled
+  tokens, which are then verified by edit distance
+
+Every query token has to match a token of the professor, exactly, by
+prefix, or within max_edits() typos. Name matches rank above department
+matches, and exact above prefix above fuzzy. Candidates are drawn lazily
+from the most selective query token, best tier first, from posting lists
+kept sorted by (field, name length); the other query tokens are checked
+against each candidate's own handful of tokens. A search therefore stops
+after a few dozen candidates instead of scoring every professor named
+"John". Ranking is approximate past the first tier that fills the page.
+
+The index is loaded on startup and kept current by the professor create and
+update routes. Other worker processes pick up those changes on their next
+reload, every TYPEAHEAD_RELOAD_SECONDS. Changes made while a reload is reading
+the table are replayed on top of the new index, so they are not lost.
+"""
+import bisect
+import heapq
+import itertools
+import logging
+import re
+import threading
+import unicodedata
+from collections import Counter
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+from sqlalchemy import select
+
+from app.core.database import SessionLocal
+from app.models.professor import Professor
+
+
+logger = logging.getLogger(__name__)
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+
+# Tokens shorter than this are only matched by prefix
+MIN_FUZZY_LENGTH = 4
+
+# Vocabulary tokens examined per prefix lookup (bounds 1-letter queries)
+MAX_PREFIX_TOKENS = 500
+
+# Matching candidates collected per search, as a multiple of the result limit
+CANDIDATES_PER_RESULT = 4
+
+# Upper bound on the candidates examined per search, matching or not
+MAX_CANDIDATES_EXAMINED = 256
+
+# Posting lists merged in (field, name length) order per tier; more are read in token order
+MAX_MERGED_LISTS = 32
+
+# Match penalties: lower ranks first
+PREFIX_PENALTY = 0.25
+FUZZY_PENALTY = 1.0
+DEPARTMENT_PENALTY = 1.0
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase, accent-free alphanumeric tokens"""
+    text = unicodedata.normalize("NFKD", text)
+    text = "".join(char for char in text if not unicodedata.combining(char))
+    return _TOKEN.findall(text.lower())
+
+
+def max_edits(token: str) -> int:
+    """Typos tolerated in a query token of this length"""
+    if len(token) < MIN_FUZZY_LENGTH:
+        return 0
+    return 1 if len(token) <= 6 else 2
+
+
+def _trigrams(token: str) -> List[str]:
+    padded = f"^{token}"
+    return [padded[i:i + 3] for i in range(max(1, len(padded) - 2))]
+
+
+def prefix_edit_distance(query: str, token: str, limit: int) -> int:
+    """
+    Fewest edits (insert, delete, substitute, swap adjacent letters) turning
+    `query` into some prefix of `token`, so a partially typed word still
+    matches. Returns limit + 1 once the distance exceeds limit.
+    """
+    before_previous = None
+    previous = list(range(len(token) + 1))
+    for i, query_char in enumerate(query, 1):
+        current = [i]
+        for j, token_char in enumerate(token, 1):
+            distance = min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (query_char != token_char)
+            )
+            if before_previous is not None and j > 1 and query_char == token[j - 2] and query[i - 2] == token_char:
+                distance = min(distance, before_previous[j - 2] + 1)
+            current.append(distance)
+        if min(current) > limit:
+            return limit + 1
+        before_previous, previous = previous, current
+    return min(min(previous), limit + 1)
+
+
+def _token_penalty(query_token: str, tokens: Dict[str, int]) -> Optional[float]:
+    """Best penalty of a query token against one professor's tokens, or None"""
+    best = None
+    limit = max_edits(query_token)
+    for token, field_penalty in tokens.items():
+        if token == query_token:
+            penalty = 0.0
+        elif token.startswith(query_token):
+            penalty = PREFIX_PENALTY
+        elif limit:
+            distance = prefix_edit_distance(query_token, token, limit)
+            if distance > limit:
+                continue
+            penalty = FUZZY_PENALTY * distance
+        else:
+            continue
+        penalty += field_penalty
+        if best is None or penalty < best:
+            best = penalty
+    return best
+
+
+class Suggestion(NamedTuple):
+    id: int
+    name: str
+    department: str
+
+
+class ProfessorTypeahead:
+    """
+    Token index over professor names and departments.
+    Thread-safe: routes read it from the threadpool while create/update write it.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries: Dict[int, Tuple[Suggestion, Dict[str, int]]] = {}
+        # token -> [(field penalty, name length, professor_id)], sorted
+        self._postings: Dict[str, List[Tuple[int, int, int]]] = {}
+        self._vocabulary: List[str] = []  # sorted tokens
+        self._trigram_index: Dict[str, set] = {}  # trigram -> tokens
+        # Changes made while a reload reads the table: professor_id -> (name, department), or None if removed
+        self._changes_during_reload: Optional[Dict[int, Optional[Tuple[str, str]]]] = None
+        self._reload_thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self.loaded = False
+        self.queries = 0
+        self.reloads = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _add_token(self, token: str, posting: Tuple[int, int, int]):
+        postings = self._postings.get(token)
+        if postings is None:
+            postings = self._postings[token] = []
+            bisect.insort(self._vocabulary, token)
+            for trigram in _trigrams(token):
+                self._trigram_index.setdefault(trigram, set()).add(token)
+        bisect.insort(postings, posting)
+
+    def _remove_token(self, token: str, posting: Tuple[int, int, int]):
+        postings = self._postings[token]
+        del postings[bisect.bisect_left(postings, posting)]
+        if postings:
+            return
+        del self._postings[token]
+        del self._vocabulary[bisect.bisect_left(self._vocabulary, token)]
+        for trigram in set(_trigrams(token)):  # a trigram can repeat ("mathematics")
+            tokens = self._trigram_index[trigram]
+            tokens.discard(token)
+            if not tokens:
+                del self._trigram_index[trigram]
+
+    def _put(self, professor_id: int, name: str, department: str):
+        self._delete(professor_id)
+        tokens = {token: DEPARTMENT_PENALTY for token in tokenize(department)}
+        tokens.update((token, 0) for token in tokenize(name))  # a name match wins
+        self._entries[professor_id] = (Suggestion(professor_id, name, department), tokens)
+        for token, penalty in tokens.items():
+            self._add_token(token, (penalty, len(name), professor_id))
+
+    def _delete(self, professor_id: int):
+        entry = self._entries.pop(professor_id, None)
+        if entry is not None:
+            suggestion, tokens = entry
+            for token, penalty in tokens.items():
+                self._remove_token(token, (penalty, len(suggestion.name), professor_id))
+
+    def upsert(self, professor_id: int, name: str, department: str):
+        """Add a professor, or re-index it after a rename"""
+        with self._lock:
+            self._put(professor_id, name, department)
+            if self._changes_during_reload is not None:
+                self._changes_during_reload[professor_id] = (name, department)
+
+    def remove(self, professor_id: int):
+        with self._lock:
+            self._delete(professor_id)
+            if self._changes_during_reload is not None:
+                self._changes_during_reload[professor_id] = None
+
+    def begin_reload(self):
+        """
+        Start recording upserts/removals before reading the professors table,
+        so load() can replay the ones its snapshot may have missed.
+        """
+        with self._lock:
+            self._changes_during_reload = {}
+
+    def load(self, professors: List[Tuple[int, str, str]]):
+        """
+        Replace the whole index with (id, name, department) rows, then replay
+        the changes recorded since begin_reload()
+        """
+        entries = {}
+        postings: Dict[str, List[Tuple[int, int, int]]] = {}
+        for professor_id, name, department in professors:
+            tokens = {token: DEPARTMENT_PENALTY for token in tokenize(department)}
+            tokens.update((token, 0) for token in tokenize(name))
+            entries[professor_id] = (Suggestion(professor_id, name, department), tokens)
+            for token, penalty in tokens.items():
+                postings.setdefault(token, []).append((penalty, len(name), professor_id))
+
+        trigram_index: Dict[str, set] = {}
+        for token, token_postings in postings.items():
+            token_postings.sort()
+            for trigram in _trigrams(token):
+                trigram_index.setdefault(trigram, set()).add(token)
+
+        with self._lock:
+            self._entries = entries
+            self._postings = postings
+            self._vocabulary = sorted(postings)
+            self._trigram_index = trigram_index
+            changes, self._changes_during_reload = self._changes_during_reload or {}, None
+            for professor_id, change in changes.items():
+                if change is None:
+                    self._delete(professor_id)
+                else:
+                    self._put(professor_id, *change)
+            self.loaded = True
+            self.reloads += 1
+
+    def _prefixed_tokens(self, token: str) -> List[str]:
+        """Vocabulary tokens starting with the query token (at most MAX_PREFIX_TOKENS)"""
+        start = bisect.bisect_left(self._vocabulary, token)
+        return list(itertools.takewhile(
+            lambda vocabulary_token: vocabulary_token.startswith(token),
+            self._vocabulary[start:start + MAX_PREFIX_TOKENS]
+        ))
+
+    def _fuzzy_tokens(self, token: str) -> Iterator[Tuple[str, int]]:
+        """
+        (vocabulary token, distance) within max_edits of the query token,
+        excluding prefix matches. Tokens sharing the most trigrams with the
+        query are verified first, so a search that fills up early stops early.
+        """
+        limit = max_edits(token)
+        if not limit:
+            return
+        # Each edit destroys at most 3 trigrams of the query token
+        trigrams = _trigrams(token)
+        shared = Counter()
+        for trigram in trigrams:
+            shared.update(self._trigram_index.get(trigram, ()))
+        needed = max(1, len(trigrams) - 3 * limit)
+        for vocabulary_token, count in shared.most_common():
+            if count < needed:
+                break
+            if vocabulary_token.startswith(token):
+                continue
+            distance = prefix_edit_distance(token, vocabulary_token, limit)
+            if distance <= limit:
+                yield vocabulary_token, distance
+
+    def _estimate(self, token: str) -> float:
+        """Professors matching a query token exactly or by prefix (0: typo matches only)"""
+        prefixed = self._prefixed_tokens(token)
+        if len(prefixed) == MAX_PREFIX_TOKENS:
+            return float("inf")  # Too common to enumerate: let another token drive
+        return sum(len(self._postings[vocabulary_token]) for vocabulary_token in prefixed)
+
+    def _candidates(self, token: str) -> Iterator[Tuple[float, int]]:
+        """
+        (penalty, professor_id) of professors matching a query token, roughly
+        best first: exact token, then prefix matches, then typos. Lazy, so a
+        search only pays for the tiers it reaches.
+        """
+        def tier(tokens, penalty):
+            lists = [self._postings[vocabulary_token] for vocabulary_token in tokens]
+            # Merging keeps short names first; past a few lists it costs more than it's worth
+            postings = heapq.merge(*lists) if len(lists) <= MAX_MERGED_LISTS else itertools.chain(*lists)
+            for field_penalty, _, professor_id in postings:
+                yield penalty + field_penalty, professor_id
+
+        if token in self._postings:
+            yield from tier([token], 0.0)
+
+        prefixed = [vocabulary_token for vocabulary_token in self._prefixed_tokens(token) if vocabulary_token != token]
+        yield from tier(prefixed, PREFIX_PENALTY)
+
+        for vocabulary_token, distance in self._fuzzy_tokens(token):
+            yield from tier([vocabulary_token], FUZZY_PENALTY * distance)
+
+    def search(self, query: str, limit: int = 8) -> List[Suggestion]:
+        """Best matches for what the user has typed so far"""
+        tokens = list(dict.fromkeys(tokenize(query)))
+        if not tokens:
+            return []
+
+        wanted = limit * CANDIDATES_PER_RESULT
+
+        with self._lock:
+            self.queries += 1
+
+            # Draw candidates from the most selective token; typo-only tokens last
+            estimates = {token: self._estimate(token) for token in tokens}
+            driver = min(tokens, key=lambda token: (estimates[token] == 0, estimates[token], -len(token)))
+            others = [token for token in tokens if token != driver]
+
+            scores: Dict[int, float] = {}
+            candidates = itertools.islice(self._candidates(driver), MAX_CANDIDATES_EXAMINED)
+            for penalty, professor_id in candidates:
+                if professor_id in scores:
+                    continue
+                entry_tokens = self._entries[professor_id][1]
+                score = penalty
+                for token in others:
+                    token_penalty = _token_penalty(token, entry_tokens)
+                    if token_penalty is None:
+                        break
+                    score += token_penalty
+                else:
+                    scores[professor_id] = score
+                    if len(scores) >= wanted:
+                        break
+
+            best = heapq.nsmallest(
+                limit,
+                scores.items(),
+                key=lambda item: (item[1], len(self._entries[item[0]][0].name), item[0])
+            )
+            return [self._entries[professor_id][0] for professor_id, _ in best]
+
+    def reload_from_database(self):
+        """Rebuild the index from the professors table (blocking: call it off the event loop)"""
+        self.begin_reload()
+        db = SessionLocal()
+        try:
+            professors = db.execute(select(Professor.id, Professor.name, Professor.department)).all()
+        finally:
+            db.close()
+        self.load(professors)
+
+    def start(self, reload_interval: float):
+        """
+        Load the index now and reload it every reload_interval seconds.
+        If the first load fails, autocomplete uses the database until a reload succeeds.
+        """
+        try:
+            self.reload_from_database()
+        except Exception:
+            logger.exception("Typeahead index load failed, falling back to database search")
+        if self._reload_thread is not None or reload_interval <= 0:
+            return
+        self._stop.clear()
+        self._reload_thread = threading.Thread(
+            target=self._reload_periodically, args=(reload_interval,), name="typeahead-reload", daemon=True
+        )
+        self._reload_thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._reload_thread = None
+
+    def _reload_periodically(self, interval: float):
+        while not self._stop.wait(interval):
+            try:
+                self.reload_from_database()
+            except Exception:
+                logger.exception("Typeahead index reload failed")
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "loaded": self.loaded,
+                "professors": len(self._entries),
+                "tokens": len(self._vocabulary),
+                "trigrams": len(self._trigram_index),
+                "queries": self.queries,
+                "reloads": self.reloads,
+            }
+
+
+# Shared instance, loaded by the application on startup
+professor_typeahead = ProfessorTypeahead()
@@ -3,11 +3,23 @@ FastAPI Application Entry Point
 Run with: uvicorn app.main:app --reload
 """
 from fastapi import FastAPI
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
 
+from app.core import content_filter
+from app.core.config import settings
+from app.core.database import engine, async_engine, read_engine, async_read_engine, ReadYourWritesMiddleware
+from app.core.loop_monitor import loop_monitor, forbid_sync_db_on_loop
+from app.core.professor_stats import stats_recompute_queue
+from app.core.related_professors import related_refresh_queue
+from app.core.similarity import similarity_refresh_queue
+from app.core.typeahead import professor_typeahead
+from app.core.security import password_hash_pool
+from app.core.sql_instrumentation import query_metrics, SQLInstrumentationMiddleware
+
 from app.routers.auth import router as auth_router
 from app.routers.professors import router as professors_router
-from app.routers.reviews import router as reviews_router
+from app.routers.reviews import router as reviews_router, moderation_queue, start_moderation_workers
 from app.routers.dashboard import router as dashboard_router
 from app.routers.professor_claims import router as professor_claims_router
 from app.routers.admin import router as admin_router
@@ -28,6 +40,18 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Marks clients that just wrote, so their reads skip the replica on every worker
+app.add_middleware(ReadYourWritesMiddleware)
+
+# Per-request query count, DB time, slow-query log and N+1 detection
+if settings.SQL_INSTRUMENTATION_ENABLED:
+    query_metrics.instrument(engine)
+    query_metrics.instrument(async_engine.sync_engine)
+    if read_engine is not engine:
+        query_metrics.instrument(read_engine)
+        query_metrics.instrument(async_read_engine.sync_engine)
+    app.add_middleware(SQLInstrumentationMiddleware, metrics=query_metrics)
+
 # Register routers (order matters - more specific routes first!)
 app.include_router(auth_router)
 app.include_router(professor_claims_router)  # Must be before professors_router
@@ -37,6 +61,91 @@ app.include_router(dashboard_router)
 app.include_router(admin_router)
 
 
+# Debug mode: fail loudly when an async route blocks the loop on the sync engine
+if settings.STRICT_ASYNC_DB:
+    forbid_sync_db_on_loop(engine)
+    if read_engine is not engine:
+        forbid_sync_db_on_loop(read_engine)
+
+
+@app.on_event("startup")
+async def start_loop_monitor():
+    """Measure event-loop lag and report the routes that block it"""
+    if settings.LOOP_MONITOR_ENABLED:
+        await loop_monitor.start()
+
+
+@app.on_event("startup")
+def install_signal_handlers():
+    """Allow `kill -HUP <pid>` to reload the profanity word lists"""
+    content_filter.install_reload_signal_handler()
+
+
+@app.on_event("startup")
+async def start_background_workers():
+    """
+    Start the review moderation workers when async moderation is enabled.
+    Re-queuing pending reviews queries the database, so it runs off the loop.
+    """
+    if settings.ASYNC_MODERATION:
+        await run_in_threadpool(start_moderation_workers)
+
+
+@app.on_event("startup")
+def start_stats_recompute_queue():
+    """Batch professor stats updates when deferred recomputation is enabled"""
+    if settings.STATS_RECOMPUTE_DEFERRED:
+        stats_recompute_queue.start()
+
+
+@app.on_event("startup")
+def start_similarity_refresh_queue():
+    """Keep the similar-professors index current as professor aggregates change"""
+    if settings.SIMILARITY_REFRESH_ENABLED:
+        similarity_refresh_queue.start()
+
+
+@app.on_event("startup")
+def start_related_refresh_queue():
+    """Keep the co-review related-professors lists current as reviews come and go"""
+    if settings.RELATED_REFRESH_ENABLED:
+        related_refresh_queue.start()
+
+
+@app.on_event("startup")
+async def load_typeahead_index():
+    """Build the in-memory professor autocomplete index (reads every professor, so off the loop)"""
+    if settings.TYPEAHEAD_ENABLED:
+        await run_in_threadpool(professor_typeahead.start, settings.TYPEAHEAD_RELOAD_SECONDS)
+
+
+def _stop_background_workers():
+    moderation_queue.stop()
+    stats_recompute_queue.stop()
+    similarity_refresh_queue.stop()
+    related_refresh_queue.stop()
+    professor_typeahead.stop()
+    password_hash_pool.shutdown()
+
+
+@app.on_event("shutdown")
+async def stop_background_workers():
+    """
+    Finish queued moderation, stats and recommendation work and stop the password hashing pool.
+    Waiting for the final flushes blocks, so it runs off the loop.
+    """
+    await run_in_threadpool(_stop_background_workers)
+
+
+@app.on_event("shutdown")
+async def close_async_engine():
+    """Stop the loop monitor and close pooled asyncpg connections"""
+    await loop_monitor.stop()
+    await async_engine.dispose()
+    if async_read_engine is not async_engine:
+        await async_read_engine.dispose()
+
+
 @app.get("/")
 def root():
     """Health check endpoint"""
@@ -8,6 +8,9 @@ from app.models.review import Review, GradeEnum
 from app.models.review_vote import ReviewVote
 from app.models.professor_claim_request import ProfessorClaimRequest, ClaimStatus
 from app.models.review_flag import ReviewFlag
+from app.models.professor_grade_histogram import ProfessorGradeHistogram
+from app.models.professor_similarity import ProfessorSimilarity
+from app.models.related_professor import RelatedProfessor
 
 # This makes the models available when you import from app.models
-__all__ = ["User", "UserRole","Professor","ProfessorFollow","Review","GradeEnum","ReviewVote","ProfessorClaimRequest","ClaimStatus","ReviewFlag"]
\ No newline at end of file
+__all__ = ["User", "UserRole","Professor","ProfessorFollow","Review","GradeEnum","ReviewVote","ProfessorClaimRequest","ClaimStatus","ReviewFlag","ProfessorGradeHistogram","ProfessorSimilarity","RelatedProfessor"]
\ No newline at end of file
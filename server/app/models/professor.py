@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, Float, DateTime
+from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, Float, DateTime, Index, DDL, event
 from sqlalchemy.orm import relationship
 from datetime import datetime
 
@@ -23,9 +23,24 @@ class Professor(Base):
     avg_difficulty = Column(Float, default=0.0)
     total_reviews = Column(Integer, default=0)
     
+    # Running sums over visible reviews, maintained by app.core.professor_stats
+    rating_sum = Column(Integer, default=0, nullable=False)
+    difficulty_sum = Column(Integer, default=0, nullable=False)
+    
     # Relationships
     reviews = relationship("Review", backref="professor", foreign_keys="Review.professor_id")
     claimed_by = relationship("User", foreign_keys=[claimed_by_user_id])
+    
+    # Trigram indexes for ILIKE '%term%' and similarity search (PostgreSQL, pg_trgm).
+    # metadata.create_all only emits them on PostgreSQL; other backends scan (see app/core/professor_search.py)
+    __table_args__ = (
+        Index(
+            'ix_professors_name_trgm', name, postgresql_using='gin', postgresql_ops={'name': 'gin_trgm_ops'}
+        ).ddl_if(dialect='postgresql'),
+        Index(
+            'ix_professors_department_trgm', department, postgresql_using='gin', postgresql_ops={'department': 'gin_trgm_ops'}
+        ).ddl_if(dialect='postgresql'),
+    )
 
     def __repr__(self):
         return f"<Professor(id={self.id}, name='{self.name}', dept='{self.department}')>"
@@ -39,4 +54,12 @@ class Professor(Base):
             "avg_rating": self.avg_rating,
             "avg_difficulty": self.avg_difficulty,
             "total_reviews": self.total_reviews
-        }
\ No newline at end of file
+        }
+
+
+# gin_trgm_ops needs the extension before create_all builds the indexes (the migration does the same)
+event.listen(
+    Professor.__table__,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql")
+)
@@ -0,0 +1,58 @@
+"""Professor Grade Histogram Model - Materialized grade distribution per professor"""
+
+from sqlalchemy import Column, Integer, ForeignKey
+
+from app.core.database import Base
+from app.models.review import GradeEnum
+
+
+# Count column for each grade, in chart order
+GRADE_COLUMNS = {
+    GradeEnum.A: "a",
+    GradeEnum.A_MINUS: "a_minus",
+    GradeEnum.B_PLUS: "b_plus",
+    GradeEnum.B: "b",
+    GradeEnum.B_MINUS: "b_minus",
+    GradeEnum.C_PLUS: "c_plus",
+    GradeEnum.C: "c",
+    GradeEnum.C_MINUS: "c_minus",
+    GradeEnum.D: "d",
+    GradeEnum.F: "f",
+    GradeEnum.W: "w",
+}
+
+
+class ProfessorGradeHistogram(Base):
+    """
+    One row per professor with the number of visible reviews per grade.
+    Kept current by app.core.professor_stats; `version` increases on every change.
+    """
+    __tablename__ = "professor_grade_histogram"
+
+    professor_id = Column(Integer, ForeignKey("professors.id", ondelete="CASCADE"), primary_key=True)
+    
+    a = Column(Integer, default=0, nullable=False)
+    a_minus = Column(Integer, default=0, nullable=False)
+    b_plus = Column(Integer, default=0, nullable=False)
+    b = Column(Integer, default=0, nullable=False)
+    b_minus = Column(Integer, default=0, nullable=False)
+    c_plus = Column(Integer, default=0, nullable=False)
+    c = Column(Integer, default=0, nullable=False)
+    c_minus = Column(Integer, default=0, nullable=False)
+    d = Column(Integer, default=0, nullable=False)
+    f = Column(Integer, default=0, nullable=False)
+    w = Column(Integer, default=0, nullable=False)
+    
+    version = Column(Integer, default=0, nullable=False)
+
+    def __repr__(self):
+        return f"<ProfessorGradeHistogram(professor_id={self.professor_id}, version={self.version})>"
+    
+    def to_chart_data(self):
+        """Grades with at least one review, in the format Recharts expects"""
+        chart_data = []
+        for grade, column in GRADE_COLUMNS.items():
+            count = getattr(self, column)
+            if count:
+                chart_data.append({"grade": grade.value, "count": count})
+        return chart_data
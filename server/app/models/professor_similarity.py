@@ -0,0 +1,21 @@
+"""Professor Similarity Model - Precomputed nearest neighbours per professor"""
+
+from sqlalchemy import Column, Integer, Float, ForeignKey
+
+from app.core.database import Base
+
+
+class ProfessorSimilarity(Base):
+    """
+    The top-k most similar professors of each professor, ranked from 0.
+    Built and refreshed by app.core.similarity.
+    """
+    __tablename__ = "professor_similarities"
+
+    professor_id = Column(Integer, ForeignKey("professors.id", ondelete="CASCADE"), primary_key=True)
+    rank = Column(Integer, primary_key=True)
+    similar_professor_id = Column(Integer, ForeignKey("professors.id", ondelete="CASCADE"), nullable=False, index=True)
+    score = Column(Float, nullable=False)
+
+    def __repr__(self):
+        return f"<ProfessorSimilarity(professor_id={self.professor_id}, rank={self.rank}, similar_professor_id={self.similar_professor_id})>"
@@ -0,0 +1,22 @@
+"""Related Professor Model - "Students who reviewed X also reviewed Y" """
+
+from sqlalchemy import Column, Integer, Float, ForeignKey
+
+from app.core.database import Base
+
+
+class RelatedProfessor(Base):
+    """
+    The top-N professors most often co-reviewed with each professor, ranked from 0.
+    Built and refreshed by app.core.related_professors.
+    """
+    __tablename__ = "related_professors"
+
+    professor_id = Column(Integer, ForeignKey("professors.id", ondelete="CASCADE"), primary_key=True)
+    rank = Column(Integer, primary_key=True)
+    related_professor_id = Column(Integer, ForeignKey("professors.id", ondelete="CASCADE"), nullable=False, index=True)
+    score = Column(Float, nullable=False)  # Co-reviewers / sqrt(reviewers of each)
+    co_reviewers = Column(Integer, nullable=False)  # Students who reviewed both
+
+    def __repr__(self):
+        return f"<RelatedProfessor(professor_id={self.professor_id}, rank={self.rank}, related_professor_id={self.related_professor_id})>"
@@ -1,7 +1,8 @@
 """Review Database Model - The heart of grade distribution data"""
 
 import enum
-from sqlalchemy import Column, Integer, String, Text, DateTime, Enum as SQLEnum, ForeignKey, UniqueConstraint, Boolean
+from sqlalchemy import Column, Computed, Integer, String, Text, DateTime, Enum as SQLEnum, ForeignKey, UniqueConstraint, Boolean, Index
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.orm import relationship
 from datetime import datetime
 
@@ -23,6 +24,12 @@ class GradeEnum(str, enum.Enum):
     W = "W"  # Withdrawn
 
 
+# Values of Review.is_hidden
+REVIEW_VISIBLE = 0
+REVIEW_HIDDEN = 1
+REVIEW_PENDING_MODERATION = 2  # Accepted, waiting for background moderation
+
+
 class Review(Base):
     """Review model - stores student reviews with grade data"""
     __tablename__ = "reviews"
@@ -54,15 +61,32 @@ class Review(Base):
     
     # Metadata
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
-    is_hidden = Column(Integer, default=0)  # For admin moderation
+    is_hidden = Column(Integer, default=0)  # For admin moderation (see REVIEW_* values)
+    moderation_version = Column(String(20), nullable=True)  # Word-list version last checked against
+    # Full-text search (app/core/review_search.py): PostgreSQL recomputes it whenever
+    # a comment is written. Only created on PostgreSQL, and not loaded with the review
+    search_vector = Column(
+        TSVECTOR,
+        Computed("to_tsvector('english', coalesce(comment, ''))", persisted=True),
+        info={"postgresql_only": True}
+    )
     
     # Relationships
     votes = relationship("ReviewVote", back_populates="review", cascade="all, delete-orphan")
     flags = relationship("ReviewFlag", back_populates="review", cascade="all, delete-orphan")
     
+    __mapper_args__ = {"exclude_properties": ["search_vector"]}
+    
     # Prevent duplicate reviews: 1 review per professor per semester
+    # The indexes match the sort modes of the professor review feed (keyset pagination),
+    # plus student -> professors for the co-review recommendations
     __table_args__ = (
         UniqueConstraint('professor_id', 'student_id', 'semester', name='unique_review_per_semester'),
+        Index('ix_reviews_professor_newest', professor_id, is_hidden, created_at.desc(), id.desc()),
+        Index('ix_reviews_professor_helpful', professor_id, is_hidden, helpful_count.desc(), id.desc()),
+        Index('ix_reviews_professor_rating', professor_id, is_hidden, rating_quality, id),
+        Index('ix_reviews_student_professor', student_id, professor_id),
+        Index('ix_reviews_search_vector', search_vector, postgresql_using='gin').ddl_if(dialect='postgresql'),
     )
 
     def __repr__(self):
@@ -1,13 +1,22 @@
 """Admin Routes - Administrative functions for moderating content"""
 
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from sqlalchemy import func
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import func, select, delete
 from typing import List
 from datetime import datetime
 
-from app.core.database import get_db
-from app.core.security import get_current_user
+from app.core.database import get_async_db
+from app.core.security import get_current_user, password_hash_pool
+from app.core import content_filter, professor_stats
+from app.core.loop_monitor import loop_monitor
+from app.core.response_cache import professor_response_cache
+from app.core.related_professors import related_refresh_queue
+from app.core.similarity import similarity_refresh_queue
+from app.core.typeahead import professor_typeahead
+from app.core.sql_instrumentation import query_metrics
+from app.routers.reviews import moderation_queue
 from app.models.user import User, UserRole
 from app.models.review import Review
 from app.models.review_flag import ReviewFlag
@@ -31,7 +40,7 @@ def require_admin(current_user: User = Depends(get_current_user)):
 
 @router.get("/flagged-reviews", response_model=List[dict])
 async def get_flagged_reviews(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(require_admin)
 ):
     """
@@ -40,26 +49,26 @@ async def get_flagged_reviews(
     Returns reviews with flag count and reasons.
     """
     # Get all flagged reviews
-    flagged_reviews = db.query(Review).filter(
-        Review.is_flagged == True
-    ).order_by(Review.flag_count.desc()).all()
+    flagged_reviews = (await db.scalars(
+        select(Review).where(
+            Review.is_flagged == True
+        ).order_by(Review.flag_count.desc())
+    )).all()
     
     result = []
     for review in flagged_reviews:
         # Get flags for this review
-        flags = db.query(ReviewFlag).filter(
-            ReviewFlag.review_id == review.id
-        ).all()
+        flags = (await db.scalars(
+            select(ReviewFlag).where(
+                ReviewFlag.review_id == review.id
+            )
+        )).all()
         
         # Get professor name
-        professor = db.query(Professor).filter(
-            Professor.id == review.professor_id
-        ).first()
+        professor = await db.get(Professor, review.professor_id)
         
         # Get student info
-        student = db.query(User).filter(
-            User.id == review.student_id
-        ).first()
+        student = await db.get(User, review.student_id)
         
         flag_details = [
             {
@@ -93,7 +102,7 @@ async def get_flagged_reviews(
 @router.delete("/reviews/{review_id}", status_code=status.HTTP_200_OK)
 async def delete_flagged_review(
     review_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(require_admin)
 ):
     """
@@ -101,7 +110,7 @@ async def delete_flagged_review(
     Only accessible by admins.
     Use this when the review violates community guidelines.
     """
-    review = db.query(Review).filter(Review.id == review_id).first()
+    review = await db.get(Review, review_id)
     
     if not review:
         raise HTTPException(
@@ -109,14 +118,15 @@ async def delete_flagged_review(
             detail="Review not found"
         )
     
-    professor_id = review.professor_id
-    
     # Delete the review (flags will be cascade deleted)
-    db.delete(review)
-    db.commit()
+    await db.delete(review)
     
     # Update professor stats
-    _update_professor_stats(db, professor_id)
+    if professor_stats.is_counted(review):
+        await db.run_sync(professor_stats.review_removed, review)
+    
+    await db.commit()
+    professor_response_cache.invalidate(review.professor_id)
     
     return {
         "message": "Review deleted successfully",
@@ -127,7 +137,7 @@ async def delete_flagged_review(
 @router.post("/reviews/{review_id}/dismiss-flags", status_code=status.HTTP_200_OK)
 async def dismiss_flags(
     review_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(require_admin)
 ):
     """
@@ -135,7 +145,7 @@ async def dismiss_flags(
     Only accessible by admins.
     Use this when the review is acceptable despite flags.
     """
-    review = db.query(Review).filter(Review.id == review_id).first()
+    review = await db.get(Review, review_id)
     
     if not review:
         raise HTTPException(
@@ -144,13 +154,14 @@ async def dismiss_flags(
         )
     
     # Delete all flags for this review
-    db.query(ReviewFlag).filter(ReviewFlag.review_id == review_id).delete()
+    await db.execute(delete(ReviewFlag).where(ReviewFlag.review_id == review_id))
     
     # Update review flag status
     review.is_flagged = False
     review.flag_count = 0
     
-    db.commit()
+    await db.commit()
+    professor_response_cache.invalidate(review.professor_id)
     
     return {
         "message": "Flags dismissed successfully",
@@ -158,26 +169,153 @@ async def dismiss_flags(
     }
 
 
+@router.get("/moderation/stats", status_code=status.HTTP_200_OK)
+async def get_moderation_stats(
+    current_user: User = Depends(require_admin)
+):
+    """
+    Get content moderation cache and queue statistics.
+    Only accessible by admins.
+    """
+    return {
+        **content_filter.get_cache_stats(),
+        "queue": moderation_queue.stats()
+    }
+
+
+@router.post("/moderation/reload", status_code=status.HTTP_200_OK)
+async def reload_word_lists(
+    current_user: User = Depends(require_admin)
+):
+    """
+    Reload the profanity word lists without a restart.
+    Only accessible by admins.
+    The new matcher is compiled in a worker thread and swapped in once ready.
+    """
+    try:
+        version = await run_in_threadpool(content_filter.reload_word_lists)
+    except (OSError, ValueError) as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Could not reload word lists: {e}"
+        )
+    
+    return {
+        "message": "Word lists reloaded successfully",
+        "word_list_version": version
+    }
+
+
+@router.get("/auth/stats", status_code=status.HTTP_200_OK)
+async def get_auth_stats(
+    current_user: User = Depends(require_admin)
+):
+    """
+    Get password hashing pool metrics (queue wait and hash time).
+    Only accessible by admins.
+    """
+    return password_hash_pool.stats()
+
+
+@router.get("/loop/stats", status_code=status.HTTP_200_OK)
+async def get_loop_stats(
+    current_user: User = Depends(require_admin)
+):
+    """
+    Get event-loop lag metrics and the routes that recently blocked the loop.
+    Only accessible by admins.
+    """
+    return loop_monitor.stats()
+
+
+@router.get("/db/stats", status_code=status.HTTP_200_OK)
+async def get_db_stats(
+    current_user: User = Depends(require_admin)
+):
+    """
+    Get per-route query counts, DB time, slowest statements and N+1 warnings.
+    Only accessible by admins.
+    """
+    return query_metrics.stats()
+
+
+@router.get("/cache/stats", status_code=status.HTTP_200_OK)
+async def get_response_cache_stats(
+    current_user: User = Depends(require_admin)
+):
+    """
+    Get hit/miss metrics of the professor response cache.
+    Only accessible by admins.
+    """
+    return professor_response_cache.stats()
+
+
+@router.get("/professor-stats/queue", status_code=status.HTTP_200_OK)
+async def get_stats_queue(
+    current_user: User = Depends(require_admin)
+):
+    """
+    Get the deferred professor-stats recompute queue metrics.
+    Only accessible by admins.
+    """
+    return professor_stats.stats_recompute_queue.stats()
+
+
+@router.get("/typeahead/stats", status_code=status.HTTP_200_OK)
+async def get_typeahead_stats(
+    current_user: User = Depends(require_admin)
+):
+    """
+    Get the size and usage of the in-memory professor autocomplete index.
+    Only accessible by admins.
+    """
+    return professor_typeahead.stats()
+
+
+@router.get("/similarity/queue", status_code=status.HTTP_200_OK)
+async def get_similarity_queue(
+    current_user: User = Depends(require_admin)
+):
+    """
+    Get the similar-professors index refresh queue metrics.
+    Only accessible by admins.
+    """
+    return similarity_refresh_queue.stats()
+
+
+@router.get("/related/queue", status_code=status.HTTP_200_OK)
+async def get_related_queue(
+    current_user: User = Depends(require_admin)
+):
+    """
+    Get the co-review related-professors refresh queue metrics.
+    Only accessible by admins.
+    """
+    return related_refresh_queue.stats()
+
+
 @router.get("/claim-requests", response_model=List[dict])
 async def get_pending_claim_requests(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(require_admin)
 ):
     """
     Get all pending professor claim requests.
     Only accessible by admins.
     """
-    pending_claims = db.query(ProfessorClaimRequest).filter(
-        ProfessorClaimRequest.status == ClaimStatus.PENDING
-    ).order_by(ProfessorClaimRequest.requested_at.desc()).all()
+    pending_claims = (await db.scalars(
+        select(ProfessorClaimRequest).where(
+            ProfessorClaimRequest.status == ClaimStatus.PENDING
+        ).order_by(ProfessorClaimRequest.requested_at.desc())
+    )).all()
     
     result = []
     for claim in pending_claims:
         # Get professor info
-        professor = db.query(Professor).filter(Professor.id == claim.professor_id).first()
+        professor = await db.get(Professor, claim.professor_id)
         
         # Get user info
-        user = db.query(User).filter(User.id == claim.user_id).first()
+        user = await db.get(User, claim.user_id)
         
         result.append({
             "id": claim.id,
@@ -198,16 +336,14 @@ async def get_pending_claim_requests(
 @router.post("/claim-requests/{claim_id}/approve", status_code=status.HTTP_200_OK)
 async def approve_claim_request(
     claim_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(require_admin)
 ):
     """
     Approve a professor claim request.
     Only accessible by admins.
     """
-    claim = db.query(ProfessorClaimRequest).filter(
-        ProfessorClaimRequest.id == claim_id
-    ).first()
+    claim = await db.get(ProfessorClaimRequest, claim_id)
     
     if not claim:
         raise HTTPException(
@@ -222,11 +358,11 @@ async def approve_claim_request(
         )
     
     # Check if professor is already claimed by another user
-    existing_claim = db.query(ProfessorClaimRequest).filter(
+    existing_claim = await db.scalar(select(ProfessorClaimRequest).where(
         ProfessorClaimRequest.professor_id == claim.professor_id,
         ProfessorClaimRequest.status == ClaimStatus.APPROVED,
         ProfessorClaimRequest.id != claim_id
-    ).first()
+    ))
     
     if existing_claim:
         raise HTTPException(
@@ -238,13 +374,13 @@ async def approve_claim_request(
     claim.approve(current_user.id)
     
     # Update professor's claimed_by_user_id field
-    professor = db.query(Professor).filter(Professor.id == claim.professor_id).first()
+    professor = await db.get(Professor, claim.professor_id)
     if professor:
         professor.claimed_by_user_id = claim.user_id
         professor.is_claimed = True
         professor.claimed_at = datetime.utcnow()
     
-    db.commit()
+    await db.commit()
     
     return {
         "message": "Claim request approved successfully",
@@ -258,16 +394,14 @@ async def approve_claim_request(
 async def reject_claim_request(
     claim_id: int,
     admin_comment: str = None,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(require_admin)
 ):
     """
     Reject a professor claim request.
     Only accessible by admins.
     """
-    claim = db.query(ProfessorClaimRequest).filter(
-        ProfessorClaimRequest.id == claim_id
-    ).first()
+    claim = await db.get(ProfessorClaimRequest, claim_id)
     
     if not claim:
         raise HTTPException(
@@ -283,36 +417,10 @@ async def reject_claim_request(
     
     # Reject the claim
     claim.reject(current_user.id, admin_comment)
-    db.commit()
+    await db.commit()
     
     return {
         "message": "Claim request rejected",
         "claim_id": claim_id,
         "admin_comment": admin_comment
     }
-
-
-def _update_professor_stats(db: Session, professor_id: int):
-    """Helper function to recalculate professor statistics"""
-    from app.models.professor import Professor
-    
-    professor = db.query(Professor).filter(Professor.id == professor_id).first()
-    if not professor:
-        return
-    
-    # Get all visible reviews for this professor
-    reviews = db.query(Review).filter(
-        Review.professor_id == professor_id,
-        Review.is_hidden == 0
-    ).all()
-    
-    if not reviews:
-        professor.average_rating = 0.0
-        professor.average_difficulty = 0.0
-        professor.total_reviews = 0
-    else:
-        professor.average_rating = sum(r.rating_quality for r in reviews) / len(reviews)
-        professor.average_difficulty = sum(r.rating_difficulty for r in reviews) / len(reviews)
-        professor.total_reviews = len(reviews)
-    
-    db.commit()
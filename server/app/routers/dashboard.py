@@ -5,7 +5,7 @@ from sqlalchemy.orm import Session
 from sqlalchemy import func
 from typing import List
 
-from app.core.database import get_db
+from app.core.database import get_read_db
 from app.core.security import get_current_user
 from app.models.user import User
 from app.models.professor import Professor
@@ -19,7 +19,7 @@ router = APIRouter(prefix="/dashboard", tags=["Dashboard"])
 
 @router.get("/me", response_model=DashboardResponse)
 def get_my_dashboard(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
     """
@@ -1,12 +1,12 @@
 """Professor Claim Routes - Handle professor profile claiming"""
 
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import and_, or_, select
 from typing import Optional
 from datetime import datetime
 
-from app.core.database import get_db
+from app.core.database import get_async_db
 from app.core.security import get_current_user
 from app.models.user import User, UserRole
 from app.models.professor import Professor
@@ -25,7 +25,7 @@ router = APIRouter(prefix="/professors", tags=["Professor Claims"])
 async def submit_claim_request(
     professor_id: int,
     claim_data: ClaimRequestCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """
@@ -43,7 +43,7 @@ async def submit_claim_request(
         )
     
     # Check if professor exists
-    professor = db.query(Professor).filter(Professor.id == professor_id).first()
+    professor = await db.get(Professor, professor_id)
     if not professor:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -58,10 +58,10 @@ async def submit_claim_request(
         )
     
     # Also check if there's an approved claim request for this professor
-    existing_claim_for_professor = db.query(ProfessorClaimRequest).filter(
+    existing_claim_for_professor = await db.scalar(select(ProfessorClaimRequest).where(
         ProfessorClaimRequest.professor_id == professor_id,
         ProfessorClaimRequest.status == ClaimStatus.APPROVED
-    ).first()
+    ))
     
     if existing_claim_for_professor:
         raise HTTPException(
@@ -70,10 +70,10 @@ async def submit_claim_request(
         )
     
     # CONSTRAINT 2: Check if this user already has ANY approved claim (one claim per professor user)
-    existing_approved_claim = db.query(ProfessorClaimRequest).filter(
+    existing_approved_claim = await db.scalar(select(ProfessorClaimRequest).where(
         ProfessorClaimRequest.user_id == current_user.id,
         ProfessorClaimRequest.status == ClaimStatus.APPROVED
-    ).first()
+    ))
     
     if existing_approved_claim:
         raise HTTPException(
@@ -82,10 +82,10 @@ async def submit_claim_request(
         )
     
     # CONSTRAINT 3: Check if this user has ANY pending claim (prevent multiple simultaneous claims)
-    existing_pending_claim = db.query(ProfessorClaimRequest).filter(
+    existing_pending_claim = await db.scalar(select(ProfessorClaimRequest).where(
         ProfessorClaimRequest.user_id == current_user.id,
         ProfessorClaimRequest.status == ClaimStatus.PENDING
-    ).first()
+    ))
     
     if existing_pending_claim:
         raise HTTPException(
@@ -94,10 +94,10 @@ async def submit_claim_request(
         )
     
     # Check if there's a pending claim for this specific professor by anyone
-    pending_claim_for_professor = db.query(ProfessorClaimRequest).filter(
+    pending_claim_for_professor = await db.scalar(select(ProfessorClaimRequest).where(
         ProfessorClaimRequest.professor_id == professor_id,
         ProfessorClaimRequest.status == ClaimStatus.PENDING
-    ).first()
+    ))
     
     if pending_claim_for_professor and pending_claim_for_professor.user_id != current_user.id:
         raise HTTPException(
@@ -114,15 +114,15 @@ async def submit_claim_request(
     )
     
     db.add(new_claim)
-    db.commit()
-    db.refresh(new_claim)
+    await db.commit()
+    await db.refresh(new_claim)
     
     return new_claim
 
 
 @router.get("/my-claim-status", response_model=ClaimStatusResponse)
 async def get_my_claim_status(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """
@@ -131,22 +131,22 @@ async def get_my_claim_status(
     """
     try:
         # Check for pending claim
-        pending_claim = db.query(ProfessorClaimRequest).filter(
+        pending_claim = await db.scalar(select(ProfessorClaimRequest).where(
             ProfessorClaimRequest.user_id == current_user.id,
             ProfessorClaimRequest.status == ClaimStatus.PENDING
-        ).first()
+        ))
         
         # Check for approved claim
-        approved_claim = db.query(ProfessorClaimRequest).filter(
+        approved_claim = await db.scalar(select(ProfessorClaimRequest).where(
             ProfessorClaimRequest.user_id == current_user.id,
             ProfessorClaimRequest.status == ClaimStatus.APPROVED
-        ).first()
+        ))
         
         # Check for rejected claim (most recent)
-        rejected_claim = db.query(ProfessorClaimRequest).filter(
+        rejected_claim = await db.scalar(select(ProfessorClaimRequest).where(
             ProfessorClaimRequest.user_id == current_user.id,
             ProfessorClaimRequest.status == ClaimStatus.REJECTED
-        ).order_by(ProfessorClaimRequest.reviewed_at.desc()).first()
+        ).order_by(ProfessorClaimRequest.reviewed_at.desc()))
         
         # Get the most relevant claim to return
         claim_to_return = pending_claim or approved_claim or rejected_claim
@@ -185,7 +185,7 @@ async def get_my_claim_status(
 
 @router.get("/my-claimed-profile")
 async def get_my_claimed_profile(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """
@@ -193,10 +193,10 @@ async def get_my_claimed_profile(
     Returns 404 if no approved claim exists.
     """
     # Find approved claim
-    approved_claim = db.query(ProfessorClaimRequest).filter(
+    approved_claim = await db.scalar(select(ProfessorClaimRequest).where(
         ProfessorClaimRequest.user_id == current_user.id,
         ProfessorClaimRequest.status == ClaimStatus.APPROVED
-    ).first()
+    ))
     
     if not approved_claim:
         raise HTTPException(
@@ -205,7 +205,7 @@ async def get_my_claimed_profile(
         )
     
     # Get the professor profile
-    professor = db.query(Professor).filter(Professor.id == approved_claim.professor_id).first()
+    professor = await db.get(Professor, approved_claim.professor_id)
     
     if not professor:
         raise HTTPException(
@@ -228,16 +228,14 @@ async def get_my_claimed_profile(
 @router.delete("/claim-request/{claim_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def cancel_claim_request(
     claim_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """
     Cancel a pending claim request.
     Only the owner can cancel, and only if status is PENDING.
     """
-    claim = db.query(ProfessorClaimRequest).filter(
-        ProfessorClaimRequest.id == claim_id
-    ).first()
+    claim = await db.get(ProfessorClaimRequest, claim_id)
     
     if not claim:
         raise HTTPException(
@@ -259,7 +257,7 @@ async def cancel_claim_request(
             detail="Can only cancel pending claim requests"
         )
     
-    db.delete(claim)
-    db.commit()
+    await db.delete(claim)
+    await db.commit()
     
     return None
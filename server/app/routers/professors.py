@@ -1,20 +1,34 @@
 """Professor Routes - CRUD operations for professors"""
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, Response, status, Query
 from sqlalchemy.orm import Session
-from sqlalchemy import and_
-from typing import List
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import and_, null, select
+from typing import List, Optional
 from datetime import datetime
 
-from app.core.database import get_db
-from app.core.security import get_current_user, require_role
+from app.core.cache import MISSING
+from app.core.database import get_db, get_read_db, get_async_read_db, ReadSessionLocal
+from app.core.professor_search import has_trigram_search, search_professors
+from app.core.response_cache import professor_response_cache
+from app.core.related_professors import related_professors_query
+from app.core.similarity import similar_professors_query, professors_changed
+from app.core.typeahead import professor_typeahead
+from app.core.security import get_current_user, get_current_user_optional, require_role
 from app.models.user import User, UserRole
 from app.models.professor import Professor
 from app.models.professor_follow import ProfessorFollow
+from app.models.professor_grade_histogram import ProfessorGradeHistogram
+from app.routers.reviews import load_review_page, load_review_summary, review_page_for_user, render_json
 from app.schemas.professor import (
     ProfessorCreate, 
     ProfessorUpdate, 
     ProfessorResponse,
+    ProfessorSearchMode,
+    ProfessorSuggestion,
+    ProfessorPageResponse,
+    SimilarProfessorResponse,
+    RelatedProfessorResponse,
     ProfessorFollowResponse,
     FollowedProfessorResponse
 )
@@ -27,15 +41,16 @@ router = APIRouter(prefix="/professors", tags=["Professors"])
 def list_professors(
     search: str = Query(None, description="Search by name"),
     department: str = Query(None, description="Filter by department"),
+    mode: ProfessorSearchMode = Query(ProfessorSearchMode.SUBSTRING, description="substring, or similarity (typo-tolerant, ranked)"),
     skip: int = Query(0, ge=0),
     limit: int = Query(20, ge=1, le=100),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """List all professors with optional search and filtering"""
     query = db.query(Professor)
     
     if search:
-        query = query.filter(Professor.name.ilike(f"%{search}%"))
+        query = search_professors(query, search, mode, has_trigram_search(db))
     
     if department:
         query = query.filter(Professor.department.ilike(f"%{department}%"))
@@ -44,8 +59,29 @@ def list_professors(
     return professors
 
 
+@router.get("/autocomplete", response_model=List[ProfessorSuggestion])
+def autocomplete_professors(
+    q: str = Query(..., min_length=1, max_length=100, description="What the user has typed so far"),
+    limit: int = Query(8, ge=1, le=20)
+):
+    """
+    Typo-tolerant name/department suggestions for the search box.
+    Served from the in-memory typeahead index; the database is only used
+    when the index is disabled.
+    """
+    if professor_typeahead.loaded:
+        return [suggestion._asdict() for suggestion in professor_typeahead.search(q, limit)]
+    
+    db = ReadSessionLocal()
+    try:
+        query = search_professors(db.query(Professor), q, ProfessorSearchMode.SIMILARITY, has_trigram_search(db))
+        return query.limit(limit).all()
+    finally:
+        db.close()
+
+
 @router.get("/{professor_id}", response_model=ProfessorResponse)
-def get_professor(professor_id: int, db: Session = Depends(get_db)):
+def get_professor(professor_id: int, db: Session = Depends(get_read_db)):
     """Get a specific professor by ID"""
     professor = db.query(Professor).filter(Professor.id == professor_id).first()
     
@@ -58,6 +94,132 @@ def get_professor(professor_id: int, db: Session = Depends(get_db)):
     return professor
 
 
+@router.get("/{professor_id}/page", response_model=ProfessorPageResponse)
+async def get_professor_page(
+    professor_id: int,
+    reviews_limit: int = Query(20, ge=1, le=100),
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: Optional[User] = Depends(get_current_user_optional)
+):
+    """
+    Everything the professor profile page shows, in one request:
+    the professor, the first page of reviews (newest first), the review
+    summary, the grade distribution and up to 3 similar professors.
+    Use GET /reviews/professor/{id} with next_cursor for further review pages.
+    """
+    professor = await db.get(Professor, professor_id)
+    if not professor:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Professor not found"
+        )
+    
+    # Shares the professor lookup above through the session's identity map
+    page = await load_review_page(db, professor_id, limit=reviews_limit)
+    
+    review_summary = await load_review_summary(db, professor_id)
+    
+    grades_key = professor_response_cache.key(professor_id, "grades")
+    grade_distribution = professor_response_cache.get(grades_key)
+    if grade_distribution is MISSING:
+        histogram = await db.get(ProfessorGradeHistogram, professor_id)
+        grade_distribution = histogram.to_chart_data() if histogram else []
+        professor_response_cache.set(grades_key, grade_distribution)
+    
+    similar_professors = (await db.execute(similar_professors_query(professor_id, 3))).all()
+    if not similar_professors:
+        # Not in the similarity index yet: same department first, then the most reviewed
+        similar_professors = (await db.execute(
+            select(Professor, null())
+            .where(Professor.id != professor_id)
+            .order_by(
+                (Professor.department == professor.department).desc(),
+                Professor.total_reviews.desc(),
+                Professor.id
+            )
+            .limit(3)
+        )).all()
+    
+    return Response(content=render_json({
+        "professor": ProfessorResponse.model_validate(professor).model_dump(mode="json"),
+        "reviews": await review_page_for_user(db, page, current_user),
+        "review_summary": review_summary,
+        "grade_distribution": grade_distribution,
+        "similar_professors": [
+            _similar_professor_response(similar, score).model_dump(mode="json")
+            for similar, score in similar_professors
+        ],
+    }), media_type="application/json")
+
+
+@router.get("/{professor_id}/similar", response_model=List[SimilarProfessorResponse])
+def get_similar_professors(
+    professor_id: int,
+    limit: int = Query(5, ge=1, le=50),
+    db: Session = Depends(get_read_db)
+):
+    """
+    Get the professors most similar to this one (department, ratings,
+    grade distribution and courses), from the precomputed similarity index.
+    """
+    similar_professors = db.execute(similar_professors_query(professor_id, limit)).all()
+    
+    if not similar_professors and not db.get(Professor, professor_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Professor not found"
+        )
+    
+    return [_similar_professor_response(similar, score) for similar, score in similar_professors]
+
+
+def _similar_professor_response(professor: Professor, score: Optional[float]) -> SimilarProfessorResponse:
+    return SimilarProfessorResponse(
+        id=professor.id,
+        name=professor.name,
+        department=professor.department,
+        is_verified=professor.is_verified,
+        avg_rating=professor.avg_rating,
+        avg_difficulty=professor.avg_difficulty,
+        total_reviews=professor.total_reviews,
+        score=round(score, 4) if score is not None else None
+    )
+
+
+@router.get("/{professor_id}/related", response_model=List[RelatedProfessorResponse])
+def get_related_professors(
+    professor_id: int,
+    limit: int = Query(5, ge=1, le=50),
+    db: Session = Depends(get_read_db)
+):
+    """
+    Students who reviewed this professor also reviewed...
+    Served from the precomputed co-review lists.
+    """
+    related_professors = db.execute(related_professors_query(professor_id, limit)).all()
+    
+    if not related_professors and not db.get(Professor, professor_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Professor not found"
+        )
+    
+    return [
+        RelatedProfessorResponse(
+            id=related.id,
+            name=related.name,
+            department=related.department,
+            is_verified=related.is_verified,
+            avg_rating=related.avg_rating,
+            avg_difficulty=related.avg_difficulty,
+            total_reviews=related.total_reviews,
+            score=round(score, 4),
+            co_reviewers=co_reviewers
+        )
+        for related, score, co_reviewers in related_professors
+    ]
+
+
 @router.post("", response_model=ProfessorResponse, status_code=status.HTTP_201_CREATED)
 def create_professor(
     professor_data: ProfessorCreate,
@@ -73,6 +235,8 @@ def create_professor(
     db.add(new_professor)
     db.commit()
     db.refresh(new_professor)
+    professors_changed([new_professor.id])
+    professor_typeahead.upsert(new_professor.id, new_professor.name, new_professor.department)
     
     return new_professor
 
@@ -101,6 +265,8 @@ def update_professor(
     
     db.commit()
     db.refresh(professor)
+    professors_changed([professor.id])
+    professor_typeahead.upsert(professor.id, professor.name, professor.department)
     
     return professor
 
@@ -1,22 +1,34 @@
 """Review Routes - CRUD operations for student reviews"""
 
-from fastapi import APIRouter, Depends, HTTPException, status
+import json
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from sqlalchemy.orm import Session
-from sqlalchemy import func
-from typing import List, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import case, func, select
+from typing import List, Optional, Set, Tuple
 from datetime import datetime
 
-from app.core.database import get_db
-from app.core.security import get_current_user, require_role, get_current_user_optional
-from app.core.content_filter import contains_profanity
+from app.core.config import settings
+from app.core.database import get_db, get_async_db, get_read_db, get_async_read_db, SessionLocal
+from app.core.background import WorkQueue
+from app.core.cache import MISSING
+from app.core.pagination import encode_cursor, decode_cursor, keyset_filter
+from app.core.response_cache import professor_response_cache
+from app.core.review_search import has_full_text_search, search_reviews_query
+from app.core import professor_stats
+from app.core.security import get_current_user, get_current_user_optional
+from app.core.content_filter import contains_profanity, get_word_list_version
 from app.models.user import User
 from app.models.professor import Professor
-from app.models.review import Review, GradeEnum
+from app.models.professor_grade_histogram import ProfessorGradeHistogram
+from app.models.review import Review, REVIEW_VISIBLE, REVIEW_HIDDEN, REVIEW_PENDING_MODERATION
 from app.models.review_vote import ReviewVote
 from app.models.review_flag import ReviewFlag
 from app.models.user import UserRole
-from app.schemas.review import ReviewCreate, ReviewUpdate, ReviewResponse
-from app.schemas.review_flag import FlagCreate, FlagResponse
+from app.schemas.review import (
+    ReviewCreate, ReviewUpdate, ReviewResponse, ReviewPage, ReviewSort, ReviewSearchResult, ReviewSearchPage, ReviewSummary
+)
+from app.schemas.review_flag import FlagCreate
 
 
 router = APIRouter(prefix="/reviews", tags=["Reviews"])
@@ -81,6 +93,8 @@ def create_review(
     - One review per professor per semester per student
     - Validates content for profanity
     - Only students can post reviews
+    - With ASYNC_MODERATION, the review is accepted in a pending state and
+      moderated (then published) by a background worker
     """
     # Block professors from creating reviews
     if current_user.role == UserRole.PROFESSOR:
@@ -97,8 +111,8 @@ def create_review(
             detail="Professor not found"
         )
     
-    # Check for profanity in comment
-    if review_data.comment:
+    # Check for profanity in comment (deferred to the workers in async mode)
+    if review_data.comment and not settings.ASYNC_MODERATION:
         is_profane, reason = contains_profanity(review_data.comment)
         if is_profane:
             raise HTTPException(
@@ -131,52 +145,295 @@ def create_review(
         semester=review_data.semester
     )
     
+    if settings.ASYNC_MODERATION:
+        new_review.is_hidden = REVIEW_PENDING_MODERATION
+    else:
+        new_review.is_hidden = REVIEW_VISIBLE
+        new_review.moderation_version = get_word_list_version()
+    
     db.add(new_review)
+    
+    # Update professor's aggregate stats (pending reviews are counted once published)
+    if professor_stats.is_counted(new_review):
+        professor_stats.review_added(db, new_review)
+    
     db.commit()
     db.refresh(new_review)
+    professor_response_cache.invalidate(new_review.professor_id)
     
-    # Update professor's aggregate stats
-    _update_professor_stats(db, review_data.professor_id)
+    if settings.ASYNC_MODERATION:
+        # Queue full (or workers not running) - moderate inline instead
+        if not moderation_queue.submit(new_review.id):
+            _moderate_pending_review(new_review.id)
+            db.refresh(new_review)
     
     return new_review
 
 
-@router.get("/professor/{professor_id}", response_model=List[ReviewResponse])
+def _moderate_pending_review(review_id: int):
+    """
+    Moderate a review accepted in the pending state (runs in a background worker).
+    Clean reviews are published and counted in the professor's stats;
+    profane ones stay hidden and are flagged for admins.
+    """
+    db = SessionLocal()
+    try:
+        review = db.query(Review).filter(
+            Review.id == review_id,
+            Review.is_hidden == REVIEW_PENDING_MODERATION
+        ).first()
+        if not review:
+            return
+        
+        is_profane = False
+        if review.comment:
+            is_profane, _ = contains_profanity(review.comment)
+        
+        if is_profane:
+            review.is_hidden = REVIEW_HIDDEN
+            review.is_flagged = True
+        else:
+            review.is_hidden = REVIEW_VISIBLE
+            professor_stats.review_added(db, review)
+        review.moderation_version = get_word_list_version()
+        db.commit()
+        professor_response_cache.invalidate(review.professor_id)
+    finally:
+        db.close()
+
+
+moderation_queue = WorkQueue(
+    "moderation",
+    _moderate_pending_review,
+    workers=settings.MODERATION_WORKERS,
+    maxsize=settings.MODERATION_QUEUE_SIZE
+)
+
+
+def start_moderation_workers():
+    """Start the moderation workers and re-queue reviews left pending by a previous run"""
+    moderation_queue.start()
+    
+    db = SessionLocal()
+    try:
+        pending_ids = [
+            row.id for row in db.query(Review.id).filter(
+                Review.is_hidden == REVIEW_PENDING_MODERATION
+            ).order_by(Review.id)
+        ]
+    finally:
+        db.close()
+    
+    for review_id in pending_ids:
+        if not moderation_queue.submit(review_id):
+            _moderate_pending_review(review_id)
+
+
+# Sort mode -> (column, descending); ties are broken by id in the same direction
+REVIEW_SORTS = {
+    ReviewSort.NEWEST: (Review.created_at, True),
+    ReviewSort.HELPFUL: (Review.helpful_count, True),
+    ReviewSort.HIGHEST: (Review.rating_quality, True),
+    ReviewSort.LOWEST: (Review.rating_quality, False),
+}
+
+
+@router.get("/professor/{professor_id}", response_model=ReviewPage)
 async def get_professor_reviews(
     professor_id: int,
-    db: Session = Depends(get_db),
+    sort: ReviewSort = Query(ReviewSort.NEWEST, description="newest, helpful, highest or lowest"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    limit: int = Query(20, ge=1, le=100),
+    db: AsyncSession = Depends(get_async_read_db),
     current_user: Optional[User] = Depends(get_current_user_optional)
 ):
-    """Get all reviews for a specific professor with vote information"""
-    # Check if professor exists
-    professor = db.query(Professor).filter(Professor.id == professor_id).first()
-    if not professor:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Professor not found"
+    """
+    Get a page of reviews for a specific professor with vote information.
+    Keyset-paginated: pass next_cursor back as `cursor` to get the next page.
+    
+    The anonymous page is served from the response cache; logged-in users
+    get the cached page with their own votes/flags overlaid.
+    """
+    page = await load_review_page(db, professor_id, sort, cursor, limit)
+    
+    if not current_user or not page.review_ids:
+        return Response(content=page.body, media_type="application/json")
+    
+    # Overlay the user's own votes and flags
+    voted_ids, flagged_ids = await _get_user_vote_state(db, current_user.id, page.review_ids)
+    return Response(content=page.render(voted_ids, flagged_ids), media_type="application/json")
+
+
+async def load_review_page(
+    db: AsyncSession,
+    professor_id: int,
+    sort: ReviewSort = ReviewSort.NEWEST,
+    cursor: Optional[str] = None,
+    limit: int = 20
+) -> "CachedReviewPage":
+    """
+    Anonymous review page for a professor, from the response cache if possible.
+    Raises 404 if the professor doesn't exist.
+    """
+    cache_key = professor_response_cache.key(professor_id, "reviews", sort.value, cursor, limit)
+    page = professor_response_cache.get(cache_key)
+    
+    if page is MISSING:
+        # Check if professor exists (served from the identity map if the caller already loaded it)
+        professor = await db.get(Professor, professor_id)
+        if not professor:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Professor not found"
+            )
+        
+        reviews, next_cursor = await _get_review_page(db, professor_id, sort, cursor, limit)
+        page = CachedReviewPage(
+            [_to_review_response(review).model_dump(mode="json") for review in reviews],
+            next_cursor
         )
+        professor_response_cache.set(cache_key, page)
+    
+    return page
+
+
+async def review_page_for_user(db: AsyncSession, page: "CachedReviewPage", current_user: Optional[User]) -> dict:
+    """The page as a dict, with the current user's votes/flags overlaid"""
+    if not current_user or not page.review_ids:
+        return page.to_dict()
+    voted_ids, flagged_ids = await _get_user_vote_state(db, current_user.id, page.review_ids)
+    return page.to_dict(voted_ids, flagged_ids)
+
+
+def render_json(content) -> bytes:
+    """Serialize like FastAPI's JSONResponse"""
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+
+
+class CachedReviewPage:
+    """
+    A rendered review page: the anonymous response body plus the item dicts,
+    so per-user vote/flag state can be overlaid without touching the reviews.
+    """
+
+    def __init__(self, items: List[dict], next_cursor: Optional[str]):
+        self.items = items
+        self.next_cursor = next_cursor
+        self.review_ids = [item["id"] for item in items]
+        self.body = render_json({"items": items, "next_cursor": next_cursor})
+
+    def to_dict(self, voted_ids: Set[int] = frozenset(), flagged_ids: Set[int] = frozenset()) -> dict:
+        """The page for a user who voted/flagged the given reviews"""
+        items = self.items
+        if voted_ids or flagged_ids:
+            items = [
+                {**item, "user_voted": item["id"] in voted_ids, "user_flagged": item["id"] in flagged_ids}
+                for item in self.items
+            ]
+        return {"items": items, "next_cursor": self.next_cursor}
+
+    def render(self, voted_ids: Set[int], flagged_ids: Set[int]) -> bytes:
+        """Response body for a user who voted/flagged the given reviews"""
+        if not voted_ids and not flagged_ids:
+            return self.body
+        return render_json(self.to_dict(voted_ids, flagged_ids))
+
+
+async def _get_review_page(db: AsyncSession, professor_id: int, sort: ReviewSort, cursor: Optional[str], limit: int):
+    """
+    Fetch one page of a professor's visible reviews in the given sort order.
+    Each sort has a matching (professor_id, is_hidden, column, id) index.
     
-    reviews = db.query(Review).filter(
+    Returns:
+        Tuple of (reviews, next_cursor or None on the last page)
+    """
+    column, descending = REVIEW_SORTS[sort]
+    query = select(Review).where(
         Review.professor_id == professor_id,
-        Review.is_hidden == 0
-    ).order_by(Review.created_at.desc()).all()
+        Review.is_hidden == REVIEW_VISIBLE
+    )
+    
+    if cursor:
+        position = decode_cursor(cursor, sort.value, column.type.python_type)
+        query = query.where(keyset_filter(column, Review.id, position, descending))
+    
+    if descending:
+        query = query.order_by(column.desc(), Review.id.desc())
+    else:
+        query = query.order_by(column.asc(), Review.id.asc())
+    
+    # One extra row tells us whether there is a next page
+    reviews = (await db.scalars(query.limit(limit + 1))).all()
+    next_cursor = None
+    if len(reviews) > limit:
+        reviews = reviews[:limit]
+        last = reviews[-1]
+        next_cursor = encode_cursor(sort.value, getattr(last, column.key), last.id)
     
-    # Enrich with vote information
-    user_id = current_user.id if current_user else None
-    return [_enrich_review_with_vote_info(r, user_id, db) for r in reviews]
+    return reviews, next_cursor
 
 
 @router.get("/me", response_model=List[ReviewResponse])
 async def get_my_reviews(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """Get all reviews by the current logged-in user with vote information"""
-    reviews = db.query(Review).filter(
-        Review.student_id == current_user.id
-    ).order_by(Review.created_at.desc()).all()
+    reviews = (await db.scalars(
+        select(Review).where(
+            Review.student_id == current_user.id
+        ).order_by(Review.created_at.desc())
+    )).all()
+    
+    return await _enrich_reviews_with_vote_info(reviews, current_user.id, db)
+
+
+@router.get("/search", response_model=ReviewSearchPage)
+async def search_reviews(
+    q: str = Query(..., min_length=2, max_length=200, description='Words or "quoted phrases" to find in comments'),
+    professor_id: Optional[int] = Query(None, description="Only reviews of this professor"),
+    department: Optional[str] = Query(None, description="Only reviews of professors in this department"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    limit: int = Query(20, ge=1, le=100),
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: Optional[User] = Depends(get_current_user_optional)
+):
+    """
+    Search visible reviews by comment text, most relevant first.
+    Keyset-paginated on (rank, id): pass next_cursor back as `cursor` to get the next page.
+    """
+    if not q.strip():
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Search query is empty"
+        )
     
-    return [_enrich_review_with_vote_info(r, current_user.id, db) for r in reviews]
+    query, rank = search_reviews_query(q, has_full_text_search(db), professor_id, department)
+    if cursor:
+        query = query.where(keyset_filter(rank, Review.id, decode_cursor(cursor, "search", float), descending=True))
+    
+    # One extra row tells us whether there is a next page
+    rows = (await db.execute(query.order_by(rank.desc(), Review.id.desc()).limit(limit + 1))).all()
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last_review, _, _, last_rank = rows[-1]
+        next_cursor = encode_cursor("search", last_rank, last_review.id)
+    
+    voted_ids, flagged_ids = set(), set()
+    if current_user and rows:
+        voted_ids, flagged_ids = await _get_user_vote_state(db, current_user.id, [review.id for review, _, _, _ in rows])
+    
+    items = [
+        ReviewSearchResult(
+            **_to_review_response(review, voted_ids, flagged_ids).model_dump(),
+            professor_name=professor_name,
+            professor_department=professor_department,
+            rank=rank_value
+        )
+        for review, professor_name, professor_department, rank_value in rows
+    ]
+    return ReviewSearchPage(items=items, next_cursor=next_cursor)
 
 
 @router.get("/{review_id}", response_model=ReviewResponse)
@@ -222,12 +479,14 @@ def delete_review(
             detail="Cannot delete review - semester has ended"
         )
     
-    professor_id = review.professor_id
     db.delete(review)
-    db.commit()
     
     # Update professor stats after deletion
-    _update_professor_stats(db, professor_id)
+    if professor_stats.is_counted(review):
+        professor_stats.review_removed(db, review)
+    
+    db.commit()
+    professor_response_cache.invalidate(review.professor_id)
     
     return None
 
@@ -271,6 +530,8 @@ def update_review(
                 detail=f"Your review contains {reason}. Please keep your feedback respectful."
             )
     
+    old_rating, old_difficulty, old_grade = review.rating_quality, review.rating_difficulty, review.grade_received
+    
     # Update only provided fields
     if review_data.rating_quality is not None:
         review.rating_quality = review_data.rating_quality
@@ -280,123 +541,151 @@ def update_review(
         review.grade_received = review_data.grade_received
     if review_data.comment is not None:
         review.comment = review_data.comment
+        review.moderation_version = get_word_list_version()
+    
+    # Update professor stats after edit
+    if professor_stats.is_counted(review):
+        professor_stats.review_changed(db, review, old_rating, old_difficulty, old_grade)
     
     db.commit()
     db.refresh(review)
-    
-    # Update professor stats after edit
-    _update_professor_stats(db, review.professor_id)
+    professor_response_cache.invalidate(review.professor_id)
     
     return review
 
 
-@router.get("/professor/{professor_id}/grade-distribution")
-def get_grade_distribution(professor_id: int, db: Session = Depends(get_db)):
+@router.get("/professor/{professor_id}/summary", response_model=ReviewSummary)
+async def get_review_summary(professor_id: int, db: AsyncSession = Depends(get_async_read_db)):
+    """Would-take-again percentage and helpful votes over all of a professor's reviews"""
+    return await load_review_summary(db, professor_id)
+
+
+async def load_review_summary(db: AsyncSession, professor_id: int) -> dict:
     """
-    Get grade distribution for a professor.
-    This is the KEY endpoint for your Grade Distribution Chart!
-    Returns: [{"grade": "A", "count": 15}, {"grade": "B", "count": 8}, ...]
+    ReviewSummary of a professor, from the response cache if possible.
+    Raises 404 if the professor doesn't exist.
     """
-    # Check if professor exists
-    professor = db.query(Professor).filter(Professor.id == professor_id).first()
-    if not professor:
+    cache_key = professor_response_cache.key(professor_id, "summary")
+    summary = professor_response_cache.get(cache_key)
+    if summary is not MISSING:
+        return summary
+    
+    if not await db.get(Professor, professor_id):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Professor not found"
         )
     
-    # Aggregate grades using SQL GROUP BY
-    results = db.query(
-        Review.grade_received,
-        func.count(Review.id).label('count')
-    ).filter(
-        Review.professor_id == professor_id,
-        Review.is_hidden == 0
-    ).group_by(
-        Review.grade_received
-    ).all()
-    
-    # Convert to format Recharts expects
-    chart_data = [{"grade": r.grade_received.value, "count": r.count} for r in results]
-    
-    # Sort by grade order (A+ first, F last)
-    grade_order = ["A+", "A", "A-", "B+", "B", "B-", "C+", "C", "C-", "D", "F", "W"]
-    chart_data.sort(key=lambda x: grade_order.index(x["grade"]) if x["grade"] in grade_order else 99)
-    
-    return chart_data
+    # One aggregate over the professor's slice of the (professor_id, is_hidden, ...) indexes
+    reviews, would_take_again, helpful_votes = (await db.execute(
+        select(
+            func.count(),
+            func.coalesce(func.sum(case((Review.rating_quality >= 4, 1), else_=0)), 0),
+            func.coalesce(func.sum(Review.helpful_count), 0)
+        ).where(
+            Review.professor_id == professor_id,
+            Review.is_hidden == REVIEW_VISIBLE
+        )
+    )).one()
+    summary = {
+        "reviews": reviews,
+        "would_take_again": round(would_take_again * 100 / reviews) if reviews else 0,
+        "helpful_votes": helpful_votes,
+    }
+    professor_response_cache.set(cache_key, summary)
+    return summary
 
 
-def _update_professor_stats(db: Session, professor_id: int):
+@router.get("/professor/{professor_id}/grade-distribution")
+def get_grade_distribution(professor_id: int, db: Session = Depends(get_read_db)):
     """
-    Helper function to update a professor's aggregate stats.
-    Called after creating or deleting a review.
+    Get grade distribution for a professor.
+    This is the KEY endpoint for your Grade Distribution Chart!
+    Returns: [{"grade": "A", "count": 15}, {"grade": "B", "count": 8}, ...]
     """
-    # Get all non-hidden reviews for this professor
-    reviews = db.query(Review).filter(
-        Review.professor_id == professor_id,
-        Review.is_hidden == 0
-    ).all()
-    
-    professor = db.query(Professor).filter(Professor.id == professor_id).first()
-    
-    if reviews:
-        # Calculate averages
-        professor.avg_rating = sum(r.rating_quality for r in reviews) / len(reviews)
-        professor.avg_difficulty = sum(r.rating_difficulty for r in reviews) / len(reviews)
-        professor.total_reviews = len(reviews)
+    cache_key = professor_response_cache.key(professor_id, "grades")
+    chart_data = professor_response_cache.get(cache_key)
+    if chart_data is not MISSING:
+        return chart_data
+    
+    # Materialized histogram, kept current by the review write paths
+    histogram = db.get(ProfessorGradeHistogram, professor_id)
+    if histogram:
+        chart_data = histogram.to_chart_data()
     else:
-        # No reviews - reset to defaults
-        professor.avg_rating = 0.0
-        professor.avg_difficulty = 0.0
-        professor.total_reviews = 0
+        # No histogram row yet - either no reviews or an unknown professor
+        professor = db.query(Professor).filter(Professor.id == professor_id).first()
+        if not professor:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Professor not found"
+            )
+        chart_data = []
     
-    db.commit()
+    professor_response_cache.set(cache_key, chart_data)
+    return chart_data
 
 
-def _enrich_review_with_vote_info(review: Review, current_user_id: Optional[int], db: Session) -> ReviewResponse:
+def _to_review_response(review: Review, voted_ids: Set[int] = frozenset(), flagged_ids: Set[int] = frozenset()) -> ReviewResponse:
+    """Build the API response for a review, with the current user's vote/flag state"""
+    return ReviewResponse(
+        id=review.id,
+        professor_id=review.professor_id,
+        student_id=review.student_id,
+        rating_quality=review.rating_quality,
+        rating_difficulty=review.rating_difficulty,
+        grade_received=review.grade_received.value,
+        comment=review.comment,
+        course_code=review.course_code,
+        semester=review.semester,
+        created_at=review.created_at,
+        helpful_count=review.helpful_count,
+        user_voted=review.id in voted_ids,
+        is_flagged=review.is_flagged,
+        flag_count=review.flag_count,
+        user_flagged=review.id in flagged_ids
+    )
+
+
+async def _get_user_vote_state(db: AsyncSession, user_id: int, review_ids: List[int]) -> Tuple[Set[int], Set[int]]:
+    """
+    IDs of the given reviews the user has voted on and flagged.
+    One IN query per table, however many reviews there are.
     """
-    Helper function to add vote and flag information to a review response.
+    voted_ids = set((await db.scalars(select(ReviewVote.review_id).where(
+        ReviewVote.user_id == user_id,
+        ReviewVote.review_id.in_(review_ids)
+    ))).all())
+    flagged_ids = set((await db.scalars(select(ReviewFlag.review_id).where(
+        ReviewFlag.user_id == user_id,
+        ReviewFlag.review_id.in_(review_ids)
+    ))).all())
+    return voted_ids, flagged_ids
+
+
+async def _enrich_reviews_with_vote_info(
+    reviews: List[Review],
+    current_user_id: Optional[int],
+    db: AsyncSession
+) -> List[ReviewResponse]:
+    """
+    Helper function to add vote and flag information to review responses.
     Adds helpful_count, user_voted, is_flagged, flag_count, and user_flagged.
     """
-    review_dict = {
-        "id": review.id,
-        "professor_id": review.professor_id,
-        "student_id": review.student_id,
-        "rating_quality": review.rating_quality,
-        "rating_difficulty": review.rating_difficulty,
-        "grade_received": review.grade_received.value,
-        "comment": review.comment,
-        "course_code": review.course_code,
-        "semester": review.semester,
-        "created_at": review.created_at,
-        "helpful_count": review.helpful_count,
-        "user_voted": False,
-        "is_flagged": review.is_flagged,
-        "flag_count": review.flag_count,
-        "user_flagged": False
-    }
+    voted_ids = set()
+    flagged_ids = set()
     
-    # Check if current user has voted or flagged
-    if current_user_id:
-        user_vote = db.query(ReviewVote).filter(
-            ReviewVote.review_id == review.id,
-            ReviewVote.user_id == current_user_id
-        ).first()
-        review_dict["user_voted"] = user_vote is not None
-        
-        user_flag = db.query(ReviewFlag).filter(
-            ReviewFlag.review_id == review.id,
-            ReviewFlag.user_id == current_user_id
-        ).first()
-        review_dict["user_flagged"] = user_flag is not None
+    # Check which of these reviews the current user has voted or flagged
+    if current_user_id and reviews:
+        voted_ids, flagged_ids = await _get_user_vote_state(db, current_user_id, [review.id for review in reviews])
     
-    return ReviewResponse(**review_dict)
+    return [_to_review_response(review, voted_ids, flagged_ids) for review in reviews]
 
 
 @router.post("/{review_id}/vote", status_code=status.HTTP_200_OK)
 async def vote_review(
     review_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """
@@ -406,7 +695,7 @@ async def vote_review(
     - Returns updated helpful count
     """
     # Check if review exists
-    review = db.query(Review).filter(Review.id == review_id).first()
+    review = await db.get(Review, review_id)
     if not review:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -414,10 +703,10 @@ async def vote_review(
         )
     
     # Check if user already voted
-    existing_vote = db.query(ReviewVote).filter(
+    existing_vote = await db.scalar(select(ReviewVote).where(
         ReviewVote.review_id == review_id,
         ReviewVote.user_id == current_user.id
-    ).first()
+    ))
     
     if existing_vote:
         raise HTTPException(
@@ -437,7 +726,8 @@ async def vote_review(
     # Update helpful count
     review.helpful_count += 1
     
-    db.commit()
+    await db.commit()
+    professor_response_cache.invalidate(review.professor_id)
     
     return {"helpful_count": review.helpful_count, "user_voted": True}
 
@@ -445,7 +735,7 @@ async def vote_review(
 @router.delete("/{review_id}/vote", status_code=status.HTTP_200_OK)
 async def unvote_review(
     review_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """
@@ -454,7 +744,7 @@ async def unvote_review(
     - Can only remove own vote
     """
     # Check if review exists
-    review = db.query(Review).filter(Review.id == review_id).first()
+    review = await db.get(Review, review_id)
     if not review:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -462,10 +752,10 @@ async def unvote_review(
         )
     
     # Find user's vote
-    vote = db.query(ReviewVote).filter(
+    vote = await db.scalar(select(ReviewVote).where(
         ReviewVote.review_id == review_id,
         ReviewVote.user_id == current_user.id
-    ).first()
+    ))
     
     if not vote:
         raise HTTPException(
@@ -474,12 +764,13 @@ async def unvote_review(
         )
     
     # Delete vote
-    db.delete(vote)
+    await db.delete(vote)
     
     # Update helpful count
     review.helpful_count = max(0, review.helpful_count - 1)
     
-    db.commit()
+    await db.commit()
+    professor_response_cache.invalidate(review.professor_id)
     
     return {"helpful_count": review.helpful_count, "user_voted": False}
 
@@ -488,7 +779,7 @@ async def unvote_review(
 async def flag_review(
     review_id: int,
     flag_data: FlagCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """
@@ -498,7 +789,7 @@ async def flag_review(
     - One flag per user per review
     """
     # Check if review exists
-    review = db.query(Review).filter(Review.id == review_id).first()
+    review = await db.get(Review, review_id)
     if not review:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -506,10 +797,10 @@ async def flag_review(
         )
     
     # Check if user already flagged this review
-    existing_flag = db.query(ReviewFlag).filter(
+    existing_flag = await db.scalar(select(ReviewFlag).where(
         ReviewFlag.review_id == review_id,
         ReviewFlag.user_id == current_user.id
-    ).first()
+    ))
     
     if existing_flag:
         raise HTTPException(
@@ -530,8 +821,9 @@ async def flag_review(
     review.flag_count += 1
     review.is_flagged = True
     
-    db.commit()
-    db.refresh(new_flag)
+    await db.commit()
+    await db.refresh(new_flag)
+    professor_response_cache.invalidate(review.professor_id)
     
     return {
         "message": "Review flagged successfully",
@@ -543,7 +835,7 @@ async def flag_review(
 @router.delete("/{review_id}/flag", status_code=status.HTTP_200_OK)
 async def unflag_review(
     review_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """
@@ -552,7 +844,7 @@ async def unflag_review(
     - Can only remove own flag
     """
     # Check if review exists
-    review = db.query(Review).filter(Review.id == review_id).first()
+    review = await db.get(Review, review_id)
     if not review:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -560,10 +852,10 @@ async def unflag_review(
         )
     
     # Find user's flag
-    flag = db.query(ReviewFlag).filter(
+    flag = await db.scalar(select(ReviewFlag).where(
         ReviewFlag.review_id == review_id,
         ReviewFlag.user_id == current_user.id
-    ).first()
+    ))
     
     if not flag:
         raise HTTPException(
@@ -572,14 +864,15 @@ async def unflag_review(
         )
     
     # Delete flag
-    db.delete(flag)
+    await db.delete(flag)
     
     # Update review flag count and status
     review.flag_count = max(0, review.flag_count - 1)
     if review.flag_count == 0:
         review.is_flagged = False
     
-    db.commit()
+    await db.commit()
+    professor_response_cache.invalidate(review.professor_id)
     
     return {
         "message": "Flag removed successfully",
@@ -1,9 +1,12 @@
 """Professor Pydantic Schemas"""
 
+import enum
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
 
+from app.schemas.review import ReviewPage, ReviewSummary
+
 
 class ProfessorCreate(BaseModel):
     """Schema for creating a professor"""
@@ -17,6 +20,19 @@ class ProfessorUpdate(BaseModel):
     department: Optional[str] = Field(None, min_length=2, max_length=100)
 
 
+class ProfessorSearchMode(str, enum.Enum):
+    """How GET /professors matches the search term against names"""
+    SUBSTRING = "substring"
+    SIMILARITY = "similarity"  # Typo-tolerant, ranked by trigram similarity
+
+
+class ProfessorSuggestion(BaseModel):
+    """Autocomplete entry"""
+    id: int
+    name: str
+    department: str
+
+
 class ProfessorResponse(BaseModel):
     """Schema for professor API responses"""
     id: int
@@ -31,6 +47,32 @@ class ProfessorResponse(BaseModel):
         from_attributes = True
 
 
+class SimilarProfessorResponse(ProfessorResponse):
+    """A similar professor, with its cosine similarity if it came from the index"""
+    score: Optional[float] = None
+
+
+class RelatedProfessorResponse(ProfessorResponse):
+    """A professor co-reviewed with another one"""
+    score: float
+    co_reviewers: int  # Students who reviewed both
+
+
+class GradeCount(BaseModel):
+    """One bar of the grade distribution chart"""
+    grade: str
+    count: int
+
+
+class ProfessorPageResponse(BaseModel):
+    """Everything the professor profile page needs, in one response"""
+    professor: ProfessorResponse
+    reviews: ReviewPage
+    review_summary: ReviewSummary
+    grade_distribution: List[GradeCount]
+    similar_professors: List[SimilarProfessorResponse]
+
+
 class ProfessorFollowResponse(BaseModel):
     """Schema for follow/unfollow response"""
     professor_id: int
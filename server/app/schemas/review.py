@@ -1,7 +1,8 @@
 """Review Pydantic Schemas - Input/Output validation for reviews"""
 
+import enum
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
 from app.models.review import GradeEnum
 
@@ -60,7 +61,40 @@ class ReviewResponse(BaseModel):
         from_attributes = True
 
 
+class ReviewSort(str, enum.Enum):
+    """Sort modes of the professor review feed"""
+    NEWEST = "newest"
+    HELPFUL = "helpful"
+    HIGHEST = "highest"
+    LOWEST = "lowest"
+
+
+class ReviewPage(BaseModel):
+    """One page of reviews; pass next_cursor back as `cursor` for the next page"""
+    items: List[ReviewResponse]
+    next_cursor: Optional[str] = None
+
+
 class ReviewWithProfessor(ReviewResponse):
     """Review response that includes professor name"""
     professor_name: Optional[str] = None
 
+
+
+class ReviewSearchResult(ReviewWithProfessor):
+    """A review matching a search, with its relevance (higher is better)"""
+    professor_department: Optional[str] = None
+    rank: float = 0.0
+
+
+class ReviewSearchPage(BaseModel):
+    """One page of search results; pass next_cursor back as `cursor` for the next page"""
+    items: List[ReviewSearchResult]
+    next_cursor: Optional[str] = None
+
+
+class ReviewSummary(BaseModel):
+    """Aggregates over all of a professor's visible reviews"""
+    reviews: int
+    would_take_again: int  # Percent of reviews rating the professor 4 or 5
+    helpful_votes: int
@@ -0,0 +1,56 @@
+"""
+Auth Benchmark - Measure the CPU saved by the verified-JWT cache
+Run with: python benchmark_auth.py [--iterations 20000] [--requests-per-second 200]
+
+Compares a full jose.jwt.decode (HMAC check + JSON parsing) against a
+cache hit in decode_access_token, and projects the CPU time saved per
+second at the given request rate.
+"""
+
+import argparse
+import time
+
+from jose import jwt
+
+from app.core.config import settings
+from app.core.security import create_access_token, decode_access_token
+
+
+def time_per_call(func, iterations: int) -> float:
+    """Average CPU seconds per call"""
+    start = time.process_time()
+    for _ in range(iterations):
+        func()
+    return (time.process_time() - start) / iterations
+
+
+def run_benchmark(iterations: int, requests_per_second: int):
+    token = create_access_token(data={"sub": "student1@university.edu", "role": "student"})
+
+    uncached = time_per_call(
+        lambda: jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]),
+        iterations
+    )
+
+    decode_access_token(token)  # Warm the cache
+    cached = time_per_call(lambda: decode_access_token(token), iterations)
+
+    saved_per_call = uncached - cached
+    print("=" * 50)
+    print("JWT decode benchmark")
+    print("=" * 50)
+    print(f"   • Full decode:  {uncached * 1e6:8.1f} µs/call")
+    print(f"   • Cache hit:    {cached * 1e6:8.1f} µs/call")
+    print(f"   • Saved:        {saved_per_call * 1e6:8.1f} µs/call ({uncached / cached:.0f}x)")
+    print(f"\n📊 At {requests_per_second} authenticated requests/s:")
+    print(f"   • CPU saved: {saved_per_call * requests_per_second * 1000:.1f} ms per second "
+          f"({saved_per_call * requests_per_second * 100:.2f}% of one core)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the verified-JWT cache")
+    parser.add_argument("--iterations", type=int, default=20000)
+    parser.add_argument("--requests-per-second", type=int, default=200)
+    args = parser.parse_args()
+
+    run_benchmark(args.iterations, args.requests_per_second)
@@ -0,0 +1,53 @@
+"""
+Related Professors Build - "Students who reviewed X also reviewed Y"
+Run with: python build_related_professors.py [--top-n 10] [--professor-id 12 --professor-id 34]
+
+Builds the professor x professor co-review matrix from the (student,
+professor) pairs of the visible reviews, normalizes it by the number of
+reviewers of each professor, and stores each professor's top-N related
+professors in related_professors.
+
+The running app refreshes the lists incrementally as reviews come and go.
+Run a full build after seeding or bulk imports, or with --professor-id to
+refresh around specific professors.
+"""
+
+import argparse
+import time
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core.related_professors import rebuild_related_professors, refresh_related
+
+
+def build(top_n: int, professor_ids=None):
+    db = SessionLocal()
+
+    try:
+        started = time.perf_counter()
+        if professor_ids:
+            print(f"🤝 Refreshing related professors around {len(professor_ids)} professors (top {top_n})...")
+            rows = refresh_related(db, professor_ids, top_n)
+        else:
+            print(f"🤝 Building related professors from all reviews (top {top_n})...")
+            rows = rebuild_related_professors(db, top_n)
+        db.commit()
+        print(f"   ✅ Recomputed {rows} related lists in {time.perf_counter() - started:.2f}s")
+
+    except Exception as e:
+        print(f"\n❌ Error: {e}")
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build the co-review related-professors lists")
+    parser.add_argument("--top-n", type=int, default=settings.RELATED_TOP_N,
+                        help="Related professors stored per professor")
+    parser.add_argument("--professor-id", type=int, action="append", dest="professor_ids",
+                        help="Only refresh around this professor (repeatable)")
+    args = parser.parse_args()
+
+    build(args.top_n, args.professor_ids)
@@ -0,0 +1,52 @@
+"""
+Similarity Index Build - Precompute "similar professors" for every professor
+Run with: python build_similarity_index.py [--top-k 10] [--professor-id 12 --professor-id 34]
+
+Builds the feature vectors of all professors (department, rating/difficulty,
+grade histogram, courses taught) and stores each professor's top-k neighbours
+by cosine similarity in professor_similarities.
+
+The running app refreshes the index incrementally as reviews change. Run a
+full build after seeding, bulk imports or rebuild_professor_stats.py, or
+with --professor-id to refresh around specific professors.
+"""
+
+import argparse
+import time
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core.similarity import rebuild_similarity_index, refresh_similarities
+
+
+def build(top_k: int, professor_ids=None):
+    db = SessionLocal()
+
+    try:
+        started = time.perf_counter()
+        if professor_ids:
+            print(f"🔗 Refreshing similar professors around {len(professor_ids)} professors (top {top_k})...")
+            rows = refresh_similarities(db, professor_ids, top_k)
+        else:
+            print(f"🔗 Building the similarity index for all professors (top {top_k})...")
+            rows = rebuild_similarity_index(db, top_k)
+        db.commit()
+        print(f"   ✅ Recomputed {rows} neighbour lists in {time.perf_counter() - started:.2f}s")
+
+    except Exception as e:
+        print(f"\n❌ Error: {e}")
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Precompute the similar-professors index")
+    parser.add_argument("--top-k", type=int, default=settings.SIMILARITY_TOP_K,
+                        help="Neighbours stored per professor")
+    parser.add_argument("--professor-id", type=int, action="append", dest="professor_ids",
+                        help="Only refresh around this professor (repeatable)")
+    args = parser.parse_args()
+
+    build(args.top_k, args.professor_ids)
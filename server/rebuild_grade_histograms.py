@@ -0,0 +1,40 @@
+"""
+Grade Histogram Rebuild - Recompute the materialized grade distributions
+Run with: python rebuild_grade_histograms.py [--professor-id 12 --professor-id 34]
+
+The review write paths keep professor_grade_histogram current incrementally.
+Run this after bulk imports, manual SQL fixes or anything else that may have
+let the histograms drift from the reviews table.
+"""
+
+import argparse
+
+from app.core.database import SessionLocal
+from app.core.professor_stats import rebuild_histograms
+
+
+def rebuild(professor_ids=None):
+    db = SessionLocal()
+
+    try:
+        target = f"{len(professor_ids)} professors" if professor_ids else "all professors"
+        print(f"📊 Rebuilding grade histograms for {target}...")
+        rows = rebuild_histograms(db, professor_ids)
+        db.commit()
+        print(f"   ✅ Rebuilt {rows} histograms")
+
+    except Exception as e:
+        print(f"\n❌ Error: {e}")
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rebuild professor grade histograms from the reviews")
+    parser.add_argument("--professor-id", type=int, action="append", dest="professor_ids",
+                        help="Only rebuild this professor (repeatable)")
+    args = parser.parse_args()
+
+    rebuild(args.professor_ids)
@@ -0,0 +1,73 @@
+"""
+Professor Stats Rebuild - Resync aggregates and grade histograms with the reviews
+Run with: python rebuild_professor_stats.py [--department "Physics"] [--dry-run]
+
+avg_rating, avg_difficulty, total_reviews, the running sums and the grade
+histograms are recomputed for every professor at once: one GROUP BY over the
+reviews feeds an UPDATE ... FROM, so the cost is a couple of statements no
+matter how many professors there are.
+
+Use --dry-run to see which professors have drifted without writing anything.
+"""
+
+import argparse
+import time
+
+from app.core.database import SessionLocal
+from app.core.professor_stats import find_stats_drift, rebuild_professor_stats, rebuild_histograms
+
+
+def _format_value(value) -> str:
+    return f"{value:.2f}" if isinstance(value, float) else str(value)
+
+
+def print_drift_report(drift, limit: int):
+    """Print the professors whose stored stats differ from their reviews"""
+    for entry in drift[:limit]:
+        changes = ", ".join(
+            f"{field} {_format_value(entry['stored'][field])} → {_format_value(entry['actual'][field])}"
+            for field in entry["stored"]
+        )
+        print(f"   • #{entry['professor_id']} {entry['name']} ({entry['department']}): {changes}")
+    if len(drift) > limit:
+        print(f"   ... and {len(drift) - limit} more")
+
+
+def rebuild(department: str = None, dry_run: bool = False, limit: int = 50):
+    db = SessionLocal()
+
+    try:
+        target = f"department '{department}'" if department else "all departments"
+        print(f"🔎 Checking professor stats for {target}...")
+        drift = find_stats_drift(db, department)
+        print(f"   {len(drift)} professors out of sync")
+        print_drift_report(drift, limit)
+
+        if dry_run:
+            print("\n💡 Dry run - nothing was written")
+            return
+
+        print("\n📊 Rebuilding professor stats...")
+        start = time.perf_counter()
+        professors = rebuild_professor_stats(db, department=department)
+        histograms = rebuild_histograms(db, department=department)
+        db.commit()
+        print(f"   ✅ Updated {professors} professors and {histograms} histograms "
+              f"in {time.perf_counter() - start:.2f}s")
+
+    except Exception as e:
+        print(f"\n❌ Error: {e}")
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rebuild professor aggregates and grade histograms from the reviews")
+    parser.add_argument("--department", default=None, help="Only rebuild professors in this department")
+    parser.add_argument("--dry-run", action="store_true", help="Report drifted professors without writing")
+    parser.add_argument("--limit", type=int, default=50, help="Maximum professors listed in the report")
+    args = parser.parse_args()
+
+    rebuild(department=args.department, dry_run=args.dry_run, limit=args.limit)
@@ -0,0 +1,139 @@
+"""
+Re-moderation Script - Re-check stored reviews after the word lists change
+Run with: python remoderate_reviews.py [--hide] [--workers 4] [--batch-size 1000]
+
+Only reviews that were not yet checked against the current word-list version
+are scanned. Comments are streamed with a server-side cursor and checked in a
+process pool; results are written back with one UPDATE per batch.
+"""
+
+import argparse
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Tuple
+
+from sqlalchemy import or_, update
+
+from app.core.database import SessionLocal
+from app.core.content_filter import contains_profanity, get_word_list_version
+from app.core.professor_stats import hide_reviews
+from app.models.review import Review
+
+
+def check_batch(rows: List[Tuple[int, str]]) -> Tuple[List[int], List[int]]:
+    """
+    Run the profanity filter over one batch of (review_id, comment) rows.
+    Executed inside the worker processes.
+
+    Returns:
+        Tuple of (checked_ids, profane_ids)
+    """
+    checked_ids = []
+    profane_ids = []
+    for review_id, comment in rows:
+        checked_ids.append(review_id)
+        if comment:
+            is_profane, _ = contains_profanity(comment)
+            if is_profane:
+                profane_ids.append(review_id)
+    return checked_ids, profane_ids
+
+
+def stream_batches(db, version: str, batch_size: int):
+    """Yield batches of unchecked (id, comment) rows using a server-side cursor"""
+    query = db.query(Review.id, Review.comment).filter(
+        or_(
+            Review.moderation_version.is_(None),
+            Review.moderation_version != version
+        )
+    ).order_by(Review.id).execution_options(yield_per=batch_size)
+
+    batch = []
+    for review_id, comment in query:
+        batch.append((review_id, comment))
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def apply_results(db, version: str, checked_ids: List[int], profane_ids: List[int], hide: bool) -> int:
+    """
+    Write one batch of results back with set-based UPDATEs.
+
+    Returns:
+        Number of visible reviews that were hidden (only when hiding)
+    """
+    hidden = 0
+    if profane_ids:
+        if hide:
+            # Hidden reviews no longer count towards professor stats
+            hidden = hide_reviews(db, profane_ids)
+        else:
+            db.execute(
+                update(Review).where(Review.id.in_(profane_ids)).values(is_flagged=True)
+            )
+
+    db.execute(
+        update(Review).where(Review.id.in_(checked_ids)).values(moderation_version=version)
+    )
+    db.commit()
+    return hidden
+
+
+def remoderate_reviews(hide: bool = False, workers: int = None, batch_size: int = 1000):
+    # Separate sessions: committing the writes must not close the streaming cursor
+    read_db = SessionLocal()
+    write_db = SessionLocal()
+    workers = workers or os.cpu_count() or 1
+    version = get_word_list_version()
+
+    checked_total = 0
+    profane_total = 0
+    hidden_total = 0
+
+    try:
+        print(f"🔎 Re-moderating reviews against word-list version {version}...")
+
+        def drain(future):
+            nonlocal checked_total, profane_total, hidden_total
+            checked_ids, profane_ids = future.result()
+            hidden_total += apply_results(write_db, version, checked_ids, profane_ids, hide)
+            checked_total += len(checked_ids)
+            profane_total += len(profane_ids)
+
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            # Keep a bounded number of batches in flight so memory stays flat
+            pending = deque()
+            for batch in stream_batches(read_db, version, batch_size):
+                pending.append(executor.submit(check_batch, batch))
+                if len(pending) >= workers * 2:
+                    drain(pending.popleft())
+
+            while pending:
+                drain(pending.popleft())
+
+        action = "hidden" if hide else "flagged"
+        print(f"   ✅ Checked {checked_total} reviews, {profane_total} {action}")
+        if hide:
+            print(f"   📊 {hidden_total} previously visible reviews removed from professor stats")
+
+    except Exception as e:
+        print(f"\n❌ Error: {e}")
+        write_db.rollback()
+        raise
+    finally:
+        read_db.close()
+        write_db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Re-check stored reviews against the current word lists")
+    parser.add_argument("--hide", action="store_true", help="Hide matching reviews instead of flagging them")
+    parser.add_argument("--workers", type=int, default=None, help="Number of worker processes (default: CPU count)")
+    parser.add_argument("--batch-size", type=int, default=1000, help="Reviews per batch")
+    args = parser.parse_args()
+
+    remoderate_reviews(hide=args.hide, workers=args.workers, batch_size=args.batch_size)
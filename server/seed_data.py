@@ -3,11 +3,14 @@ Seed Script - Populate database with test data
 Run with: python seed_data.py
 """
 
-from app.core.database import SessionLocal, engine
+from app.core.database import SessionLocal
 from app.models.user import User, UserRole
 from app.models.professor import Professor
 from app.models.review import Review, GradeEnum
 from app.core.security import hash_password
+from app.core.professor_stats import rebuild_professor_stats, rebuild_histograms
+from app.core.related_professors import rebuild_related_professors
+from app.core.similarity import rebuild_similarity_index
 from datetime import datetime, timedelta
 import random
 
@@ -141,13 +144,10 @@ def seed_database():
         
         # Update professor aggregate stats
         print("\n📊 Updating professor statistics...")
-        for professor in professors:
-            reviews = db.query(Review).filter(Review.professor_id == professor.id).all()
-            if reviews:
-                professor.avg_rating = sum(r.rating_quality for r in reviews) / len(reviews)
-                professor.avg_difficulty = sum(r.rating_difficulty for r in reviews) / len(reviews)
-                professor.total_reviews = len(reviews)
-        
+        rebuild_professor_stats(db)
+        rebuild_histograms(db)
+        rebuild_similarity_index(db)
+        rebuild_related_professors(db)
         db.commit()
         print("   ✅ Statistics updated")
         
@@ -0,0 +1,33 @@
+"""Test settings: a throwaway SQLite database, set before the app is imported"""
+import os
+import tempfile
+
+import pytest
+
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'test.db')}")
+os.environ.setdefault("SECRET_KEY", "test-secret-key")
+
+from fastapi.testclient import TestClient
+
+from app.core.database import Base, SessionLocal, engine
+from app.core.response_cache import professor_response_cache
+from app.main import app
+
+
+@pytest.fixture
+def db():
+    """A session on freshly created tables"""
+    Base.metadata.create_all(engine)
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+        Base.metadata.drop_all(engine)
+        professor_response_cache.clear()  # ids are reused by the next test
+
+
+@pytest.fixture
+def client(db):
+    """Test client without the startup hooks (no background workers)"""
+    return TestClient(app)
@@ -0,0 +1,57 @@
+"""Content filter regressions"""
+import json
+
+import pytest
+
+from app.core.config import settings
+from app.core.content_filter import (
+    censor_text, contains_profanity, get_severity_level, reload_word_lists
+)
+
+
+@pytest.mark.parametrize("text", [
+    "f*ck this",
+    "a$$",
+    "5hit",
+    "$hit",
+    "d4mn",
+    "haram zada",
+    "ullu ka pattha",
+    "bay ghairat",
+    "Ye harami teacher hai",
+    "He is a k@mina person",
+])
+def test_blocks_profanity(text):
+    assert contains_profanity(text)[0]
+
+
+@pytest.mark.parametrize("text", [
+    "This is a great professor",
+    "Great office hours, fair curve",
+    "He was hit by a hard exam",
+    "As soon as possible",
+    "The title of the class",
+])
+def test_allows_clean_text(text):
+    assert contains_profanity(text) == (False, "")
+
+
+def test_censor_keeps_clean_words():
+    assert censor_text("d4mn this class") == "**** this class"
+
+
+def test_word_list_file_escalates_builtin_severity(tmp_path, monkeypatch):
+    wordlist = tmp_path / "words.json"
+    wordlist.write_text(json.dumps({"severe": ["pagal", "kamina"]}))
+    assert get_severity_level("what a pagal teacher") == "mild"
+
+    monkeypatch.setattr(settings, "MODERATION_WORDLIST_PATH", str(wordlist))
+    try:
+        reload_word_lists()
+        assert get_severity_level("what a pagal teacher") == "severe"
+        assert get_severity_level("He is a kamina person") == "severe"
+        assert get_severity_level("What a bewakoof explanation") == "mild"
+    finally:
+        monkeypatch.undo()
+        reload_word_lists()
+    assert get_severity_level("what a pagal teacher") == "mild"
@@ -0,0 +1,52 @@
+"""Keyset pagination cursors"""
+import base64
+import json
+from datetime import datetime
+
+import pytest
+from fastapi import HTTPException
+
+from app.core.pagination import decode_cursor, encode_cursor
+
+
+def _raw_cursor(*parts) -> str:
+    return base64.urlsafe_b64encode(json.dumps(list(parts)).encode()).decode().rstrip("=")
+
+
+@pytest.mark.parametrize("sort, value, value_type", [
+    ("helpful", 7, int),
+    ("highest", 0, int),
+    ("search", 0.0607927, float),
+    ("newest", datetime(2024, 9, 1, 12, 30, 15, 250), datetime),
+])
+def test_cursor_round_trip(sort, value, value_type):
+    assert decode_cursor(encode_cursor(sort, value, 42), sort, value_type) == (value, 42)
+
+
+def test_search_cursor_accepts_an_integral_rank():
+    assert decode_cursor(_raw_cursor("search", 0, 3), "search", float) == (0.0, 3)
+
+
+@pytest.mark.parametrize("cursor, sort, value_type", [
+    ("not a cursor!", "helpful", int),
+    (_raw_cursor("helpful", 1), "helpful", int),
+    (_raw_cursor("newest", 1, 2), "helpful", int),
+    (_raw_cursor("helpful", [1, 2], 2), "helpful", int),
+    (_raw_cursor("helpful", {"a": 1}, 2), "helpful", int),
+    (_raw_cursor("helpful", "x", 2), "helpful", int),
+    (_raw_cursor("helpful", 1.5, 2), "helpful", int),
+    (_raw_cursor("helpful", True, 2), "helpful", int),
+    (_raw_cursor("helpful", 2**40, 2), "helpful", int),
+    (_raw_cursor("helpful", 1, "2"), "helpful", int),
+    (_raw_cursor("helpful", 1, True), "helpful", int),
+    (_raw_cursor("search", [1], 2), "search", float),
+    (_raw_cursor("search", "0.5", 2), "search", float),
+    (_raw_cursor("search", None, 2), "search", float),
+    (_raw_cursor("search", float("nan"), 2), "search", float),
+    (_raw_cursor("newest", 5, 2), "newest", datetime),
+    (_raw_cursor("newest", "yesterday", 2), "newest", datetime),
+])
+def test_malformed_cursor_is_rejected(cursor, sort, value_type):
+    with pytest.raises(HTTPException) as error:
+        decode_cursor(cursor, sort, value_type)
+    assert error.value.status_code == 400
@@ -0,0 +1,174 @@
+"""Professor aggregates and grade histograms kept in sync with review writes"""
+import pytest
+
+from app.core import professor_stats
+from app.core.professor_stats import find_stats_drift, hide_reviews, rebuild_histograms, rebuild_professor_stats
+from app.core.security import create_access_token
+from app.models.professor import Professor
+from app.models.professor_grade_histogram import ProfessorGradeHistogram
+from app.models.review import Review, GradeEnum, REVIEW_PENDING_MODERATION
+from app.models.user import User, UserRole
+from app.routers.reviews import _moderate_pending_review
+
+SEMESTER = "Fall 2099"  # Not ended, so students can still edit and delete
+
+
+def _auth(user):
+    return {"Authorization": "Bearer " + create_access_token({"sub": user.email, "role": user.role.value})}
+
+
+def _assert_no_drift(db):
+    db.expire_all()
+    assert find_stats_drift(db) == []
+
+
+@pytest.fixture
+def people(db):
+    students = [User(email=f"s{i}@x.edu", password_hash="x", role=UserRole.STUDENT) for i in range(4)]
+    admin = User(email="admin@x.edu", password_hash="x", role=UserRole.ADMIN)
+    professors = [Professor(name="Ada", department="CS"), Professor(name="Grace", department="CS")]
+    db.add_all([*students, admin, *professors])
+    db.commit()
+    return students, admin, professors
+
+
+def _post_review(client, student, professor, rating, difficulty, grade):
+    response = client.post("/reviews", headers=_auth(student), json={
+        "professor_id": professor.id, "rating_quality": rating, "rating_difficulty": difficulty,
+        "grade_received": grade, "comment": "Clear lectures", "semester": SEMESTER,
+    })
+    assert response.status_code == 201
+    return response.json()["id"]
+
+
+def test_review_writes_keep_stats_in_sync(db, client, people):
+    students, admin, (ada, grace) = people
+
+    # The first review of each professor also creates its histogram row
+    ids = [
+        _post_review(client, students[0], ada, 5, 2, "A"),
+        _post_review(client, students[1], ada, 3, 4, "B"),
+        _post_review(client, students[2], ada, 4, 3, "A"),
+        _post_review(client, students[3], grace, 2, 5, "C"),
+    ]
+    _assert_no_drift(db)
+    assert (db.get(Professor, ada.id).total_reviews, db.get(Professor, ada.id).avg_rating) == (3, 4.0)
+
+    edits = [
+        (0, {"rating_quality": 1}),
+        (1, {"grade_received": "A-"}),
+        (2, {"rating_difficulty": 5, "grade_received": "F"}),
+        (2, {"comment": "Only the comment changed"}),
+    ]
+    for index, changes in edits:
+        response = client.put(f"/reviews/{ids[index]}", headers=_auth(students[index]), json=changes)
+        assert response.status_code == 200
+        _assert_no_drift(db)
+
+    assert client.delete(f"/reviews/{ids[0]}", headers=_auth(students[0])).status_code == 204
+    _assert_no_drift(db)
+
+    assert client.delete(f"/admin/reviews/{ids[3]}", headers=_auth(admin)).status_code == 200
+    _assert_no_drift(db)
+    assert db.get(Professor, grace.id).total_reviews == 0
+
+    pending = Review(
+        professor_id=grace.id, student_id=students[0].id, rating_quality=4, rating_difficulty=2,
+        grade_received=GradeEnum.B, semester=SEMESTER, is_hidden=REVIEW_PENDING_MODERATION
+    )
+    db.add(pending)
+    db.commit()
+    _moderate_pending_review(pending.id)  # published by the moderation worker
+    _assert_no_drift(db)
+    assert db.get(Professor, grace.id).total_reviews == 1
+
+
+def test_hide_reviews_removes_only_visible_reviews(db, client, people):
+    students, _, (ada, grace) = people
+    ids = [
+        _post_review(client, students[0], ada, 5, 2, "A"),
+        _post_review(client, students[1], ada, 3, 4, "B"),
+        _post_review(client, students[2], grace, 4, 3, "A"),
+        _post_review(client, students[3], grace, 2, 5, "C"),
+    ]
+
+    assert hide_reviews(db, [ids[0], ids[2], ids[3]]) == 3
+    db.commit()
+    _assert_no_drift(db)
+
+    assert hide_reviews(db, [ids[0], ids[1]]) == 1  # ids[0] is already hidden
+    db.commit()
+    _assert_no_drift(db)
+    assert db.get(Professor, ada.id).total_reviews == 0
+    assert db.get(Professor, grace.id).total_reviews == 0
+
+
+def test_rollback_undoes_deltas_and_queues_nothing(db, people, monkeypatch):
+    students, _, (ada, _) = people
+    queue = professor_stats.stats_recompute_queue
+
+    review = Review(
+        professor_id=ada.id, student_id=students[0].id, rating_quality=5, rating_difficulty=1,
+        grade_received=GradeEnum.A, semester=SEMESTER
+    )
+    db.add(review)
+    professor_stats.review_added(db, review)
+    db.rollback()
+    _assert_no_drift(db)
+    assert not {"changed_professors", "reviewers_changed"} & db.info.keys()
+
+    monkeypatch.setattr(queue, "interval", 3600)  # only flush when the test says so
+    queue.start()
+    try:
+        db.add(review)
+        professor_stats.review_added(db, review)
+        assert db.info["stale_professors"] == {ada.id}
+        db.rollback()
+        assert "stale_professors" not in db.info
+        assert queue.stats()["pending"] == 0
+    finally:
+        queue.stop()
+
+
+def test_deferred_recompute_catches_up_after_flush(db, client, people, monkeypatch):
+    students, _, (ada, grace) = people
+    queue = professor_stats.stats_recompute_queue
+    monkeypatch.setattr(queue, "interval", 3600)
+    queue.start()
+    try:
+        first = _post_review(client, students[0], ada, 5, 2, "A")
+        _post_review(client, students[1], ada, 3, 4, "B")
+        _post_review(client, students[2], grace, 4, 3, "A")
+        client.put(f"/reviews/{first}", headers=_auth(students[0]), json={"rating_quality": 2, "grade_received": "C"})
+
+        # Nothing applied on the request path, both professors queued once
+        db.expire_all()
+        assert {drift["professor_id"] for drift in find_stats_drift(db)} == {ada.id, grace.id}
+        assert queue.stats()["pending"] == 2
+
+        queue.flush()
+        _assert_no_drift(db)
+    finally:
+        queue.stop()
+
+
+def test_rebuild_fixes_drift(db, client, people):
+    students, _, (ada, grace) = people
+    _post_review(client, students[0], ada, 5, 2, "A")
+    _post_review(client, students[1], grace, 3, 4, "B")
+
+    db.get(Professor, ada.id).total_reviews = 7
+    db.get(Professor, ada.id).rating_sum = 1
+    db.query(ProfessorGradeHistogram).filter(ProfessorGradeHistogram.professor_id == grace.id).delete()
+    db.commit()
+
+    drift = {row["professor_id"]: row for row in find_stats_drift(db)}
+    assert set(drift) == {ada.id, grace.id}
+    assert drift[ada.id]["stored"] == {"total_reviews": 7, "rating_sum": 1}
+    assert drift[ada.id]["actual"] == {"total_reviews": 1, "rating_sum": 5}
+    assert drift[grace.id]["stored"] == {"histogram": "missing"}
+
+    rebuild_professor_stats(db)
+    rebuild_histograms(db)
+    db.commit()
+    _assert_no_drift(db)
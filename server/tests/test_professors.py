@@ -0,0 +1,18 @@
+"""Professor routes"""
+from app.models.professor import Professor
+
+
+def test_search_matches_like_wildcards_literally(db, client):
+    db.add_all([
+        Professor(name="Alan Turing", department="CS"),
+        Professor(name="Ada_Lovelace", department="CS"),
+        Professor(name="Grace 100% Hopper", department="CS"),
+    ])
+    db.commit()
+
+    expected = {"%": ["Grace 100% Hopper"], "_": ["Ada_Lovelace"], "da_lo": ["Ada_Lovelace"], "%%": []}
+    for mode in ("substring", "similarity"):
+        for search, names in expected.items():
+            response = client.get("/professors", params={"search": search, "mode": mode})
+            assert response.status_code == 200
+            assert [professor["name"] for professor in response.json()] == names, (mode, search)
@@ -0,0 +1,81 @@
+"""Read-your-writes routing between the primary and a read replica"""
+import os
+import tempfile
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core import database
+from app.core.database import Base, READ_YOUR_WRITES_COOKIE, _wrote_recently, write_marker
+from app.core.security import create_access_token
+from app.main import app
+from app.models.user import User, UserRole
+
+
+@pytest.fixture
+def replica(db, monkeypatch):
+    """A replica that never catches up: its tables stay empty"""
+    path = os.path.join(tempfile.mkdtemp(), "replica.db")
+    read_engine = create_engine(f"sqlite:///{path}")
+    async_read_engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    Base.metadata.create_all(read_engine)
+    monkeypatch.setattr(database, "read_engine", read_engine)
+    monkeypatch.setattr(database, "ReadSessionLocal", sessionmaker(autoflush=False, bind=read_engine))
+    monkeypatch.setattr(database, "AsyncReadSessionLocal", async_sessionmaker(async_read_engine, class_=AsyncSession))
+    yield
+    read_engine.dispose()
+
+
+def _names(response):
+    assert response.status_code == 200
+    return [professor["name"] for professor in response.json()]
+
+
+def _auth(user):
+    return {"Authorization": "Bearer " + create_access_token({"sub": user.email, "role": user.role.value})}
+
+
+def test_reads_after_a_write_go_to_the_primary_on_any_worker(db, replica):
+    admin = User(email="admin@x.edu", password_hash="x", role=UserRole.ADMIN)
+    student = User(email="student@x.edu", password_hash="x", role=UserRole.STUDENT)
+    db.add_all([admin, student])
+    db.commit()
+    headers = _auth(admin)
+
+    response = TestClient(app).post("/professors", headers=headers, json={"name": "Barbara Liskov", "department": "CS"})
+    assert response.status_code == 201
+    marker = response.cookies[READ_YOUR_WRITES_COOKIE]
+
+    # Nothing is shared with the client that wrote except the cookie it sends back
+    other_worker = TestClient(app, cookies={READ_YOUR_WRITES_COOKIE: marker})
+    assert _names(other_worker.get("/professors", headers=headers)) == ["Barbara Liskov"]
+
+    # Reads don't renew the marker, and other clients read the (stale) replica
+    assert READ_YOUR_WRITES_COOKIE not in other_worker.get("/professors").headers.get("set-cookie", "")
+    assert _names(TestClient(app).get("/professors", headers=headers)) == []
+
+    # Same for async routes
+    professor_id = response.json()["id"]
+    response = TestClient(app).post("/reviews", headers=_auth(student), json={
+        "professor_id": professor_id, "rating_quality": 4, "rating_difficulty": 3,
+        "grade_received": "A", "comment": "Clear lectures", "semester": "Fall 2024",
+    })
+    assert response.status_code == 201
+    other_worker = TestClient(app, cookies={READ_YOUR_WRITES_COOKIE: response.cookies[READ_YOUR_WRITES_COOKIE]})
+    assert len(other_worker.get("/reviews/search", params={"q": "lectures"}).json()["items"]) == 1
+    assert TestClient(app).get("/reviews/search", params={"q": "lectures"}).json()["items"] == []
+
+
+def test_write_marker_expires_and_cannot_be_forged(monkeypatch):
+    monkeypatch.setattr(database.settings, "READ_YOUR_WRITES_SECONDS", 5)
+    now = time.time()
+    assert _wrote_recently(write_marker(now))
+    assert not _wrote_recently(write_marker(now - 10))
+    assert not _wrote_recently(None)
+    assert not _wrote_recently(f"{now + 3600:.3f}.forged")
+    value, _, signature = write_marker(now).rpartition(".")
+    assert not _wrote_recently(f"{float(value) + 3600:.3f}.{signature}")
@@ -0,0 +1,66 @@
+"""Incremental related-professors refresh matches a full rebuild"""
+import random
+
+from app.core.related_professors import rebuild_related_professors, refresh_related
+from app.models.professor import Professor
+from app.models.related_professor import RelatedProfessor
+from app.models.review import Review, GradeEnum, REVIEW_HIDDEN, REVIEW_VISIBLE
+from app.models.user import User, UserRole
+
+TOP_N = 3
+
+
+def _stored(db):
+    return [
+        (row.professor_id, row.rank, row.related_professor_id, round(row.score, 9), row.co_reviewers)
+        for row in db.query(RelatedProfessor).order_by(RelatedProfessor.professor_id, RelatedProfessor.rank)
+    ]
+
+
+def _review(professor, student):
+    return Review(
+        professor_id=professor.id, student_id=student.id, rating_quality=3, rating_difficulty=3,
+        grade_received=GradeEnum.B, semester="Fall 2024", is_hidden=REVIEW_VISIBLE
+    )
+
+
+def test_refresh_matches_rebuild(db):
+    rng = random.Random(7)
+    professors = [Professor(name=f"P{i}", department="CS") for i in range(15)]
+    students = [User(email=f"s{i}@x.edu", password_hash="x", role=UserRole.STUDENT) for i in range(25)]
+    db.add_all(professors + students)
+    db.flush()
+    reviews = [_review(professor, student) for student in students for professor in rng.sample(professors, 3)]
+    db.add_all(reviews)
+    db.flush()
+    rebuild_related_professors(db, TOP_N)
+    db.commit()
+
+    for _ in range(8):
+        changed = set()
+        for review in rng.sample(reviews, 3):
+            if review.is_hidden == REVIEW_VISIBLE:
+                review.is_hidden = REVIEW_HIDDEN
+            else:
+                review.is_hidden = REVIEW_VISIBLE
+            changed.add(review.professor_id)
+        student = rng.choice(students)
+        reviewed = {review.professor_id for review in reviews if review.student_id == student.id}
+        professor = rng.choice([professor for professor in professors if professor.id not in reviewed])
+        reviews.append(_review(professor, student))
+        db.add(reviews[-1])
+        changed.add(professor.id)
+        if rng.random() < 0.3:
+            # A reviewed professor loses every reviewer
+            gone = rng.choice(professors)
+            for review in reviews:
+                if review.professor_id == gone.id and review.is_hidden == REVIEW_VISIBLE:
+                    review.is_hidden = REVIEW_HIDDEN
+            changed.add(gone.id)
+        db.flush()
+
+        refresh_related(db, changed, TOP_N)
+        refreshed = _stored(db)
+        rebuild_related_professors(db, TOP_N)
+        assert refreshed == _stored(db)
+        db.commit()
@@ -0,0 +1,124 @@
+"""Review feed routes"""
+import base64
+import json
+from datetime import datetime
+
+from app.core.security import create_access_token
+from app.models.professor import Professor
+from app.models.review import Review, GradeEnum, REVIEW_VISIBLE
+from app.models.review_vote import ReviewVote
+from app.models.user import User, UserRole
+
+
+def _add_reviews(db, professor, count):
+    students = [User(email=f"{professor.name}-{i}@x.edu", password_hash="x", role=UserRole.STUDENT) for i in range(count)]
+    db.add_all(students)
+    db.flush()
+    reviews = [
+        Review(
+            professor_id=professor.id, student_id=student.id, rating_quality=4, rating_difficulty=3,
+            grade_received=GradeEnum.A, comment="Clear lectures", semester="Fall 2024", is_hidden=REVIEW_VISIBLE
+        )
+        for student in students
+    ]
+    db.add_all(reviews)
+    db.flush()
+    return reviews
+
+
+def test_review_page_query_count_does_not_grow_with_reviews(db, client):
+    reader = User(email="reader@x.edu", password_hash="x", role=UserRole.STUDENT)
+    one, many = Professor(name="one", department="CS"), Professor(name="many", department="CS")
+    db.add_all([reader, one, many])
+    db.flush()
+    _add_reviews(db, one, 1)
+    reviews = _add_reviews(db, many, 15)
+    db.add_all([ReviewVote(review_id=review.id, user_id=reader.id) for review in reviews[::2]])
+    db.commit()
+
+    headers = {"Authorization": "Bearer " + create_access_token({"sub": reader.email, "role": "student"})}
+    client.get("/reviews/me", headers=headers)  # loads and caches the user
+    query_counts = []
+    for professor, expected in ((one, 1), (many, 15)):
+        response = client.get(f"/reviews/professor/{professor.id}", headers=headers)
+        assert response.status_code == 200
+        assert len(response.json()["items"]) == expected
+        query_counts.append(int(response.headers["x-db-query-count"]))
+
+    assert query_counts[0] == query_counts[1]
+
+
+def test_search_matches_like_wildcards_literally(db, client):
+    professor = Professor(name="search", department="CS")
+    db.add(professor)
+    db.flush()
+    plain, literal = _add_reviews(db, professor, 2)
+    plain.comment = "Fair curve"
+    literal.comment = "Graded 100% on_time"
+    db.commit()
+
+    expected = {"%%": [], "__": [], "100%": [literal.id], "on_time": [literal.id]}
+    for query, review_ids in expected.items():
+        response = client.get("/reviews/search", params={"q": query})
+        assert response.status_code == 200
+        assert [item["id"] for item in response.json()["items"]] == review_ids
+
+
+def _walk_pages(client, path, params):
+    ids, cursor = [], None
+    while True:
+        response = client.get(path, params={**params, **({"cursor": cursor} if cursor else {})})
+        assert response.status_code == 200
+        page = response.json()
+        ids += [item["id"] for item in page["items"]]
+        cursor = page["next_cursor"]
+        if cursor is None:
+            return ids
+
+
+def test_review_feed_pages_through_every_sort(db, client):
+    professor = Professor(name="paged", department="CS")
+    db.add(professor)
+    db.flush()
+    reviews = _add_reviews(db, professor, 7)
+    for i, review in enumerate(reviews):
+        review.helpful_count = i % 3
+        review.rating_quality = 1 + i % 2
+        review.created_at = datetime(2024, 9, 1 + i % 4)
+    db.commit()
+
+    expected = {
+        "newest": sorted(reviews, key=lambda r: (r.created_at, r.id), reverse=True),
+        "helpful": sorted(reviews, key=lambda r: (r.helpful_count, r.id), reverse=True),
+        "highest": sorted(reviews, key=lambda r: (r.rating_quality, r.id), reverse=True),
+        "lowest": sorted(reviews, key=lambda r: (r.rating_quality, r.id)),
+    }
+    for sort, ordered in expected.items():
+        ids = _walk_pages(client, f"/reviews/professor/{professor.id}", {"sort": sort, "limit": 2})
+        assert ids == [review.id for review in ordered], sort
+
+
+def test_search_pages_through_results(db, client):
+    professor = Professor(name="search", department="CS")
+    db.add(professor)
+    db.flush()
+    reviews = _add_reviews(db, professor, 5)
+    db.commit()
+
+    ids = _walk_pages(client, "/reviews/search", {"q": "lectures", "limit": 2})
+    assert ids == sorted((review.id for review in reviews), reverse=True)
+
+
+def test_malformed_cursors_are_rejected(db, client):
+    professor = Professor(name="cursor", department="CS")
+    db.add(professor)
+    db.commit()
+
+    def cursor(*parts):
+        return base64.urlsafe_b64encode(json.dumps(list(parts)).encode()).decode()
+
+    for sort, value in (("helpful", [1, 2]), ("helpful", {"a": 1}), ("helpful", "x"), ("newest", 3)):
+        response = client.get(f"/reviews/professor/{professor.id}", params={"sort": sort, "cursor": cursor(sort, value, 1)})
+        assert response.status_code == 400, (sort, value)
+    response = client.get("/reviews/search", params={"q": "lectures", "cursor": cursor("search", [1], 1)})
+    assert response.status_code == 400
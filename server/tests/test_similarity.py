@@ -0,0 +1,98 @@
+"""Incremental similar-professors refresh matches a full rebuild"""
+import random
+
+import pytest
+
+from app.core import similarity
+from app.core.professor_stats import rebuild_histograms, rebuild_professor_stats
+from app.core.similarity import load_features, rebuild_similarity_index, refresh_similarities, top_neighbours
+from app.models.professor import Professor
+from app.models.professor_similarity import ProfessorSimilarity
+from app.models.review import Review, GradeEnum, REVIEW_HIDDEN, REVIEW_VISIBLE
+from app.models.user import User, UserRole
+
+TOP_K = 4
+DEPARTMENTS = ["CS", "Math", "Physics"]
+COURSES = ["CS101", "CS201", "MATH2", "PHY1", None]
+
+
+def _stored(db):
+    neighbours = {}
+    for row in db.query(ProfessorSimilarity).order_by(ProfessorSimilarity.professor_id, ProfessorSimilarity.rank):
+        neighbours.setdefault(row.professor_id, []).append((row.similar_professor_id, row.score))
+    return neighbours
+
+
+def _assert_same_neighbours(refreshed, rebuilt, features):
+    """
+    Same score lists per professor; professors tied on a score may be listed
+    in either order, so each stored neighbour is checked against its true score.
+    """
+    rows = features.rows
+    assert refreshed.keys() == rebuilt.keys()
+    for professor_id, neighbours in refreshed.items():
+        assert [round(score, 9) for _, score in neighbours] == [round(score, 9) for _, score in rebuilt[professor_id]]
+        for similar_id, score in neighbours:
+            true_score = float(features.vectors[rows[professor_id]] @ features.vectors[rows[similar_id]])
+            assert score == pytest.approx(true_score)
+
+
+@pytest.fixture
+def small_chunks(monkeypatch):
+    """Several chunks per refresh, and no feature matrix left over from other tests"""
+    monkeypatch.setattr(similarity, "CHUNK_SIZE", 3)
+    monkeypatch.setattr(similarity, "_cached_features", None)
+
+
+def test_refresh_matches_rebuild(db, small_chunks):
+    rng = random.Random(3)
+    professors = [Professor(name=f"P{i}", department=rng.choice(DEPARTMENTS)) for i in range(30)]
+    students = [User(email=f"s{i}@x.edu", password_hash="x", role=UserRole.STUDENT) for i in range(20)]
+    db.add_all(professors + students)
+    db.flush()
+
+    def review(professor, student):
+        return Review(
+            professor_id=professor.id, student_id=student.id,
+            rating_quality=rng.randint(1, 5), rating_difficulty=rng.randint(1, 5),
+            grade_received=rng.choice(list(GradeEnum)), course_code=rng.choice(COURSES),
+            semester="Fall 2024", is_hidden=REVIEW_VISIBLE
+        )
+
+    reviews = [review(professor, student) for professor in professors[:25] for student in rng.sample(students, 3)]
+    db.add_all(reviews)
+    db.flush()
+    rebuild_professor_stats(db)
+    rebuild_histograms(db)
+    rebuild_similarity_index(db, TOP_K)
+    db.commit()
+
+    for round_number in range(6):
+        changed = set()
+        for professor in rng.sample(professors, 3):
+            reviews.append(review(professor, rng.choice(students)))
+            reviews[-1].semester = f"Spring {2000 + round_number}"
+            db.add(reviews[-1])
+            changed.add(professor.id)
+        hidden = rng.choice(reviews)
+        hidden.is_hidden = REVIEW_HIDDEN
+        changed.add(hidden.professor_id)
+        moved = rng.choice(professors)
+        moved.department = rng.choice(DEPARTMENTS + ["Law"])  # Law is a new department column
+        changed.add(moved.id)
+        if round_number == 2:
+            newcomer = Professor(name="New", department="Art")
+            professors.append(newcomer)
+            db.add(newcomer)
+            db.flush()
+            changed.add(newcomer.id)
+        db.flush()
+        rebuild_professor_stats(db, changed)
+        rebuild_histograms(db, changed)
+
+        # Later rounds refresh the cached matrix, so differences would accumulate
+        refresh_similarities(db, changed, TOP_K)
+        db.commit()
+        features = load_features(db)
+        rebuilt = top_neighbours(features, range(len(features)), TOP_K)  # what rebuild_similarity_index stores
+        _assert_same_neighbours(_stored(db), {key: value for key, value in rebuilt.items() if value}, features)
@@ -0,0 +1,85 @@
+"""Professor autocomplete index"""
+import threading
+
+from app.core.typeahead import ProfessorTypeahead
+
+
+def test_start_survives_a_failed_first_load(monkeypatch):
+    typeahead = ProfessorTypeahead()
+    reloaded = threading.Event()
+    calls = []
+
+    def reload_from_database():
+        calls.append(1)
+        if len(calls) == 1:
+            raise ConnectionError("database unreachable")
+        typeahead.load([(1, "Alan Turing", "CS")])
+        reloaded.set()
+
+    monkeypatch.setattr(typeahead, "reload_from_database", reload_from_database)
+    typeahead.start(reload_interval=0.1)
+    try:
+        assert not typeahead.loaded
+        assert reloaded.wait(5)
+        assert typeahead.loaded
+    finally:
+        typeahead.stop()
+
+
+def _names(typeahead, query):
+    return [suggestion.name for suggestion in typeahead.search(query)]
+
+
+def _loaded_index():
+    typeahead = ProfessorTypeahead()
+    typeahead.load([
+        (1, "Alan Turing", "Computer Science"),
+        (2, "Ada Lovelace", "Mathematics"),
+        (3, "Grace Hopper", "Computer Science"),
+        (4, "Alan Kay", "Physics"),
+    ])
+    return typeahead
+
+
+def test_prefix_and_typo_matches():
+    typeahead = _loaded_index()
+    assert _names(typeahead, "tur") == ["Alan Turing"]
+    assert _names(typeahead, "Turnig") == ["Alan Turing"]
+    assert _names(typeahead, "lovlace") == ["Ada Lovelace"]
+    assert _names(typeahead, "alan k") == ["Alan Kay"]
+    assert _names(typeahead, "mathematics") == ["Ada Lovelace"]
+    assert _names(typeahead, "zzzz") == []
+    # A name match ranks above a department match
+    assert _names(typeahead, "comp")[:2] == ["Alan Turing", "Grace Hopper"]
+
+
+def test_upsert_and_remove():
+    typeahead = _loaded_index()
+    typeahead.upsert(1, "Alan M. Turing", "Logic")
+    typeahead.remove(3)
+    typeahead.upsert(5, "Barbara Liskov", "Computer Science")
+    assert _names(typeahead, "logic") == ["Alan M. Turing"]
+    assert _names(typeahead, "hopper") == []
+    assert _names(typeahead, "liskov") == ["Barbara Liskov"]
+    assert _names(typeahead, "computer") == ["Barbara Liskov"]
+
+
+def test_changes_made_during_a_reload_are_kept():
+    typeahead = _loaded_index()
+    typeahead.begin_reload()
+    snapshot = [(1, "Alan Turing", "Computer Science"), (2, "Ada Lovelace", "Mathematics"), (3, "Grace Hopper", "Computer Science")]
+    # Written while the reload was reading the table, after its snapshot
+    typeahead.upsert(5, "Barbara Liskov", "Computer Science")
+    typeahead.upsert(1, "Alan M. Turing", "Logic")
+    typeahead.remove(2)
+    typeahead.load(snapshot)
+
+    assert _names(typeahead, "liskov") == ["Barbara Liskov"]
+    assert _names(typeahead, "logic") == ["Alan M. Turing"]
+    assert _names(typeahead, "lovelace") == []
+    assert _names(typeahead, "kay") == []  # gone from the table
+    assert len(typeahead) == 3
+
+    # Nothing is replayed by the next reload
+    typeahead.load(snapshot)
+    assert _names(typeahead, "liskov") == []